@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Pack every manifest payload into one bundle file with a byte-offset index.
+
+Opening several books through the manifest costs one request per book. The
+bundle puts every payload in a single file, ``viewer/data/corpus.bundle``,
+that clients read in slices with HTTP ``Range`` requests. Python readers
+memory-map it instead. The layout is::
+
+    MAGIC (8 bytes) | index length (uint32, big-endian) | index JSON | members
+
+The index lists, for every book in manifest order, the absolute ``offset``
+and ``length`` of the book member plus the same for each of its chapters.
+Each book member is compact UTF-8 JSON: the payload without ``verses`` and
+with ``chapters`` mapping chapter numbers to verse arrays. Each chapter span
+covers exactly one of those arrays, so both books and chapters decode on
+their own with a plain JSON parser. :func:`read_payload` turns a book member
+back into the usual payload shape.
+
+The manifest gains a top-level ``bundle`` entry with the file's location,
+``index_length`` (so the first request can fetch preamble and index
+together) and a ``content_hash``. The file is only rewritten when its bytes
+change.
+
+Examples
+--------
+Build the bundle next to the manifest::
+
+    python scripts/build_bundle.py
+
+Read the preamble of a served bundle, then a member by its index offsets::
+
+    curl -r 0-11 http://127.0.0.1:8000/data/corpus.bundle | xxd
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.payload_delta import chapter_of, content_hash
+from scripts.viewer_manifest import DEFAULT_MANIFEST, manifest_books, manifest_locations
+
+MAGIC = b"SBLGNTB1"
+PREAMBLE = struct.Struct(">8sI")
+BUNDLE_VERSION = 1
+DEFAULT_BUNDLE_NAME = "corpus.bundle"
+
+
+class BundleError(ValueError):
+    """Raised for files that are not readable bundles."""
+
+
+def _compact(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_book(payload: Mapping[str, Any]) -> tuple[bytes, dict[str, tuple[int, int, int]]]:
+    """Return the book member bytes and ``{chapter: (offset, length, verses)}`` within it."""
+
+    chapters: dict[str, list[Mapping[str, Any]]] = {}
+    for verse in payload["verses"]:
+        chapters.setdefault(chapter_of(verse["reference"]), []).append(verse)
+
+    head = {key: value for key, value in payload.items() if key != "verses"}
+    head.setdefault("content_hash", content_hash(payload))
+    parts = [_compact(head)[:-1], b',"chapters":{']
+    size = sum(len(part) for part in parts)
+    spans: dict[str, tuple[int, int, int]] = {}
+    for number, (chapter, verses) in enumerate(chapters.items()):
+        key = (b"," if number else b"") + _compact(chapter) + b":"
+        body = _compact(verses)
+        spans[chapter] = (size + len(key), len(body), len(verses))
+        parts += [key, body]
+        size += len(key) + len(body)
+    parts.append(b"}}")
+    return b"".join(parts), spans
+
+
+def build_bundle(payloads: Sequence[Mapping[str, Any]]) -> bytes:
+    """Return the bundle bytes for ``payloads`` (in order)."""
+
+    members = [encode_book(payload) for payload in payloads]
+
+    def make_index(base: int) -> dict[str, Any]:
+        books = []
+        offset = base
+        for payload, (data, spans) in zip(payloads, members):
+            books.append(
+                {
+                    "book_id": payload["book_id"],
+                    "offset": offset,
+                    "length": len(data),
+                    "content_hash": payload.get("content_hash") or content_hash(payload),
+                    "chapters": {
+                        chapter: {"offset": offset + start, "length": length, "verses": count}
+                        for chapter, (start, length, count) in spans.items()
+                    },
+                }
+            )
+            offset += len(data)
+        return {"version": BUNDLE_VERSION, "books": books}
+
+    # Offsets depend on the index length, which depends on the offsets; the
+    # loop settles as soon as the index stops growing (usually on pass two).
+    index_length = 0
+    while True:
+        index_bytes = _compact(make_index(PREAMBLE.size + index_length))
+        if len(index_bytes) == index_length:
+            break
+        index_length = len(index_bytes)
+    return b"".join(
+        [PREAMBLE.pack(MAGIC, len(index_bytes)), index_bytes, *(data for data, _ in members)]
+    )
+
+
+def parse_index(data: bytes) -> dict[str, Any]:
+    """Decode the index from the first ``PREAMBLE.size + index_length`` bytes."""
+
+    if len(data) < PREAMBLE.size:
+        raise BundleError("Bundle is shorter than its preamble")
+    magic, length = PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise BundleError("Not a corpus bundle")
+    if len(data) < PREAMBLE.size + length:
+        raise BundleError("Bundle index is truncated")
+    return json.loads(bytes(data[PREAMBLE.size : PREAMBLE.size + length]))
+
+
+def read_payload(member: bytes) -> dict[str, Any]:
+    """Return the viewer payload encoded in a book member."""
+
+    book = json.loads(member)
+    chapters = book.pop("chapters")
+    book["verses"] = [verse for verses in chapters.values() for verse in verses]
+    return book
+
+
+class Bundle:
+    """Memory-mapped reader that decodes only the members it is asked for."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.index = parse_index(self._view)
+        self._books = {entry["book_id"]: entry for entry in self.index["books"]}
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def book_ids(self) -> list[str]:
+        return list(self._books)
+
+    def _entry(self, book_id: str) -> Mapping[str, Any]:
+        try:
+            return self._books[book_id]
+        except KeyError:
+            raise KeyError(f"Book '{book_id}' is not in {self.path}") from None
+
+    def member(self, book_id: str, chapter: Optional[str] = None) -> memoryview:
+        """Return a zero-copy view of a book member or one of its chapters."""
+
+        entry = self._entry(book_id)
+        if chapter is not None:
+            try:
+                entry = entry["chapters"][str(chapter)]
+            except KeyError:
+                raise KeyError(f"Chapter {chapter} is not in book '{book_id}'") from None
+        return self._view[entry["offset"] : entry["offset"] + entry["length"]]
+
+    def payload(self, book_id: str) -> dict[str, Any]:
+        return read_payload(bytes(self.member(book_id)))
+
+    def chapter(self, book_id: str, chapter: str) -> list[dict[str, Any]]:
+        return json.loads(bytes(self.member(book_id, chapter)))
+
+
+def write_bundle(manifest_path: Path, bundle_path: Path) -> bool:
+    """Build the bundle for ``manifest_path``; return whether the file changed."""
+
+    payloads = [
+        json.loads(book.payload_path.read_text(encoding="utf-8"))
+        for book in manifest_books(manifest_path)
+    ]
+    data = build_bundle(payloads)
+    changed = not bundle_path.exists() or bundle_path.read_bytes() != data
+    if changed:
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        bundle_path.write_bytes(data)
+
+    relative, url = manifest_locations(manifest_path, bundle_path)
+    entry = {
+        "path": relative,
+        "url": url,
+        "index_length": PREAMBLE.unpack_from(data)[1],
+        "content_hash": hashlib.sha256(data).hexdigest()[:16],
+    }
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("bundle") != entry:
+        manifest["bundle"] = entry
+        manifest_path.write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+    return changed
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST,
+        help="Viewer manifest listing the payloads to bundle",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help=f"Bundle file (defaults to <manifest dir>/{DEFAULT_BUNDLE_NAME})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    output = args.output or args.manifest.parent / DEFAULT_BUNDLE_NAME
+
+    changed = write_bundle(args.manifest, output)
+    print(f"{output}: {'written' if changed else 'unchanged'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,24 @@
 #!/usr/bin/env python3
-"""Generate JSON payloads for the Gospel viewer from SBLGNT plain-text files."""
+"""Generate JSON payloads for the Gospel viewer from SBLGNT plain-text or XML files."""
 
 from __future__ import annotations
 
 import argparse
 import json
-import re
-from collections.abc import Iterable
+import sys
+from collections.abc import Iterable, Mapping
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-VERSE_PATTERN = re.compile(
-    r"^(?P<book>[1-3]?\s?[A-Za-z]+)\s+(?P<chapter>\d+):(?P<verse>\d+)\s+(?P<text>\S.*)$"
-)
+from scripts.payload_delta import add_content_hashes, build_delta, content_hash
+from scripts.sblgnt_text import iter_lines, iter_plain_text
+from scripts.sblgnt_xml import TITLE_REFERENCE, iter_xml_records
+from scripts.search_index import DEFAULT_PREFIX_LENGTH, write_search_index
+from scripts.viewer_manifest import manifest_locations
 
 
 def parse_verses(lines: Iterable[str]) -> tuple[str, list[dict[str, str]]]:
@@ -26,30 +30,44 @@ def parse_verses(lines: Iterable[str]) -> tuple[str, list[dict[str, str]]]:
     except StopIteration as exc:
         raise ValueError("Input file is empty") from exc
 
-    verses: list[dict[str, str]] = []
-    current: dict | None = None
+    verses = [
+        {"reference": reference, "text": text}
+        for reference, text in iter_plain_text(lines_iter, strict=True)
+    ]
 
-    for raw_line in lines_iter:
-        line = raw_line.rstrip()
-        if not line.strip():
-            continue
+    if not verses:
+        raise ValueError("No verses were parsed from the file")
+
+    return header, verses
+
+
+def build_payload(input_path: Path) -> tuple[str, list[dict[str, str]]]:
+    return parse_verses(iter_lines(input_path))
 
-        match = VERSE_PATTERN.match(line)
-        if match:
-            if current:
-                verses.append(current)
-            reference = f"{match.group('book')} {match.group('chapter')}:{match.group('verse')}"
-            current = {
-                "reference": reference,
-                "text": match.group("text").strip(),
-            }
-        else:
-            if current is None:
-                raise ValueError(f"Unexpected line before any verse content: {line}")
-            current["text"] = f"{current['text']} {line.strip()}"
-
-    if current:
-        verses.append(current)
+
+def build_xml_payload(input_path: Path) -> tuple[str, list[dict[str, Any]]]:
+    """Stream an SBLGNT XML book into a header and paragraph-aware verse dictionaries.
+
+    Besides ``reference`` and ``text`` each verse carries ``paragraph_index``
+    and ``words`` (``[start, end]`` code-point offsets of every word), plus
+    ``paragraph_breaks`` when a new paragraph starts inside the verse.
+    """
+
+    header = input_path.stem
+    verses: list[dict[str, Any]] = []
+    for record in iter_xml_records(input_path):
+        if record.reference == TITLE_REFERENCE:
+            header = record.text
+            continue
+        verse: dict[str, Any] = {
+            "reference": record.reference,
+            "text": record.text,
+            "paragraph_index": record.paragraph_index,
+            "words": [[start, end] for start, end in record.words],
+        }
+        if record.paragraph_breaks:
+            verse["paragraph_breaks"] = record.paragraph_breaks
+        verses.append(verse)
 
     if not verses:
         raise ValueError("No verses were parsed from the file")
@@ -57,9 +75,16 @@ def parse_verses(lines: Iterable[str]) -> tuple[str, list[dict[str, str]]]:
     return header, verses
 
 
-def build_payload(input_path: Path) -> tuple[str, list[dict[str, str]]]:
-    content = input_path.read_text(encoding="utf-8").splitlines()
-    return parse_verses(content)
+def _load_previous_payload(path: Path) -> dict[str, Any] | None:
+    """Return the payload a rebuild is about to replace, if it can be read."""
+
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(previous, dict) or not isinstance(previous.get("verses"), list):
+        return None
+    return previous
 
 
 def _manifest_sort_key(entry: dict[str, Any]) -> tuple[str, str]:
@@ -70,8 +95,21 @@ def _manifest_sort_key(entry: dict[str, Any]) -> tuple[str, str]:
     return primary, secondary
 
 
-def update_manifest(manifest_path: Path, payload_path: Path, payload: dict[str, Any]) -> None:
-    """Insert or refresh a manifest entry for the generated payload."""
+def update_manifest(
+    manifest_path: Path,
+    payload_path: Path,
+    payload: dict[str, Any],
+    *,
+    assets: Mapping[str, Path] | None = None,
+    previous_content_hash: str | None = None,
+) -> None:
+    """Insert or refresh a manifest entry for the generated payload.
+
+    ``assets`` maps additional artifact names (e.g. ``"search_index"``) to files
+    written alongside the payload; each is recorded as ``<name>_path`` and
+    ``<name>_url`` in the same way as the payload itself.
+    ``previous_content_hash`` records the version a ``delta`` asset applies to.
+    """
 
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -89,18 +127,7 @@ def update_manifest(manifest_path: Path, payload_path: Path, payload: dict[str,
     if not isinstance(books, list):
         books = []
 
-    try:
-        relative_path = payload_path.relative_to(manifest_path.parent)
-        relative_path_str = relative_path.as_posix()
-    except ValueError:
-        relative_path_str = payload_path.name
-
-    manifest_dir_name = manifest_path.parent.name
-    if manifest_dir_name:
-        data_url_path = Path(manifest_dir_name) / Path(relative_path_str)
-    else:
-        data_url_path = Path(relative_path_str)
-    data_url_str = data_url_path.as_posix()
+    relative_path_str, data_url_str = manifest_locations(manifest_path, payload_path)
 
     new_entry: dict[str, Any] = {
         "book_id": payload.get("book_id"),
@@ -113,6 +140,14 @@ def update_manifest(manifest_path: Path, payload_path: Path, payload: dict[str,
         new_entry["header"] = payload.get("header")
     if payload.get("source_path") is not None:
         new_entry["source_path"] = payload.get("source_path")
+    if payload.get("content_hash") is not None:
+        new_entry["content_hash"] = payload.get("content_hash")
+    if previous_content_hash is not None:
+        new_entry["previous_content_hash"] = previous_content_hash
+    for name, asset_path in (assets or {}).items():
+        asset_relative, asset_url = manifest_locations(manifest_path, asset_path)
+        new_entry[f"{name}_path"] = asset_relative
+        new_entry[f"{name}_url"] = asset_url
 
     filtered_books = []
     merged_entry: dict[str, Any] = {}
@@ -150,8 +185,14 @@ def update_manifest(manifest_path: Path, payload_path: Path, payload: dict[str,
 
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("input", type=Path, help="Plain-text SBLGNT book file to parse")
+    parser.add_argument("input", type=Path, help="SBLGNT book file (plain text or XML) to parse")
     parser.add_argument("output", type=Path, help="Destination JSON file")
+    parser.add_argument(
+        "--source",
+        choices=("text", "xml"),
+        default="text",
+        help="Input format; 'xml' adds paragraph indices and word offsets to each verse.",
+    )
     parser.add_argument(
         "--display-name",
         type=str,
@@ -170,27 +211,66 @@ def main() -> None:
         default=None,
         help="Manifest JSON file to update; defaults to <output dir>/manifest.json.",
     )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="Also write a sharded search index to <output dir>/search/<book id>/.",
+    )
+    parser.add_argument(
+        "--search-prefix-length",
+        type=int,
+        default=DEFAULT_PREFIX_LENGTH,
+        help="Number of leading characters of a normalized term used to pick its shard.",
+    )
 
     args = parser.parse_args()
 
     book_id = args.book_id or args.input.stem.lower()
     display_name = args.display_name or args.input.stem
 
-    header, verses = build_payload(args.input)
+    if args.source == "xml":
+        header, verses = build_xml_payload(args.input)
+    else:
+        header, verses = build_payload(args.input)
 
-    payload = {
+    payload: dict[str, Any] = {
         "book_id": book_id,
         "display_name": display_name,
         "header": header,
         "source_path": str(args.input),
-        "verses": verses,
     }
+    if args.source == "xml":
+        payload["source_format"] = "xml"
+    payload["verses"] = verses
+    add_content_hashes(payload)
+
+    previous = _load_previous_payload(args.output)
 
     args.output.parent.mkdir(parents=True, exist_ok=True)
     args.output.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+    assets: dict[str, Path] = {}
+    previous_hash = None
+    if previous is not None and content_hash(previous) != payload["content_hash"]:
+        delta = build_delta(previous, payload)
+        delta_path = args.output.with_name(f"{args.output.stem}.delta.json")
+        delta_path.write_text(
+            json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8"
+        )
+        assets["delta"] = delta_path
+        previous_hash = delta["from"]
+    if args.search_index:
+        assets["search_index"] = write_search_index(
+            args.output.parent / "search" / book_id,
+            verses,
+            book_id=book_id,
+            prefix_length=args.search_prefix_length,
+        )
+
     manifest_path = args.manifest or args.output.parent / "manifest.json"
-    update_manifest(manifest_path, args.output, payload)
+    update_manifest(
+        manifest_path, args.output, payload, assets=assets, previous_content_hash=previous_hash
+    )
 
 
 if __name__ == "__main__":
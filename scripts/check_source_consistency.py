@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Verify that the SBLGNT plain-text and XML corpora agree verse for verse.
+
+Every book is parsed with both :func:`inspect_sblgnt.iter_plain_verses` and
+:func:`inspect_sblgnt.iter_xml_verses` in a pool of worker processes. Verses
+are aligned by packed verse id (so "Matt 1:1" in the text files matches
+"Matthew 1:1" in the XML), their whitespace-normalized text is compared, and
+the result is written as a JSON report listing references missing from
+either source plus character-level differences. The exit status is non-zero
+when any discrepancy is found so the check can gate builds.
+
+Examples
+--------
+Check the whole corpus and print the report::
+
+    python scripts/check_source_consistency.py
+
+Compare only word forms (ignoring punctuation, sigla and accents) for two books::
+
+    python scripts/check_source_consistency.py --books Mark Matt --fold
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import os
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Sequence, Union
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import inspect_sblgnt as inspect
+from scripts.corpus import AGGREGATE_BOOKS
+from scripts.greek_text import normalize_text
+from scripts.verse_ref import format_reference, try_parse_reference
+
+REPORT_VERSION = 1
+
+
+def normalize_for_comparison(text: str, *, fold: bool = False) -> str:
+    """Return ``text`` in the canonical form used for comparison."""
+
+    if fold:
+        return normalize_text(text)
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def character_diffs(text_value: str, xml_value: str) -> list[dict[str, Any]]:
+    """Return the non-equal opcodes between two normalized verse strings."""
+
+    matcher = difflib.SequenceMatcher(None, text_value, xml_value, autojunk=False)
+    return [
+        {
+            "op": tag,
+            "text_range": [i1, i2],
+            "xml_range": [j1, j2],
+            "text": text_value[i1:i2],
+            "xml": xml_value[j1:j2],
+        }
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _format_key(key: Union[int, str]) -> str:
+    return format_reference(key) if isinstance(key, int) else key
+
+
+def _configure_worker(text_dir: Path, xml_dir: Path) -> None:
+    inspect.TEXT_DIR = text_dir
+    inspect.XML_DIR = xml_dir
+
+
+def compare_book(book: str, fold: bool = False) -> dict[str, Any]:
+    """Compare one book across both corpora and return its report entry."""
+
+    text_verses = {
+        try_parse_reference(verse.reference) or verse.reference.strip(): verse.text
+        for verse in inspect.iter_plain_verses(book)
+        if verse.reference != "TITLE"
+    }
+    xml_order: list[Union[int, str]] = []
+    xml_verses: dict[Union[int, str], str] = {}
+    for verse in inspect.iter_xml_verses(book):
+        key = try_parse_reference(verse.reference) or verse.reference.strip()
+        xml_order.append(key)
+        xml_verses[key] = verse.text
+
+    mismatches = []
+    for key in xml_order:
+        if key not in text_verses:
+            continue
+        text_value = normalize_for_comparison(text_verses[key], fold=fold)
+        xml_value = normalize_for_comparison(xml_verses[key], fold=fold)
+        if text_value != xml_value:
+            mismatches.append(
+                {"reference": _format_key(key), "diffs": character_diffs(text_value, xml_value)}
+            )
+
+    missing_in_xml = [_format_key(key) for key in text_verses if key not in xml_verses]
+    missing_in_text = [_format_key(key) for key in xml_order if key not in text_verses]
+
+    return {
+        "book": book,
+        "text_verses": len(text_verses),
+        "xml_verses": len(xml_verses),
+        "missing_in_xml": missing_in_xml,
+        "missing_in_text": missing_in_text,
+        "mismatches": mismatches,
+        "consistent": not (missing_in_xml or missing_in_text or mismatches),
+    }
+
+
+def _compare_book_args(args: tuple[str, bool]) -> dict[str, Any]:
+    return compare_book(*args)
+
+
+def check_corpus(
+    books: Sequence[str],
+    *,
+    text_dir: Path,
+    xml_dir: Path,
+    fold: bool = False,
+    jobs: Optional[int] = None,
+) -> dict[str, Any]:
+    """Compare ``books`` in parallel and return the full report."""
+
+    work = [(book, fold) for book in books]
+    if jobs == 1 or len(work) <= 1:
+        _configure_worker(text_dir, xml_dir)
+        results = [_compare_book_args(item) for item in work]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_configure_worker,
+            initargs=(text_dir, xml_dir),
+        ) as executor:
+            results = list(executor.map(_compare_book_args, work))
+
+    summary = {
+        "books": len(results),
+        "inconsistent_books": sum(1 for result in results if not result["consistent"]),
+        "missing_in_xml": sum(len(result["missing_in_xml"]) for result in results),
+        "missing_in_text": sum(len(result["missing_in_text"]) for result in results),
+        "mismatched_verses": sum(len(result["mismatches"]) for result in results),
+    }
+    return {
+        "version": REPORT_VERSION,
+        "comparison": "folded-words" if fold else "whitespace-normalized",
+        "summary": summary,
+        "consistent": summary["inconsistent_books"] == 0,
+        "books": results,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--books",
+        nargs="+",
+        help="Book identifiers to compare (defaults to every book present in both corpora)",
+    )
+    parser.add_argument(
+        "--fold",
+        action="store_true",
+        help="Compare normalized word forms only, ignoring punctuation, sigla and accents",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes to use (defaults to the CPU count; 1 disables the pool)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the JSON report to this file instead of stdout",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    text_dir, text_suffix = inspect._resolve_source_paths("text")
+    xml_dir, xml_suffix = inspect._resolve_source_paths("xml")
+    text_books = set(inspect.list_books(text_dir, text_suffix)) - AGGREGATE_BOOKS
+    xml_books = set(inspect.list_books(xml_dir, xml_suffix)) - AGGREGATE_BOOKS
+
+    if args.books:
+        unknown = [book for book in args.books if book not in text_books | xml_books]
+        if unknown:
+            raise SystemExit(f"Unknown book(s): {', '.join(unknown)}")
+        requested = list(args.books)
+    else:
+        requested = sorted(text_books | xml_books)
+
+    books = [book for book in requested if book in text_books and book in xml_books]
+    report = check_corpus(
+        books,
+        text_dir=text_dir,
+        xml_dir=xml_dir,
+        fold=args.fold,
+        jobs=args.jobs or os.cpu_count(),
+    )
+    report["missing_books"] = {
+        "text": [book for book in requested if book not in text_books],
+        "xml": [book for book in requested if book not in xml_books],
+    }
+    if report["missing_books"]["text"] or report["missing_books"]["xml"]:
+        report["consistent"] = False
+
+    rendered = json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered, encoding="utf-8")
+    else:
+        sys.stdout.write(rendered)
+
+    return 0 if report["consistent"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""Helpers for reading, building and validating clause payloads.
+
+The clause file contract lives in ``docs/clause-schema.md`` and the tag
+vocabulary in ``docs/analysis-categories.md``. These helpers implement the
+parts of that contract that tooling shares: clause identifiers, the verse
+registry, the canonical clause ordering and a schema/alignment validator.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CATEGORIES_DOC = REPO_ROOT / "docs" / "analysis-categories.md"
+
+REQUIRED_TOP_LEVEL = ("book_id", "display_name", "source_path", "generated", "verses", "clauses")
+REQUIRED_CLAUSE_FIELDS = ("clause_id", "start", "end", "references", "category_tags", "source")
+
+_CATEGORY_ROW = re.compile(r"^\|\s*`(?P<id>[a-z][a-z0-9-]*)`\s*\|")
+
+
+def split_reference(reference: str) -> tuple[str, int, int]:
+    """Split ``"Mark 1:2"`` into ``("Mark", 1, 2)``.
+
+    The book is returned as spelled in ``reference`` (``"Matthew 1:2"`` gives
+    ``"Matthew"``), and any book name is accepted; use
+    :func:`scripts.verse_ref.parse_reference` to normalize or validate it.
+    """
+
+    book, _, location = reference.rpartition(" ")
+    chapter, _, verse = location.partition(":")
+    if not book or not chapter.isdigit() or not verse.isdigit():
+        raise ValueError(f"Malformed reference '{reference}'")
+    return book, int(chapter), int(verse)
+
+
+def make_clause_id(book_id: str, chapter: int, verse: int, position: int) -> str:
+    """Return ``{book_id}-{chapter:02d}-{verse:02d}-{suffix}`` for the ``position``-th clause."""
+
+    if not 0 <= position < 26:
+        raise ValueError("Clause suffixes only cover 26 clauses per verse")
+    return f"{book_id}-{chapter:02d}-{verse:02d}-{chr(ord('a') + position)}"
+
+
+def clause_sort_key(clause: Mapping[str, Any]) -> tuple[int, int, str]:
+    """Canonical clause order: ``(start.verse_index, start.offset, clause_id)``."""
+
+    start = clause["start"]
+    return start["verse_index"], start["offset"], clause["clause_id"]
+
+
+def order_category_tags(tags: Iterable[str]) -> list[str]:
+    """Return ``main`` first followed by the remaining tags alphabetically."""
+
+    unique = set(tags)
+    ordered = sorted(unique - {"main"})
+    return ["main", *ordered] if "main" in unique else ordered
+
+
+def utc_timestamp() -> str:
+    """Return the current UTC time in the ``...Z`` form used by clause files."""
+
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def load_category_vocabulary(path: Path = CATEGORIES_DOC) -> list[str]:
+    """Parse the category IDs from the inventory table in ``analysis-categories.md``."""
+
+    categories = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        match = _CATEGORY_ROW.match(line)
+        if match:
+            categories.append(match.group("id"))
+    if not categories:
+        raise ValueError(f"No category IDs found in '{path}'")
+    return categories
+
+
+def verse_registry_entry(reference: str, index: int, text: str) -> dict[str, Any]:
+    """Return the verse registry entry for a payload verse."""
+
+    _, chapter, verse = split_reference(reference)
+    return {
+        "reference": reference,
+        "index": index,
+        "chapter": chapter,
+        "verse": verse,
+        "character_count": len(text),
+    }
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"'{path}' must contain a JSON object")
+    return data
+
+
+def write_json(path: Path, data: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def validate_clause_payload(
+    payload: Mapping[str, Any],
+    verses: Sequence[Mapping[str, Any]] | None = None,
+    *,
+    allowed_tags: Iterable[str] | None = None,
+) -> list[str]:
+    """Return human-readable problems with ``payload`` (empty when valid).
+
+    ``verses`` is the matching viewer payload ``verses`` array; when given,
+    registry entries are checked against the verse text as well.
+    """
+
+    problems: list[str] = []
+    for field in REQUIRED_TOP_LEVEL:
+        if field not in payload:
+            problems.append(f"missing top-level field '{field}'")
+    if problems:
+        return problems
+
+    registry = {entry["reference"]: entry for entry in payload["verses"]}
+    if verses is not None:
+        for reference, entry in registry.items():
+            index = entry["index"]
+            if not 0 <= index < len(verses) or verses[index]["reference"] != reference:
+                problems.append(f"{reference}: registry index {index} does not match the payload")
+            elif entry["character_count"] != len(verses[index]["text"]):
+                problems.append(f"{reference}: character_count differs from the verse text")
+
+    allowed = set(allowed_tags) if allowed_tags is not None else None
+    seen_ids: set[str] = set()
+    previous_key: tuple[int, int, str] | None = None
+    tags_present: set[str] = set()
+    for clause in payload["clauses"]:
+        clause_id = clause.get("clause_id", "<missing id>")
+        missing = [field for field in REQUIRED_CLAUSE_FIELDS if field not in clause]
+        if missing:
+            problems.append(f"{clause_id}: missing {', '.join(missing)}")
+            continue
+        if clause_id in seen_ids:
+            problems.append(f"{clause_id}: duplicate clause_id")
+        seen_ids.add(clause_id)
+
+        start, end = clause["start"], clause["end"]
+        for label, boundary in (("start", start), ("end", end)):
+            entry = registry.get(boundary.get("reference"))
+            if entry is None:
+                problems.append(f"{clause_id}: {label} reference not in the verse registry")
+                continue
+            if boundary.get("verse_index") != entry["index"]:
+                problems.append(f"{clause_id}: {label} verse_index does not match the registry")
+            if not 0 <= boundary.get("offset", -1) <= entry["character_count"]:
+                problems.append(f"{clause_id}: {label} offset out of bounds")
+        if (end.get("verse_index"), end.get("offset")) < (start.get("verse_index"), start.get("offset")):
+            problems.append(f"{clause_id}: end precedes start")
+
+        tags = clause["category_tags"]
+        if not tags or tags[0] != "main":
+            problems.append(f"{clause_id}: category_tags must start with 'main'")
+        if allowed is not None:
+            unknown = sorted(set(tags) - allowed)
+            if unknown:
+                problems.append(f"{clause_id}: unknown category tags {', '.join(unknown)}")
+        tags_present.update(tags)
+
+        if not clause["source"].get("method"):
+            problems.append(f"{clause_id}: source.method is required")
+
+        try:
+            key = clause_sort_key(clause)
+        except (KeyError, TypeError):
+            continue
+        if previous_key is not None and key < previous_key:
+            problems.append(f"{clause_id}: clauses are not in (verse_index, offset, clause_id) order")
+        previous_key = key
+
+    categories = payload.get("categories")
+    if categories is not None and list(categories) != sorted(tags_present):
+        problems.append("categories does not list the sorted set of clause tags")
+
+    return problems
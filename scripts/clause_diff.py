@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Structural diff between two versions of a clause dataset.
+
+A raw ``git diff`` of a pretty-printed ``*.clauses.json`` shows moved braces,
+not what changed in the analysis. This script pairs the old and new clauses
+by ``clause_id``, and falls back to identical boundaries within a verse, so
+that splitting one clause does not show every later clause of the verse as
+changed. Every clause is classified as
+
+* ``added`` / ``removed`` – it exists on one side only
+* ``renumbered`` – it was paired by its boundaries and its id changed
+* ``boundary-shifted`` – the ``start`` or ``end`` reference or offset moved
+* ``retagged`` – the set of ``category_tags`` changed
+* ``analysis-changed`` – ``analysis`` or ``function`` changed
+* ``provenance-changed`` – the per-clause ``source`` metadata changed
+
+A clause can carry several of the last five kinds at once. The report counts
+every kind in total, per chapter (of the clause's start) and per category
+tag. A retagged clause counts under both its old and its new tags. The text
+output lists the summary tables and one line per changed clause. ``--json``
+writes the same information for review tooling.
+
+Examples
+--------
+Review a regenerated Mark clause file against the committed one::
+
+    git show HEAD:viewer/data/mark.clauses.json > /tmp/mark.old.clauses.json
+    python scripts/clause_diff.py /tmp/mark.old.clauses.json viewer/data/mark.clauses.json
+
+Write the JSON report and fail when anything differs (for CI)::
+
+    python scripts/clause_diff.py old.clauses.json new.clauses.json \\
+        --json build/mark.clause-diff.json --exit-code
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.clause_data import load_json, split_reference
+
+DIFF_VERSION = 2
+CHANGE_KINDS = (
+    "added",
+    "removed",
+    "renumbered",
+    "boundary-shifted",
+    "retagged",
+    "analysis-changed",
+    "provenance-changed",
+)
+_MARKERS = {"added": "+", "removed": "-"}
+
+Clause = Mapping[str, Any]
+
+
+class ClauseDiffError(ValueError):
+    """Raised when a clause list cannot be joined by ``clause_id``."""
+
+
+def _sorted_by_id(clauses: Sequence[Clause], side: str) -> list[Clause]:
+    ordered = sorted(clauses, key=lambda clause: clause["clause_id"])
+    for previous, current in zip(ordered, ordered[1:]):
+        if previous["clause_id"] == current["clause_id"]:
+            raise ClauseDiffError(f"{side}: duplicate clause_id '{current['clause_id']}'")
+    return ordered
+
+
+def join_clauses(
+    old: Sequence[Clause], new: Sequence[Clause]
+) -> Iterator[tuple[Optional[Clause], Optional[Clause]]]:
+    """Yield ``(old, new)`` pairs in ``clause_id`` order; one side is ``None`` when absent.
+
+    Clause ids end in a positional suffix, so splitting one clause renumbers
+    every later clause in its verse. Pairing therefore runs in three passes:
+    equal ids with equal boundaries, then the remaining clauses with identical
+    ``(start, end)`` boundaries whatever their ids, then the rest by id.
+    """
+
+    old_left = {clause["clause_id"]: clause for clause in _sorted_by_id(old, "old")}
+    new_left = {clause["clause_id"]: clause for clause in _sorted_by_id(new, "new")}
+    pairs: list[tuple[Optional[Clause], Optional[Clause]]] = []
+
+    for clause_id, clause in list(old_left.items()):
+        other = new_left.get(clause_id)
+        if other is not None and _boundaries(other) == _boundaries(clause):
+            pairs.append((old_left.pop(clause_id), new_left.pop(clause_id)))
+
+    # Boundaries include the verse reference, so this only pairs within a verse.
+    spans: dict[tuple[tuple[str, int], tuple[str, int]], list[Clause]] = {}
+    for clause in new_left.values():
+        spans.setdefault(_boundaries(clause), []).append(clause)
+    for clause_id, clause in list(old_left.items()):
+        candidates = spans.get(_boundaries(clause))
+        if candidates:
+            other = candidates.pop(0)
+            pairs.append((old_left.pop(clause_id), new_left.pop(other["clause_id"])))
+
+    for clause_id in list(old_left):
+        if clause_id in new_left:
+            pairs.append((old_left.pop(clause_id), new_left.pop(clause_id)))
+    pairs.extend((clause, None) for clause in old_left.values())
+    pairs.extend((None, clause) for clause in new_left.values())
+
+    pairs.sort(key=lambda pair: ((pair[1] or pair[0])["clause_id"], pair[1] is not None))
+    yield from pairs
+
+
+def _boundaries(clause: Clause) -> tuple[tuple[str, int], tuple[str, int]]:
+    start, end = clause["start"], clause["end"]
+    return (start["reference"], start["offset"]), (end["reference"], end["offset"])
+
+
+def classify(old: Clause, new: Clause) -> tuple[list[str], dict[str, dict[str, Any]]]:
+    """Return the change kinds between two versions of a clause and the changed fields."""
+
+    kinds: list[str] = []
+    fields: dict[str, dict[str, Any]] = {}
+
+    def record(field: str, before: Any, after: Any) -> None:
+        fields[field] = {"old": before, "new": after}
+
+    if old["clause_id"] != new["clause_id"]:
+        kinds.append("renumbered")
+        record("clause_id", old["clause_id"], new["clause_id"])
+    if _boundaries(old) != _boundaries(new):
+        kinds.append("boundary-shifted")
+        record("start", old["start"], new["start"])
+        record("end", old["end"], new["end"])
+    if set(old["category_tags"]) != set(new["category_tags"]):
+        kinds.append("retagged")
+        record("category_tags", old["category_tags"], new["category_tags"])
+    if old.get("analysis") != new.get("analysis") or old.get("function") != new.get("function"):
+        kinds.append("analysis-changed")
+        for field in ("function", "analysis"):
+            if old.get(field) != new.get(field):
+                record(field, old.get(field), new.get(field))
+    if old.get("source") != new.get("source"):
+        kinds.append("provenance-changed")
+        record("source", old.get("source"), new.get("source"))
+    return kinds, fields
+
+
+def _chapter(clause: Clause) -> str:
+    return str(split_reference(clause["start"]["reference"])[1])
+
+
+def _side_summary(payload: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        "book_id": payload.get("book_id"),
+        "timestamp": payload.get("generated", {}).get("timestamp"),
+        "clauses": len(payload["clauses"]),
+    }
+
+
+def diff_clauses(old_payload: Mapping[str, Any], new_payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the diff report between two clause payloads."""
+
+    totals = dict.fromkeys(CHANGE_KINDS, 0)
+    totals["unchanged"] = 0
+    chapters: dict[str, dict[str, int]] = {}
+    categories: dict[str, dict[str, int]] = {}
+    records: list[dict[str, Any]] = []
+
+    def count(table: dict[str, dict[str, int]], key: str, kinds: Sequence[str]) -> None:
+        row = table.setdefault(key, dict.fromkeys(CHANGE_KINDS, 0))
+        for kind in kinds:
+            row[kind] += 1
+
+    for old, new in join_clauses(old_payload["clauses"], new_payload["clauses"]):
+        if old is None:
+            kinds, fields, clause = ["added"], {}, new
+        elif new is None:
+            kinds, fields, clause = ["removed"], {}, old
+        else:
+            kinds, fields = classify(old, new)
+            clause = new
+        if not kinds:
+            totals["unchanged"] += 1
+            continue
+
+        for kind in kinds:
+            totals[kind] += 1
+        count(chapters, _chapter(clause), kinds)
+        tags = {*(old or {}).get("category_tags", ()), *(new or {}).get("category_tags", ())}
+        for tag in tags:
+            count(categories, tag, kinds)
+
+        record: dict[str, Any] = {
+            "clause_id": clause["clause_id"],
+            "chapter": int(_chapter(clause)),
+            "changes": kinds,
+        }
+        if old is None or new is None:
+            record["clause"] = clause
+        else:
+            record["fields"] = fields
+        records.append(record)
+
+    return {
+        "version": DIFF_VERSION,
+        "old": _side_summary(old_payload),
+        "new": _side_summary(new_payload),
+        "summary": {
+            "total": totals,
+            "chapters": dict(sorted(chapters.items(), key=lambda item: int(item[0]))),
+            "categories": dict(sorted(categories.items())),
+        },
+        "clauses": records,
+    }
+
+
+def _point(boundary: Mapping[str, Any]) -> str:
+    return f"{boundary['reference']}@{boundary['offset']}"
+
+
+def _span(clause: Clause) -> str:
+    return f"{_point(clause['start'])}–{_point(clause['end'])}"
+
+
+def _table(title: str, rows: Mapping[str, Mapping[str, int]]) -> list[str]:
+    width = max([len(title), *(len(key) for key in rows)])
+    lines = [f"{title:<{width}}  " + "  ".join(CHANGE_KINDS)]
+    for key, counts in rows.items():
+        cells = "  ".join(f"{counts[kind]:>{len(kind)}}" for kind in CHANGE_KINDS)
+        lines.append(f"{key:<{width}}  {cells}")
+    return lines
+
+
+def render_text(report: Mapping[str, Any]) -> str:
+    """Render the summary tables and one line per changed clause."""
+
+    totals = report["summary"]["total"]
+    changed = len(report["clauses"])
+    lines = [
+        f"{report['new']['book_id'] or report['old']['book_id']}: {changed} clauses changed, "
+        f"{totals['unchanged']} unchanged (old {report['old']['clauses']}, "
+        f"new {report['new']['clauses']})",
+        ", ".join(f"{totals[kind]} {kind}" for kind in CHANGE_KINDS),
+    ]
+    if not changed:
+        return "\n".join(lines) + "\n"
+
+    lines += ["", *_table("chapter", report["summary"]["chapters"])]
+    lines += ["", *_table("category", report["summary"]["categories"])]
+    lines.append("")
+    for record in report["clauses"]:
+        kinds = record["changes"]
+        marker = _MARKERS.get(kinds[0], "~")
+        if "clause" in record:
+            clause = record["clause"]
+            tags = ", ".join(clause["category_tags"])
+            lines.append(f"{marker} {record['clause_id']}  {_span(clause)}  [{tags}]")
+            continue
+        fields = record["fields"]
+        details = []
+        for kind in kinds:
+            if kind == "boundary-shifted":
+                moved = [
+                    f"{side} {_point(fields[side]['old'])} → {_point(fields[side]['new'])}"
+                    for side in ("start", "end")
+                    if _point(fields[side]["old"]) != _point(fields[side]["new"])
+                ]
+                details.append(f"{kind} ({'; '.join(moved)})")
+            elif kind == "renumbered":
+                details.append(f"{kind} (from {fields['clause_id']['old']})")
+            elif kind == "retagged":
+                before = ", ".join(fields["category_tags"]["old"])
+                after = ", ".join(fields["category_tags"]["new"])
+                details.append(f"{kind} ([{before}] → [{after}])")
+            else:
+                details.append(kind)
+        lines.append(f"{marker} {record['clause_id']}  " + ", ".join(details))
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("old", type=Path, help="Previous clause file")
+    parser.add_argument("new", type=Path, help="Regenerated clause file")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the JSON report here")
+    parser.add_argument(
+        "--exit-code",
+        action="store_true",
+        help="Exit with status 1 when any clause differs",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    try:
+        report = diff_clauses(load_json(args.old), load_json(args.new))
+    except ClauseDiffError as exc:
+        raise SystemExit(str(exc)) from None
+
+    sys.stdout.write(render_text(report))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 1 if args.exit_code and report["clauses"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""Generate clause overlays for a verse range through a pluggable segmenter.
+
+The pipeline reads a viewer payload (e.g. ``viewer/data/mark.json``), selects
+a verse range, and sends the verses in batches to a segmenter backend with a
+bounded number of concurrent requests. Every verse result is cached under
+``sha256(prompt_version + backend agent + verse text)`` in an append-only
+JSON Lines file, which doubles as the run checkpoint: after a crash, a prompt
+change or a switch of backend a re-run only sends the verses whose cache key
+is missing. The cached segments are finally assembled into a clause payload
+that follows ``docs/clause-schema.md`` and passes
+:func:`clause_data.validate_clause_payload`.
+
+Backends implement :class:`Segmenter`. ``--backend stub`` uses a local
+punctuation-based segmenter for testing; ``--backend package.module:factory``
+imports any callable returning a segmenter (e.g. an LLM client).
+
+Examples
+--------
+Dry-run the first chapter of Mark with the stub backend::
+
+    python scripts/clause_pipeline.py viewer/data/mark.json build/mark.clauses.json \\
+        --start "Mark 1:1" --end "Mark 1:45" --backend stub
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.clause_data import (
+    load_category_vocabulary,
+    load_json,
+    make_clause_id,
+    order_category_tags,
+    split_reference,
+    utc_timestamp,
+    validate_clause_payload,
+    verse_registry_entry,
+    write_json,
+)
+from scripts.verse_ref import book_of, parse_reference, try_parse_reference
+
+DEFAULT_PROMPT_VERSION = "clause-segmenter.v1"
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_CONCURRENCY = 4
+
+# Greek full stop, ano teleia (as U+0387 and U+00B7), question mark and semicolon.
+STUB_BOUNDARIES = frozenset(".\u00b7\u0387;\u037e")
+
+
+@dataclass(frozen=True)
+class VerseTask:
+    """A verse queued for segmentation."""
+
+    reference: str
+    index: int
+    text: str
+    key: str
+
+
+@dataclass
+class SegmentationRun:
+    """Outcome of :func:`run_segmentation` for the verses it had to send."""
+
+    segmented: int = 0  # verses whose segments were newly cached
+    failures: dict[str, str] = field(default_factory=dict)  # reference -> error
+
+
+class Segmenter(Protocol):
+    """Backend contract: return one list of segment dicts per verse in ``batch``.
+
+    Each segment is ``{"start": int, "end": int, "category_tags": [...]}`` with
+    optional ``function`` and ``analysis`` fields; offsets are code points into
+    the verse text.
+    """
+
+    agent: str
+    method: str
+
+    async def segment(
+        self, batch: Sequence[VerseTask], prompt_version: str
+    ) -> Sequence[Sequence[Mapping[str, Any]]]: ...
+
+
+class StubSegmenter:
+    """Deterministic local segmenter that splits verses after strong punctuation."""
+
+    agent = "stub.punctuation-segmenter.v1"
+    method = "stub"
+
+    async def segment(
+        self, batch: Sequence[VerseTask], prompt_version: str
+    ) -> list[list[dict[str, Any]]]:
+        results = []
+        for task in batch:
+            segments = []
+            start = 0
+            text = task.text
+            for position, char in enumerate(text):
+                if char in STUB_BOUNDARIES and text[start:position].strip():
+                    segments.append(self._segment(start, position + 1))
+                    start = position + 1
+                    while start < len(text) and text[start].isspace():
+                        start += 1
+            if text[start:].strip() or not segments:
+                segments.append(self._segment(start, len(text)))
+            results.append(segments)
+        return results
+
+    @staticmethod
+    def _segment(start: int, end: int) -> dict[str, Any]:
+        return {"start": start, "end": end, "category_tags": ["main", "narrative"]}
+
+
+def load_backend(spec: str) -> Segmenter:
+    """Return the segmenter for ``spec`` (``stub`` or ``package.module:factory``)."""
+
+    if spec == "stub":
+        return StubSegmenter()
+    module_name, sep, attribute = spec.partition(":")
+    if not sep:
+        raise SystemExit(f"Backend '{spec}' must be 'stub' or 'package.module:factory'")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+
+def cache_key(text: str, prompt_version: str, agent: str) -> str:
+    """Return the cache key of ``text`` segmented by ``agent`` with ``prompt_version``.
+
+    The agent is part of the key so that segments produced by one backend
+    (e.g. the stub) are never reused for a run with another.
+    """
+
+    return hashlib.sha256(f"{prompt_version}\0{agent}\0{text}".encode("utf-8")).hexdigest()
+
+
+class SegmentCache:
+    """Append-only JSON Lines cache of per-verse segmentations."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            with path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a truncated final line; ignore it.
+                        continue
+                    self.entries[entry["key"]] = entry
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str) -> dict[str, Any]:
+        return self.entries[key]
+
+    def add_many(self, entries: Sequence[dict[str, Any]]) -> None:
+        """Persist ``entries`` durably before recording them in memory."""
+
+        if not entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        for entry in entries:
+            self.entries[entry["key"]] = entry
+
+
+def select_range(
+    verses: Sequence[Mapping[str, Any]], start: Optional[str], end: Optional[str]
+) -> list[tuple[int, Mapping[str, Any]]]:
+    """Return ``(index, verse)`` pairs between the ``start`` and ``end`` references.
+
+    Bounds are compared as verse ids, so any spelling :mod:`scripts.verse_ref`
+    accepts (``"Mk 1:1"``, or a bare ``"1:1"`` within the payload's book) works.
+    """
+
+    ids = [try_parse_reference(verse["reference"]) for verse in verses]
+    book = next((book_of(verse_id) for verse_id in ids if verse_id), None)
+
+    def locate(reference: str) -> int:
+        try:
+            verse_id = parse_reference(reference, book)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid reference '{reference}': {exc}") from None
+        try:
+            return ids.index(verse_id)
+        except ValueError:
+            raise SystemExit(f"Reference not found in payload: {reference}") from None
+
+    first = locate(start) if start else 0
+    last = locate(end) if end else len(verses) - 1
+    if last < first:
+        raise SystemExit("End reference precedes the start reference")
+    return [(index, verses[index]) for index in range(first, last + 1)]
+
+
+def check_segments(
+    task: VerseTask, segments: Sequence[Mapping[str, Any]], allowed_tags: set[str]
+) -> list[dict[str, Any]]:
+    """Validate backend output for one verse and return normalized segments."""
+
+    if not segments:
+        raise ValueError(f"{task.reference}: backend returned no segments")
+    normalized = []
+    for segment in segments:
+        start, end = int(segment["start"]), int(segment["end"])
+        if not 0 <= start <= end <= len(task.text):
+            raise ValueError(f"{task.reference}: segment [{start}, {end}) is out of bounds")
+        tags = order_category_tags(["main", *segment.get("category_tags", [])])
+        unknown = sorted(set(tags) - allowed_tags)
+        if unknown:
+            raise ValueError(f"{task.reference}: unknown category tags {', '.join(unknown)}")
+        cleaned: dict[str, Any] = {"start": start, "end": end, "category_tags": tags}
+        for optional in ("function", "analysis"):
+            if segment.get(optional):
+                cleaned[optional] = segment[optional]
+        normalized.append(cleaned)
+    normalized.sort(key=lambda item: (item["start"], item["end"]))
+    return normalized
+
+
+async def run_segmentation(
+    tasks: Sequence[VerseTask],
+    backend: Segmenter,
+    cache: SegmentCache,
+    *,
+    prompt_version: str,
+    allowed_tags: set[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = 2,
+) -> SegmentationRun:
+    """Segment uncached ``tasks`` and report how many were cached or failed.
+
+    Verses that share a cache key are sent once and counted individually.
+    """
+
+    pending = [task for task in tasks if task.key not in cache]
+    # Identical verse texts share a cache key, so only send each key once.
+    unique: dict[str, VerseTask] = {}
+    for task in pending:
+        unique.setdefault(task.key, task)
+    work = list(unique.values())
+    batches = [work[index : index + batch_size] for index in range(0, len(work), batch_size)]
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    errors: dict[str, str] = {}  # cache key -> error
+
+    async def process(batch: list[VerseTask]) -> None:
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    results = await backend.segment(batch, prompt_version)
+                    if len(results) != len(batch):
+                        raise ValueError("backend returned a result count that differs from the batch")
+                    break
+                except Exception as exc:  # noqa: BLE001 - backends may raise anything
+                    if attempt == retries:
+                        for task in batch:
+                            errors[task.key] = str(exc)
+                        return
+                    await asyncio.sleep(min(2**attempt * 0.5, 10))
+
+        entries = []
+        for task, segments in zip(batch, results):
+            try:
+                normalized = check_segments(task, segments, allowed_tags)
+            except (KeyError, TypeError, ValueError) as exc:
+                errors[task.key] = str(exc)
+                continue
+            entries.append(
+                {
+                    "key": task.key,
+                    "prompt_version": prompt_version,
+                    "reference": task.reference,
+                    "agent": backend.agent,
+                    "method": backend.method,
+                    "segments": normalized,
+                }
+            )
+        cache.add_many(entries)
+
+    await asyncio.gather(*(process(batch) for batch in batches))
+    run = SegmentationRun()
+    for task in pending:
+        if task.key in cache:
+            run.segmented += 1
+        else:
+            run.failures[task.reference] = errors.get(task.key, "segments were not cached")
+    return run
+
+
+def assemble_clause_payload(
+    payload: Mapping[str, Any],
+    selection: Sequence[tuple[int, Mapping[str, Any]]],
+    cache: SegmentCache,
+    *,
+    prompt_version: str,
+    agent: str,
+) -> dict[str, Any]:
+    """Build a schema-conformant clause payload from the segments ``agent`` cached.
+
+    Provenance is taken from the cache entries, which record the backend
+    that actually produced each verse's segments.
+    """
+
+    book_id = payload["book_id"]
+    registry = []
+    clauses = []
+    agents: set[str] = set()
+    for index, verse in selection:
+        reference = verse["reference"]
+        registry.append(verse_registry_entry(reference, index, verse["text"]))
+        key = cache_key(verse["text"], prompt_version, agent)
+        if key not in cache:
+            continue
+        entry = cache.get(key)
+        agents.add(entry["agent"])
+        _, chapter, verse_number = split_reference(reference)
+        for position, segment in enumerate(entry["segments"]):
+            clause: dict[str, Any] = {
+                "clause_id": make_clause_id(book_id, chapter, verse_number, position),
+                "start": {"reference": reference, "verse_index": index, "offset": segment["start"]},
+                "end": {"reference": reference, "verse_index": index, "offset": segment["end"]},
+                "references": [reference],
+                "category_tags": segment["category_tags"],
+            }
+            if segment.get("function"):
+                clause["function"] = segment["function"]
+            if segment.get("analysis"):
+                clause["analysis"] = segment["analysis"]
+            clause["source"] = {
+                "method": entry["method"],
+                "agent": entry["agent"],
+                "reviewed_by": [],
+                "validation": {"alignment": "pass", "schema": "pass"},
+                "prompt_version": prompt_version,
+            }
+            clauses.append(clause)
+
+    return {
+        "book_id": book_id,
+        "display_name": payload.get("display_name", book_id),
+        "source_path": payload.get("source_path", ""),
+        "generated": {
+            "timestamp": utc_timestamp(),
+            "agent": ", ".join(sorted(agents)) or agent,
+            "confidence": "low",
+            "notes": f"Generated by clause_pipeline.py with prompt {prompt_version}; pending review.",
+        },
+        "verses": registry,
+        "clauses": clauses,
+        "categories": sorted({tag for clause in clauses for tag in clause["category_tags"]}),
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("payload", type=Path, help="Viewer payload JSON (e.g. viewer/data/mark.json)")
+    parser.add_argument("output", type=Path, help="Destination clause JSON file")
+    parser.add_argument("--start", help="First reference to segment (defaults to the first verse)")
+    parser.add_argument("--end", help="Last reference to segment (defaults to the last verse)")
+    parser.add_argument("--backend", default="stub", help="'stub' or 'package.module:factory'")
+    parser.add_argument(
+        "--prompt-version",
+        default=DEFAULT_PROMPT_VERSION,
+        help="Identifier of the prompt/model revision; part of every cache key",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="Segment cache / checkpoint file (defaults to <output>.cache.jsonl)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of batches in flight",
+    )
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed batch")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    payload = load_json(args.payload)
+    verses = payload["verses"]
+    selection = select_range(verses, args.start, args.end)
+    backend = load_backend(args.backend)
+    tasks = [
+        VerseTask(
+            reference=verse["reference"],
+            index=index,
+            text=verse["text"],
+            key=cache_key(verse["text"], args.prompt_version, backend.agent),
+        )
+        for index, verse in selection
+    ]
+
+    allowed_tags = set(load_category_vocabulary())
+    cache = SegmentCache(args.cache or args.output.with_name(args.output.name + ".cache.jsonl"))
+    cached_before = sum(1 for task in tasks if task.key in cache)
+
+    run = asyncio.run(
+        run_segmentation(
+            tasks,
+            backend,
+            cache,
+            prompt_version=args.prompt_version,
+            allowed_tags=allowed_tags,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            retries=args.retries,
+        )
+    )
+
+    clause_payload = assemble_clause_payload(
+        payload, selection, cache, prompt_version=args.prompt_version, agent=backend.agent
+    )
+    problems = validate_clause_payload(clause_payload, verses, allowed_tags=allowed_tags)
+    if problems:
+        raise SystemExit("Generated clauses failed validation:\n" + "\n".join(problems))
+    write_json(args.output, clause_payload)
+
+    print(
+        f"{len(tasks)} verses: {cached_before} cached, "
+        f"{run.segmented} segmented, {len(run.failures)} failed",
+        file=sys.stderr,
+    )
+    for reference, error in sorted(run.failures.items()):
+        print(f"  {reference}: {error}", file=sys.stderr)
+    return 1 if run.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""Co-occurrence and collocation statistics over clauses and verse windows.
+
+Word forms are normalized with :mod:`scripts.greek_text` and mapped to
+integer ids; every counting step after tokenization is vectorized with
+NumPy. A *unit* is either a clause from a ``*.clauses.json`` overlay
+(``--unit clause``) or a sliding window of ``--window`` consecutive verses
+(``--unit verse``). Within each unit only presence counts, so ``f(a)`` is
+the number of units containing ``a`` and ``f(a, b)`` the number containing
+both. Without payload arguments every book in the viewer manifest is
+counted together; in clause mode, manifest books without a clause overlay
+are skipped.
+
+For every co-occurring pair the script reports:
+
+* ``pmi`` – pointwise mutual information, ``log2(f(a, b) · N / (f(a) · f(b)))``
+* ``llr`` – Dunning's log-likelihood ratio G² over the 2×2 contingency table
+
+In clause mode each clause's category tags join the unit as ``#tag`` items,
+so the tables also rank which clause categories each word form favours.
+The corpus has no lemma or part-of-speech layer yet. Until it does, this
+word-form and category co-occurrence is the stand-in for verb valency
+(verbs against prepositions and reference-phrase categories).
+
+Examples
+--------
+Rank clause-level collocates for Mark::
+
+    python scripts/cooccurrence_stats.py viewer/data/mark.json \\
+        --clauses viewer/data/mark.clauses.json --output build/mark.cooccurrence.json
+
+Use three-verse windows over the whole payload and also write a TSV table::
+
+    python scripts/cooccurrence_stats.py viewer/data/mark.json --unit verse --window 3 \\
+        --output build/mark.windows.json --tsv build/mark.windows.tsv
+
+Rank window collocates across every book in the manifest::
+
+    python scripts/cooccurrence_stats.py --unit verse --window 3 \\
+        --output build/corpus.windows.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.greek_text import WORD_PATTERN, normalize_form
+from scripts.viewer_manifest import DEFAULT_MANIFEST, manifest_books
+
+TAG_PREFIX = "#"
+DEFAULT_MIN_COUNT = 2
+DEFAULT_TOP = 25
+# Candidate pairs expanded at once by count_cooccurrences.
+PAIR_BATCH = 1_000_000
+
+
+class Vocabulary:
+    """Assigns dense integer ids to word forms and tag items."""
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.items: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def id(self, item: str) -> int:
+        found = self.ids.get(item)
+        if found is None:
+            found = self.ids[item] = len(self.items)
+            self.items.append(item)
+        return found
+
+
+@dataclass
+class TokenArrays:
+    """Tokens of a payload as parallel arrays."""
+
+    item: np.ndarray  # vocabulary id per token
+    verse: np.ndarray  # verse index per token
+    offset: np.ndarray  # code-point offset of the token in its verse
+
+
+def tokenize_payload(verses: Sequence[Mapping[str, Any]], vocabulary: Vocabulary) -> TokenArrays:
+    """Tokenize every verse once into :class:`TokenArrays`."""
+
+    items: list[int] = []
+    verse_indices: list[int] = []
+    offsets: list[int] = []
+    for index, verse in enumerate(verses):
+        for match in WORD_PATTERN.finditer(verse["text"]):
+            items.append(vocabulary.id(normalize_form(match.group())))
+            verse_indices.append(index)
+            offsets.append(match.start())
+    return TokenArrays(
+        item=np.asarray(items, dtype=np.int64),
+        verse=np.asarray(verse_indices, dtype=np.int64),
+        offset=np.asarray(offsets, dtype=np.int64),
+    )
+
+
+def clause_units(
+    tokens: TokenArrays,
+    clauses: Sequence[Mapping[str, Any]],
+    vocabulary: Vocabulary,
+    *,
+    include_tags: bool = True,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Return ``(unit, item, unit_count)`` memberships for clause units.
+
+    Every clause covers the half-open position range ``[start, end)``. Token
+    positions are already sorted, so each clause's tokens are one slice found
+    by binary search; nested clauses therefore count a token in every clause
+    that encloses it. Tokens outside every clause are dropped.
+    """
+
+    if not clauses:
+        return np.empty(0, np.int64), np.empty(0, np.int64), 0
+
+    stride = int(tokens.offset.max(initial=0)) + 1
+    for clause in clauses:
+        stride = max(stride, clause["end"]["offset"] + 1)
+    starts = np.array(
+        [clause["start"]["verse_index"] * stride + clause["start"]["offset"] for clause in clauses],
+        dtype=np.int64,
+    )
+    ends = np.array(
+        [clause["end"]["verse_index"] * stride + clause["end"]["offset"] for clause in clauses],
+        dtype=np.int64,
+    )
+
+    positions = tokens.verse * stride + tokens.offset
+    first = np.searchsorted(positions, starts, side="left")
+    lengths = np.maximum(np.searchsorted(positions, ends, side="left") - first, 0)
+    # Expand every clause into the token indices of its slice.
+    slice_start = np.repeat(first, lengths)
+    slice_offset = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    units = [np.repeat(np.arange(len(clauses), dtype=np.int64), lengths)]
+    items = [tokens.item[slice_start + slice_offset]]
+
+    if include_tags:
+        tag_units: list[int] = []
+        tag_items: list[int] = []
+        for unit, clause in enumerate(clauses):
+            for tag in clause.get("category_tags", []):
+                tag_units.append(unit)
+                tag_items.append(vocabulary.id(TAG_PREFIX + tag))
+        units.append(np.asarray(tag_units, dtype=np.int64))
+        items.append(np.asarray(tag_items, dtype=np.int64))
+
+    return np.concatenate(units), np.concatenate(items), len(clauses)
+
+
+def window_units(tokens: TokenArrays, verse_count: int, window: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Return memberships for sliding windows of ``window`` consecutive verses.
+
+    Window ``w`` covers verses ``w … w + window - 1``; each token therefore
+    belongs to up to ``window`` units.
+    """
+
+    window = max(1, min(window, max(verse_count, 1)))
+    unit_count = max(verse_count - window + 1, 0)
+    shifts = np.arange(window, dtype=np.int64)
+    units = (tokens.verse[:, None] - shifts[None, :]).ravel()
+    items = np.repeat(tokens.item, window)
+    valid = (units >= 0) & (units < unit_count)
+    return units[valid], items[valid], unit_count
+
+
+@dataclass
+class CooccurrenceTable:
+    """Sparse pair counts with their association scores (``first < second``)."""
+
+    first: np.ndarray
+    second: np.ndarray
+    count: np.ndarray
+    pmi: np.ndarray
+    llr: np.ndarray
+    frequency: np.ndarray  # units containing each vocabulary item
+    unit_count: int
+
+
+def _xlogx_ratio(observed: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = observed * np.log(observed / expected)
+    return np.where(observed > 0, terms, 0.0)
+
+
+def _pair_keys(
+    member_item: np.ndarray, unit_start: np.ndarray, unit_size: np.ndarray, size: np.int64
+) -> np.ndarray:
+    """Return ``low * size + high`` for every unordered item pair within the given units.
+
+    The units must be consecutive runs of ``member_item``. Every element is
+    paired with each element of its own unit without a Python loop over units.
+    """
+
+    if not unit_size.size:
+        return np.empty(0, np.int64)
+    per_element = np.repeat(unit_size, unit_size)
+    left = np.repeat(unit_start[0] + np.arange(int(unit_size.sum())), per_element)
+    element_start = np.repeat(unit_start, unit_size)
+    block_start = np.repeat(np.cumsum(per_element) - per_element, per_element)
+    right = np.repeat(element_start, per_element) + np.arange(left.size) - block_start
+    keep = left < right
+    first = member_item[left[keep]]
+    second = member_item[right[keep]]
+    return np.minimum(first, second) * size + np.maximum(first, second)
+
+
+def count_cooccurrences(
+    units: np.ndarray, items: np.ndarray, unit_count: int, vocabulary_size: int
+) -> CooccurrenceTable:
+    """Count unit-level co-occurrences and score every observed pair.
+
+    Expanding pairs costs the sum of squared unit sizes: three-verse windows
+    over Mark alone expand about a million candidates, and the corpus grows
+    with every book. The expansion is therefore done in batches of about
+    :data:`PAIR_BATCH` candidates.
+    """
+
+    size = np.int64(max(vocabulary_size, 1))
+    membership = np.unique(units * size + items)
+    member_unit = membership // size
+    member_item = membership % size
+    frequency = np.bincount(member_item, minlength=vocabulary_size).astype(np.int64)
+
+    # Pairs are expanded in batches of whole units whose summed squared sizes
+    # stay near PAIR_BATCH, so memory is bounded by the batch rather than by
+    # the corpus; the per-batch counts are merged at the end.
+    _, unit_start, unit_size = np.unique(member_unit, return_index=True, return_counts=True)
+    work = unit_size.astype(np.int64) ** 2
+    batch = (np.cumsum(work) - work) // PAIR_BATCH
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(batch)) + 1, [unit_size.size]])
+    batch_keys: list[np.ndarray] = [np.empty(0, np.int64)]
+    batch_counts: list[np.ndarray] = [np.empty(0, np.int64)]
+    for low, high in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        keys, counts = np.unique(
+            _pair_keys(member_item, unit_start[low:high], unit_size[low:high], size),
+            return_counts=True,
+        )
+        batch_keys.append(keys)
+        batch_counts.append(counts)
+    pair_keys, inverse = np.unique(np.concatenate(batch_keys), return_inverse=True)
+    pair_counts = np.bincount(
+        inverse, weights=np.concatenate(batch_counts), minlength=pair_keys.size
+    ).astype(np.int64)
+    first, second = pair_keys // size, pair_keys % size
+    count = pair_counts.astype(np.float64)
+
+    total = float(max(unit_count, 1))
+    f_first = frequency[first].astype(np.float64)
+    f_second = frequency[second].astype(np.float64)
+    pmi = np.log2(count * total / (f_first * f_second))
+
+    observed = (count, f_first - count, f_second - count, total - f_first - f_second + count)
+    expected = (
+        f_first * f_second / total,
+        f_first * (total - f_second) / total,
+        (total - f_first) * f_second / total,
+        (total - f_first) * (total - f_second) / total,
+    )
+    llr = 2.0 * sum(_xlogx_ratio(o, e) for o, e in zip(observed, expected))
+
+    return CooccurrenceTable(
+        first=first,
+        second=second,
+        count=pair_counts.astype(np.int64),
+        pmi=pmi,
+        llr=llr,
+        frequency=frequency,
+        unit_count=unit_count,
+    )
+
+
+def ranked_tables(
+    table: CooccurrenceTable,
+    vocabulary: Vocabulary,
+    *,
+    min_count: int = DEFAULT_MIN_COUNT,
+    top: int = DEFAULT_TOP,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return ``{item: [collocate rows ranked by llr]}`` for pairs with ``count >= min_count``."""
+
+    keep = table.count >= min_count
+    # Each pair is listed under both of its members.
+    heads = np.concatenate([table.first[keep], table.second[keep]])
+    partners = np.concatenate([table.second[keep], table.first[keep]])
+    counts = np.tile(table.count[keep], 2)
+    pmi = np.tile(table.pmi[keep], 2)
+    llr = np.tile(table.llr[keep], 2)
+
+    order = np.lexsort((partners, -llr, heads))
+    heads, partners, counts, pmi, llr = (
+        values[order] for values in (heads, partners, counts, pmi, llr)
+    )
+    boundaries = np.flatnonzero(np.diff(heads)) + 1
+    starts = np.concatenate([[0], boundaries]) if heads.size else np.empty(0, np.int64)
+    ends = np.concatenate([boundaries, [heads.size]]) if heads.size else np.empty(0, np.int64)
+
+    tables: dict[str, list[dict[str, Any]]] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        stop = min(end, start + top) if top > 0 else end
+        tables[vocabulary.items[heads[start]]] = [
+            {
+                "collocate": vocabulary.items[partners[row]],
+                "count": int(counts[row]),
+                "pmi": round(float(pmi[row]), 4),
+                "llr": round(float(llr[row]), 4),
+            }
+            for row in range(start, stop)
+        ]
+    return dict(sorted(tables.items()))
+
+
+def build_report(
+    books: Sequence[tuple[Mapping[str, Any], Optional[Mapping[str, Any]]]],
+    *,
+    unit: str,
+    window: int = 1,
+    min_count: int = DEFAULT_MIN_COUNT,
+    top: int = DEFAULT_TOP,
+) -> dict[str, Any]:
+    """Compute the ranked collocation report over ``(payload, clause_payload)`` books.
+
+    All books share one vocabulary and one unit numbering, so frequencies and
+    scores are corpus-wide; verse windows never cross from one book into the
+    next.
+    """
+
+    vocabulary = Vocabulary()
+    unit_parts: list[np.ndarray] = []
+    item_parts: list[np.ndarray] = []
+    unit_count = 0
+    token_count = 0
+    for payload, clause_payload in books:
+        verses = payload["verses"]
+        tokens = tokenize_payload(verses, vocabulary)
+        if unit == "clause":
+            if clause_payload is None:
+                raise ValueError(f"Clause units need a clause payload for {payload.get('book_id')!r}")
+            units, items, count = clause_units(tokens, clause_payload["clauses"], vocabulary)
+        else:
+            units, items, count = window_units(tokens, len(verses), window)
+        unit_parts.append(units + unit_count)
+        item_parts.append(items)
+        unit_count += count
+        token_count += int(tokens.item.size)
+
+    units = np.concatenate(unit_parts) if unit_parts else np.empty(0, np.int64)
+    items = np.concatenate(item_parts) if item_parts else np.empty(0, np.int64)
+    table = count_cooccurrences(units, items, unit_count, len(vocabulary))
+    return {
+        "books": [payload.get("book_id") for payload, _ in books],
+        "unit": unit,
+        "window": window if unit == "verse" else None,
+        "unit_count": unit_count,
+        "token_count": token_count,
+        "vocabulary_size": len(vocabulary),
+        "pair_count": int(table.count.size),
+        "min_count": min_count,
+        "measures": {
+            "pmi": "log2(f(a,b) * N / (f(a) * f(b)))",
+            "llr": "Dunning log-likelihood ratio G2 over the 2x2 unit contingency table",
+        },
+        "frequencies": {
+            vocabulary.items[index]: int(value)
+            for index, value in enumerate(table.frequency.tolist())
+            if value
+        },
+        "collocates": ranked_tables(table, vocabulary, min_count=min_count, top=top),
+    }
+
+
+def write_tsv(path: Path, report: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("item\trank\tcollocate\tcount\tpmi\tllr\n")
+        for item, rows in report["collocates"].items():
+            for rank, row in enumerate(rows, start=1):
+                handle.write(
+                    f"{item}\t{rank}\t{row['collocate']}\t{row['count']}\t{row['pmi']}\t{row['llr']}\n"
+                )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "payloads",
+        type=Path,
+        nargs="*",
+        help="Viewer payload JSON files (default: every book in --manifest)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST,
+        help="Viewer manifest listing the books to count when no payloads are given",
+    )
+    parser.add_argument(
+        "--clauses",
+        type=Path,
+        default=None,
+        help="Clause overlay for a single payload; defaults to <payload stem>.clauses.json",
+    )
+    parser.add_argument(
+        "--unit",
+        choices=("clause", "verse"),
+        default="clause",
+        help="Count co-occurrence within clauses or within sliding verse windows",
+    )
+    parser.add_argument(
+        "--window", type=int, default=1, help="Verses per window for --unit verse"
+    )
+    parser.add_argument(
+        "--min-count",
+        type=int,
+        default=DEFAULT_MIN_COUNT,
+        help="Only rank pairs that co-occur in at least this many units",
+    )
+    parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP, help="Collocates kept per item (0 keeps all)"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="JSON report path (default: stdout)")
+    parser.add_argument("--tsv", type=Path, default=None, help="Also write a flat ranked TSV table")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.clauses and len(args.payloads) != 1:
+        raise SystemExit("--clauses needs exactly one payload")
+    if args.payloads:
+        files = [
+            (path, args.clauses or path.with_name(f"{path.stem}.clauses.json"))
+            for path in args.payloads
+        ]
+        for _, clause_path in files:
+            if args.unit == "clause" and not clause_path.exists():
+                raise SystemExit(
+                    f"Clause file '{clause_path}' not found; pass --clauses or use --unit verse"
+                )
+    else:
+        files = []
+        for entry in manifest_books(args.manifest):
+            if args.unit == "clause" and entry.clause_path is None:
+                print(f"Skipping {entry.book_id}: no clause file", file=sys.stderr)
+                continue
+            files.append((entry.payload_path, entry.clause_path))
+        if not files:
+            raise SystemExit(f"No book in '{args.manifest}' can be counted with --unit {args.unit}")
+
+    books = []
+    for payload_path, clause_path in files:
+        payload = json.loads(payload_path.read_text(encoding="utf-8"))
+        clause_payload = None
+        if args.unit == "clause" and clause_path is not None:
+            clause_payload = json.loads(clause_path.read_text(encoding="utf-8"))
+        books.append((payload, clause_payload))
+
+    report = build_report(
+        books,
+        unit=args.unit,
+        window=args.window,
+        min_count=args.min_count,
+        top=args.top,
+    )
+
+    rendered = json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered, encoding="utf-8")
+    else:
+        sys.stdout.write(rendered)
+    if args.tsv:
+        write_tsv(args.tsv, report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,207 @@
+"""Compact in-memory SBLGNT corpus with lazy per-book loading.
+
+:class:`Corpus` maps book names to :class:`Book` objects for one source
+(``"text"`` or ``"xml"``). A book is parsed the first time it is accessed and
+kept from then on. :func:`shared_corpus` returns one corpus per source and
+directory for the whole process, so the inspector, the query daemon and
+analysis code never parse a book twice.
+
+A :class:`Book` stores its verses as parallel columns rather than objects:
+
+* ``ids`` – packed verse ids from :mod:`scripts.verse_ref` (``array("I")``;
+  ``0`` marks the ``TITLE`` row of plain-text books and any reference that
+  does not parse)
+* ``texts`` – the verse texts
+* ``paragraphs`` – paragraph indices (``array("i")``; ``-1`` for none)
+
+Reference strings are not stored per verse. They are formatted from the id
+and the book's label (``"Matt"`` in the text files, ``"Matthew"`` in XML ids)
+through a memo, so every reference exists once per process and keeps the
+corpus spelling. The few rows whose reference does not fit that pattern, such
+as the title row, keep their original string. Indexing a book builds a
+slotted :class:`inspect_sblgnt.Verse` on demand, which makes a :class:`Book` a
+drop-in sequence for code written against verse lists.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union, overload
+
+from scripts import inspect_sblgnt as inspect
+from scripts.sblgnt_xml import TITLE_REFERENCE
+from scripts.verse_ref import (
+    book_of,
+    chapter_of,
+    format_reference,
+    parse_reference,
+    try_parse_reference,
+    verse_of,
+)
+
+# Whole-corpus files that sit beside the per-book files.
+AGGREGATE_BOOKS = frozenset({"sblgnt"})
+
+# Id of rows without a verse id: the title and unparseable references.
+_NO_ID = 0
+
+
+@lru_cache(maxsize=65536)
+def _labelled_reference(label: str, verse_id: int) -> str:
+    return f"{label} {chapter_of(verse_id)}:{verse_of(verse_id)}"
+
+
+class Book(Sequence[inspect.Verse]):
+    """The verses of one book as parallel columns."""
+
+    __slots__ = ("name", "ids", "texts", "paragraphs", "label", "_spellings", "_ordered")
+
+    def __init__(self, name: str, verses: Iterable[inspect.Verse]) -> None:
+        self.name = name
+        self.ids = array("I")
+        self.texts: list[str] = []
+        self.paragraphs = array("i")
+        # Book label used by the references ("Matt" in text files, "Matthew"
+        # in XML ids); rows spelled any other way keep their own string.
+        self.label: Optional[str] = None
+        self._spellings: dict[int, str] = {}
+        previous = _NO_ID
+        ordered = True
+        for index, verse in enumerate(verses):
+            verse_id = _NO_ID
+            if verse.reference != TITLE_REFERENCE:
+                verse_id = try_parse_reference(verse.reference) or _NO_ID
+            if verse_id == _NO_ID:
+                self._spellings[index] = verse.reference
+            else:
+                if self.label is None:
+                    label = verse.reference.rsplit(" ", 1)[0]
+                    if _labelled_reference(label, verse_id) == verse.reference:
+                        self.label = label
+                if verse.reference != self._format(verse_id):
+                    self._spellings[index] = verse.reference
+                ordered = ordered and verse_id > previous
+                previous = verse_id
+            self.ids.append(verse_id)
+            self.texts.append(verse.text)
+            self.paragraphs.append(-1 if verse.paragraph_index is None else verse.paragraph_index)
+        self._ordered = ordered and _NO_ID not in self.ids[1:]
+
+    def _format(self, verse_id: int) -> str:
+        if self.label is None or self.label == book_of(verse_id):
+            return format_reference(verse_id)
+        return _labelled_reference(self.label, verse_id)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _verse(self, index: int) -> inspect.Verse:
+        paragraph = self.paragraphs[index]
+        reference = self._spellings.get(index)
+        return inspect.Verse(
+            reference=reference if reference is not None else self._format(self.ids[index]),
+            text=self.texts[index],
+            paragraph_index=None if paragraph < 0 else paragraph,
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> inspect.Verse: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[inspect.Verse]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[inspect.Verse, list[inspect.Verse]]:
+        if isinstance(index, slice):
+            return [self._verse(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("verse index out of range")
+        return self._verse(index)
+
+    def position(self, verse_id: int) -> int:
+        """Return the index of ``verse_id``; raise ``KeyError`` when absent.
+
+        Verse ids ascend through a well-formed book, so this is a binary
+        search; books with unparseable or out-of-order references are scanned.
+        """
+
+        if not self._ordered:
+            try:
+                return self.ids.index(verse_id)
+            except ValueError:
+                raise KeyError(format_reference(verse_id)) from None
+        start = 1 if self.ids and self.ids[0] == _NO_ID else 0
+        position = bisect_left(self.ids, verse_id, start)
+        if position == len(self.ids) or self.ids[position] != verse_id:
+            raise KeyError(format_reference(verse_id))
+        return position
+
+
+class Corpus(Mapping[str, Book]):
+    """Every book of one corpus source, parsed on first access."""
+
+    def __init__(self, source: str) -> None:
+        directory, suffix = inspect._resolve_source_paths(source)
+        self.source = source
+        self.directory = directory
+        self._available = set(inspect.list_books(directory, suffix))
+        self._names = sorted(self._available - AGGREGATE_BOOKS)
+        self._books: dict[str, Book] = {}
+
+    def __getitem__(self, name: str) -> Book:
+        """Return book ``name``, parsing it first if needed.
+
+        Aggregate files such as ``sblgnt`` are reachable by name but are not
+        part of iteration.
+        """
+
+        book = self._books.get(name)
+        if book is None:
+            if name not in self._available:
+                raise KeyError(name)
+            loader = inspect.iter_plain_verses if self.source == "text" else inspect.iter_xml_verses
+            book = self._books[name] = Book(name, loader(name))
+        return book
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._available
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def loaded(self) -> list[str]:
+        """Return the names of the books parsed so far."""
+
+        return sorted(self._books)
+
+    def verse(self, reference: str) -> inspect.Verse:
+        """Return the verse for ``reference`` in any spelling :mod:`verse_ref` parses."""
+
+        verse_id = parse_reference(reference)
+        book = self[book_of(verse_id)]
+        return book[book.position(verse_id)]
+
+
+_SHARED: dict[tuple[str, Path], Corpus] = {}
+
+
+def shared_corpus(source: str) -> Corpus:
+    """Return the process-wide :class:`Corpus` for ``source``.
+
+    Corpora are keyed by source and directory, so repointing
+    ``inspect_sblgnt.TEXT_DIR``/``XML_DIR`` gets a fresh corpus.
+    """
+
+    directory = inspect.TEXT_DIR if source == "text" else inspect.XML_DIR
+    corpus = _SHARED.get((source, directory))
+    if corpus is None:
+        corpus = _SHARED[(source, directory)] = Corpus(source)
+    return corpus
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Long-running SBLGNT query daemon with in-memory indexes.
+
+Every ``inspect_sblgnt.py`` invocation pays interpreter start-up and a full
+re-parse of the requested book. This daemon loads every book of one corpus
+once, keeps a reference index and a per-book text index in memory, and
+answers newline-delimited JSON requests over a Unix socket (or a localhost
+TCP port) with :mod:`asyncio`, so many clients can query concurrently.
+
+Requests are JSON objects with an ``op`` field; responses carry ``ok`` plus
+either the result or an ``error`` message:
+
+* ``{"op": "ping"}`` / ``{"op": "books"}``
+* ``{"op": "verse", "reference": "Mark 1:1"}``
+* ``{"op": "range", "start": "Mark 1:1", "end": "Mark 1:5"}``
+* ``{"op": "contains", "text": "Ἰησοῦ", "book": "Mark", "limit": 10}``
+* ``{"op": "select", "book": "Mark", "start": ..., "contains": ..., "limit": 20}``
+  – the same selection rules as the ``inspect_sblgnt.py`` CLI
+
+Examples
+--------
+Start the daemon on the default Unix socket::
+
+    python scripts/corpus_daemon.py --source xml
+
+Forward an inspection query to it::
+
+    python scripts/inspect_sblgnt.py --daemon --book Mark --contains "Ἰησοῦ"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import inspect_sblgnt as inspect
+from scripts.corpus import Book, shared_corpus
+from scripts.verse_ref import try_parse_reference
+
+DEFAULT_SOCKET = str(Path(tempfile.gettempdir()) / "sblgnt-corpus.sock")
+Address = Union[str, tuple[str, int]]
+
+
+class QueryError(ValueError):
+    """Raised for requests the index cannot answer."""
+
+
+def verse_to_dict(verse: inspect.Verse, book: Optional[str] = None) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "reference": verse.reference,
+        "text": verse.text,
+        "paragraph_index": verse.paragraph_index,
+    }
+    if book is not None:
+        record["book"] = book
+    return record
+
+
+def verse_from_dict(record: Mapping[str, Any]) -> inspect.Verse:
+    return inspect.Verse(
+        reference=record["reference"],
+        text=record["text"],
+        paragraph_index=record.get("paragraph_index"),
+    )
+
+
+class CorpusIndex:
+    """All books of one corpus with reference and substring indexes."""
+
+    def __init__(self, books: Mapping[str, Sequence[inspect.Verse]], *, source: str) -> None:
+        self.source = source
+        self.books: dict[str, Sequence[inspect.Verse]] = {
+            book: verses if isinstance(verses, Book) else list(verses)
+            for book, verses in books.items()
+        }
+        self._references: dict[Union[int, str], tuple[str, int]] = {}
+        self._joined: dict[str, str] = {}
+        self._starts: dict[str, list[int]] = {}
+        self._positions: dict[str, list[int]] = {}
+
+        for book, verses in self.books.items():
+            starts: list[int] = []
+            positions: list[int] = []
+            texts: list[str] = []
+            offset = 0
+            for position, verse in enumerate(verses):
+                if verse.reference == "TITLE":
+                    continue
+                # Unparseable references are indexed by their own spelling.
+                key = try_parse_reference(verse.reference) or verse.reference.strip()
+                self._references.setdefault(key, (book, position))
+                starts.append(offset)
+                positions.append(position)
+                texts.append(verse.text)
+                offset += len(verse.text) + 1
+            self._joined[book] = "\n".join(texts)
+            self._starts[book] = starts
+            self._positions[book] = positions
+
+    @classmethod
+    def load(cls, source: str, books: Optional[Sequence[str]] = None) -> "CorpusIndex":
+        """Index ``books`` (default: every book) of the shared ``source`` corpus."""
+
+        corpus = shared_corpus(source)
+        return cls({book: corpus[book] for book in books or corpus}, source=source)
+
+    def _book(self, book: str) -> Sequence[inspect.Verse]:
+        try:
+            return self.books[book]
+        except KeyError:
+            raise QueryError(
+                f"Unknown book '{book}'. Available options: {', '.join(sorted(self.books))}"
+            ) from None
+
+    def lookup(self, reference: str) -> tuple[str, int]:
+        """Return ``(book, position)`` for a reference in any spelling :mod:`verse_ref` parses."""
+
+        try:
+            return self._references[try_parse_reference(reference) or reference.strip()]
+        except KeyError:
+            raise QueryError(f"Reference '{reference}' not found") from None
+
+    def verse(self, reference: str) -> dict[str, Any]:
+        book, position = self.lookup(reference)
+        return verse_to_dict(self.books[book][position], book)
+
+    def range(self, start: str, end: str) -> list[dict[str, Any]]:
+        start_book, start_position = self.lookup(start)
+        end_book, end_position = self.lookup(end)
+        if start_book != end_book:
+            raise QueryError("Range start and end must be in the same book")
+        if end_position < start_position:
+            raise QueryError("Range end precedes its start")
+        verses = self.books[start_book][start_position : end_position + 1]
+        return [verse_to_dict(verse, start_book) for verse in verses]
+
+    def contains(
+        self, needle: str, *, book: Optional[str] = None, limit: int = 0
+    ) -> list[dict[str, Any]]:
+        """Return verses containing ``needle`` using the joined-text index."""
+
+        if not needle or "\n" in needle:
+            raise QueryError("Substring queries must be non-empty single-line text")
+
+        books = [book] if book else sorted(self.books)
+        results: list[dict[str, Any]] = []
+        for name in books:
+            verses = self._book(name)
+            joined = self._joined[name]
+            starts = self._starts[name]
+            positions = self._positions[name]
+            found = joined.find(needle)
+            while found != -1:
+                slot = bisect_right(starts, found) - 1
+                results.append(verse_to_dict(verses[positions[slot]], name))
+                if limit and len(results) >= limit:
+                    return results
+                if slot + 1 >= len(starts):
+                    break
+                found = joined.find(needle, starts[slot + 1])
+        return results
+
+    def select(
+        self,
+        book: str,
+        *,
+        start: Optional[str] = None,
+        contains: Optional[str] = None,
+        limit: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Apply :func:`inspect_sblgnt.select_verses` to an in-memory book."""
+
+        verses = self._book(book)
+        if contains and not start and "\n" not in contains:
+            matches = self.contains(contains, book=book, limit=max(limit, 0))
+            for match in matches:
+                del match["book"]
+            return matches
+        try:
+            selected = inspect.select_verses(verses, start=start, contains=contains, limit=limit)
+        except SystemExit as exc:
+            raise QueryError(str(exc)) from None
+        return [verse_to_dict(verse) for verse in selected]
+
+    def handle(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        """Answer one decoded request."""
+
+        op = request.get("op")
+        try:
+            source = request.get("source")
+            if source and source != self.source:
+                raise QueryError(f"Daemon serves the '{self.source}' corpus, not '{source}'")
+            if op == "ping":
+                result: Any = {"source": self.source, "books": len(self.books)}
+            elif op == "books":
+                result = sorted(self.books)
+            elif op == "verse":
+                result = self.verse(str(request["reference"]))
+            elif op == "range":
+                result = self.range(str(request["start"]), str(request["end"]))
+            elif op == "contains":
+                result = self.contains(
+                    str(request["text"]),
+                    book=request.get("book"),
+                    limit=int(request.get("limit") or 0),
+                )
+            elif op == "select":
+                result = self.select(
+                    str(request["book"]),
+                    start=request.get("start"),
+                    contains=request.get("contains"),
+                    limit=int(request.get("limit") or 0),
+                )
+            else:
+                raise QueryError(f"Unknown op '{op}'")
+        except KeyError as exc:
+            return {"ok": False, "error": f"Missing request field {exc}"}
+        except (QueryError, TypeError, ValueError) as exc:
+            return {"ok": False, "error": str(exc)}
+        return {"ok": True, "result": result}
+
+
+async def _handle_client(
+    index: CorpusIndex, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Requests must be JSON objects")
+            except ValueError as exc:
+                response = {"ok": False, "error": f"Invalid request: {exc}"}
+            else:
+                response = index.handle(request)
+            writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def parse_address(value: str) -> Address:
+    """Interpret ``host:port`` as TCP and anything else as a Unix socket path."""
+
+    host, sep, port = value.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return value
+
+
+async def start_server(index: CorpusIndex, address: Address) -> asyncio.AbstractServer:
+    """Start serving ``index`` on ``address`` and return the server."""
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await _handle_client(index, reader, writer)
+
+    if isinstance(address, tuple):
+        return await asyncio.start_server(handler, host=address[0], port=address[1])
+
+    path = Path(address)
+    if path.exists():
+        path.unlink()
+    return await asyncio.start_unix_server(handler, path=str(path))
+
+
+def request_daemon(address: Address, request: Mapping[str, Any], timeout: float = 30.0) -> Any:
+    """Send one request to a running daemon and return its ``result``.
+
+    Raises ``SystemExit`` with the daemon's error message, or with start-up
+    instructions when nothing is listening on ``address``.
+    """
+
+    target = parse_address(address) if isinstance(address, str) else address
+    try:
+        if isinstance(target, tuple):
+            connection = socket.create_connection(target, timeout=timeout)
+        else:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(timeout)
+            connection.connect(target)
+    except OSError as exc:
+        raise SystemExit(
+            f"Could not reach the corpus daemon at {address} ({exc}).\n"
+            "Start it with `python scripts/corpus_daemon.py` first."
+        ) from None
+
+    with connection, connection.makefile("rwb") as stream:
+        stream.write((json.dumps(dict(request), ensure_ascii=False) + "\n").encode("utf-8"))
+        stream.flush()
+        line = stream.readline()
+
+    if not line:
+        raise SystemExit("Corpus daemon closed the connection without responding")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise SystemExit(response.get("error", "Corpus daemon request failed"))
+    return response["result"]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--source",
+        choices=("xml", "text"),
+        default="xml",
+        help="Corpus to load into memory",
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket path to listen on (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Listen on 127.0.0.1:PORT over TCP instead of a Unix socket",
+    )
+    parser.add_argument("--books", nargs="+", help="Only load these books")
+    return parser.parse_args(argv)
+
+
+async def _serve(index: CorpusIndex, address: Address) -> None:
+    server = await start_server(index, address)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    index = CorpusIndex.load(args.source, args.books)
+    verse_count = sum(len(verses) for verses in index.books.values())
+    address: Address = ("127.0.0.1", args.port) if args.port is not None else args.socket
+    print(
+        f"Loaded {len(index.books)} books ({verse_count} verses) from the {args.source} corpus "
+        f"in {time.perf_counter() - started:.2f}s; listening on {address}",
+        file=sys.stderr,
+    )
+
+    try:
+        asyncio.run(_serve(index, address))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if isinstance(address, str) and Path(address).exists():
+            Path(address).unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
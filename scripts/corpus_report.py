@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Per-book and per-chapter statistics report for the viewer datasets.
+
+One pass over the payloads and clause files registered in the viewer manifest
+collects, for every verse, its length in code points, word-token count,
+apparatus sigla count and number of clauses starting in it, plus one entry
+per clause category tag. These land in flat NumPy arrays, and every
+aggregate (totals, mean, standard deviation, minimum, percentiles, maximum)
+is then computed for all books and all chapters at once with grouped,
+vectorized operations. The report is written as JSON and as a Markdown
+summary suitable for the progress reports ``description.md`` asks for.
+
+Examples
+--------
+Write both reports for every book in the manifest::
+
+    python scripts/corpus_report.py --json build/corpus-stats.json \\
+        --markdown build/corpus-stats.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.greek_text import WORD_PATTERN, count_sigla
+from scripts.verse_ref import reference_array
+from scripts.viewer_manifest import DEFAULT_MANIFEST, manifest_books
+
+REPORT_VERSION = 1
+METRICS = ("characters", "tokens", "sigla", "clauses")
+PERCENTILES = (25, 50, 75, 90)
+
+
+@dataclass
+class CorpusArrays:
+    """Per-verse measurements for every book, as parallel arrays."""
+
+    books: list[str]
+    display_names: list[str]
+    book: np.ndarray
+    chapter: np.ndarray
+    values: dict[str, np.ndarray]
+    tags: list[str]
+    tag_book: np.ndarray
+    tag_id: np.ndarray
+
+
+def load_corpus(manifest_path: Path) -> CorpusArrays:
+    """Read every manifest payload and clause file once into :class:`CorpusArrays`."""
+
+    books: list[str] = []
+    display_names: list[str] = []
+    book_column: list[int] = []
+    chapter_parts: list[np.ndarray] = []
+    columns: dict[str, list[int]] = {metric: [] for metric in METRICS}
+    tag_ids: dict[str, int] = {}
+    tag_book: list[int] = []
+    tag_column: list[int] = []
+
+    for book_index, entry in enumerate(manifest_books(manifest_path)):
+        payload = json.loads(entry.payload_path.read_text(encoding="utf-8"))
+        books.append(entry.book_id)
+        display_names.append(payload.get("display_name") or entry.book_id)
+        verses = payload["verses"]
+
+        clause_starts = [0] * len(verses)
+        if entry.clause_path is not None:
+            clause_payload = json.loads(entry.clause_path.read_text(encoding="utf-8"))
+            for clause in clause_payload.get("clauses", []):
+                clause_starts[clause["start"]["verse_index"]] += 1
+                for tag in clause.get("category_tags", []):
+                    tag_book.append(book_index)
+                    tag_column.append(tag_ids.setdefault(tag, len(tag_ids)))
+
+        verse_ids = np.asarray(reference_array(verse["reference"] for verse in verses), dtype=np.int64)
+        chapter_parts.append(verse_ids >> 8 & 0xFF)
+        for position, verse in enumerate(verses):
+            text = verse["text"]
+            book_column.append(book_index)
+            columns["characters"].append(len(text))
+            columns["tokens"].append(sum(1 for _ in WORD_PATTERN.finditer(text)))
+            columns["sigla"].append(count_sigla(text))
+            columns["clauses"].append(clause_starts[position])
+
+    return CorpusArrays(
+        books=books,
+        display_names=display_names,
+        book=np.asarray(book_column, dtype=np.int64),
+        chapter=np.concatenate(chapter_parts) if chapter_parts else np.zeros(0, dtype=np.int64),
+        values={metric: np.asarray(column, dtype=np.int64) for metric, column in columns.items()},
+        tags=list(tag_ids),
+        tag_book=np.asarray(tag_book, dtype=np.int64),
+        tag_id=np.asarray(tag_column, dtype=np.int64),
+    )
+
+
+def grouped_summary(
+    values: np.ndarray, groups: np.ndarray, group_count: int
+) -> dict[str, np.ndarray]:
+    """Return per-group count/sum/mean/std/min/percentiles/max of ``values``.
+
+    Groups are dense ids ``0 … group_count - 1``; empty groups yield zeros.
+    Percentiles interpolate linearly like :func:`numpy.percentile`.
+    """
+
+    counts = np.bincount(groups, minlength=group_count)
+    sums = np.bincount(groups, weights=values, minlength=group_count)
+    squares = np.bincount(groups, weights=values.astype(np.float64) ** 2, minlength=group_count)
+    safe = np.maximum(counts, 1)
+    means = sums / safe
+    variance = np.maximum(squares / safe - means**2, 0.0)
+
+    order = np.lexsort((values, groups))
+    ordered = values[order].astype(np.float64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    last = np.maximum(counts - 1, 0)
+
+    summary: dict[str, np.ndarray] = {
+        "count": counts,
+        "sum": sums,
+        "mean": means,
+        "std": np.sqrt(variance),
+    }
+    if ordered.size == 0:
+        zeros = np.zeros(group_count)
+        summary.update({"min": zeros, "max": zeros})
+        summary.update({f"p{q}": zeros for q in PERCENTILES})
+        return summary
+
+    present = counts > 0
+    clamp = ordered.size - 1
+    summary["min"] = np.where(present, ordered[np.minimum(starts, clamp)], 0.0)
+    summary["max"] = np.where(present, ordered[np.minimum(starts + last, clamp)], 0.0)
+    for q in PERCENTILES:
+        position = starts + last * (q / 100.0)
+        low = np.minimum(np.floor(position).astype(np.int64), clamp)
+        high = np.minimum(np.ceil(position).astype(np.int64), clamp)
+        fraction = position - np.floor(position)
+        interpolated = ordered[low] + (ordered[high] - ordered[low]) * fraction
+        summary[f"p{q}"] = np.where(present, interpolated, 0.0)
+    return summary
+
+
+def _metric_record(summary: dict[str, np.ndarray], index: int) -> dict[str, Any]:
+    record: dict[str, Any] = {"total": int(summary["sum"][index])}
+    for name in ("mean", "std", "min", *(f"p{q}" for q in PERCENTILES), "max"):
+        record[name] = round(float(summary[name][index]), 2)
+    return record
+
+
+def build_report(corpus: CorpusArrays) -> dict[str, Any]:
+    """Aggregate :class:`CorpusArrays` into the JSON report structure."""
+
+    book_count = len(corpus.books)
+    chapter_keys, chapter_groups = np.unique(
+        np.stack([corpus.book, corpus.chapter], axis=1).reshape(-1, 2), axis=0, return_inverse=True
+    )
+    chapter_groups = chapter_groups.reshape(-1)
+
+    book_summaries = {
+        metric: grouped_summary(values, corpus.book, book_count)
+        for metric, values in corpus.values.items()
+    }
+    chapter_summaries = {
+        metric: grouped_summary(values, chapter_groups, len(chapter_keys))
+        for metric, values in corpus.values.items()
+    }
+    tag_matrix = np.bincount(
+        corpus.tag_book * max(len(corpus.tags), 1) + corpus.tag_id,
+        minlength=book_count * max(len(corpus.tags), 1),
+    ).reshape(book_count, max(len(corpus.tags), 1))
+
+    books: dict[str, Any] = {}
+    for index, book_id in enumerate(corpus.books):
+        chapters = {}
+        for row in np.flatnonzero(chapter_keys[:, 0] == index).tolist():
+            chapters[str(int(chapter_keys[row, 1]))] = {
+                "verses": int(chapter_summaries["characters"]["count"][row]),
+                "metrics": {
+                    metric: _metric_record(summary, row)
+                    for metric, summary in chapter_summaries.items()
+                },
+            }
+        categories = {
+            tag: int(tag_matrix[index, tag_index])
+            for tag_index, tag in sorted(enumerate(corpus.tags), key=lambda item: item[1])
+            if tag_matrix[index, tag_index]
+        }
+        books[book_id] = {
+            "display_name": corpus.display_names[index],
+            "verses": int(book_summaries["characters"]["count"][index]),
+            "chapters_count": len(chapters),
+            "metrics": {
+                metric: _metric_record(summary, index) for metric, summary in book_summaries.items()
+            },
+            "categories": categories,
+            "chapters": chapters,
+        }
+
+    totals = {metric: int(values.sum()) for metric, values in corpus.values.items()}
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "percentiles": list(PERCENTILES),
+        "totals": {"books": book_count, "verses": int(corpus.book.size), **totals},
+        "books": books,
+    }
+
+
+def render_markdown(report: dict[str, Any]) -> str:
+    """Render the human-readable summary of ``report``."""
+
+    totals = report["totals"]
+    lines = [
+        "# Corpus Statistics Report",
+        "",
+        f"Generated {report['generated_at']}.",
+        "",
+        f"{totals['books']} books, {totals['verses']} verses, {totals['tokens']} word tokens, "
+        f"{totals['sigla']} sigla, {totals['clauses']} clauses.",
+    ]
+    columns = ["mean", "std", "min", *(f"p{q}" for q in PERCENTILES), "max"]
+    for book_id, book in report["books"].items():
+        lines += [
+            "",
+            f"## {book['display_name']} (`{book_id}`)",
+            "",
+            f"{book['verses']} verses in {book['chapters_count']} chapters.",
+            "",
+            "| Per verse | total | " + " | ".join(columns) + " |",
+            "| --- | ---: | " + " | ".join("---:" for _ in columns) + " |",
+        ]
+        for metric, record in book["metrics"].items():
+            cells = " | ".join(f"{record[column]:g}" for column in columns)
+            lines.append(f"| {metric} | {record['total']} | {cells} |")
+
+        if book["categories"]:
+            lines += ["", "| Category | clauses |", "| --- | ---: |"]
+            lines += [f"| `{tag}` | {count} |" for tag, count in book["categories"].items()]
+
+        lines += [
+            "",
+            "| Chapter | verses | tokens | median tokens/verse | sigla | clauses |",
+            "| ---: | ---: | ---: | ---: | ---: | ---: |",
+        ]
+        for chapter, entry in book["chapters"].items():
+            metrics = entry["metrics"]
+            lines.append(
+                f"| {chapter} | {entry['verses']} | {metrics['tokens']['total']} | "
+                f"{metrics['tokens']['p50']:g} | {metrics['sigla']['total']} | "
+                f"{metrics['clauses']['total']} |"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST,
+        help="Viewer manifest listing the payloads to summarize",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Write the JSON report here")
+    parser.add_argument(
+        "--markdown", type=Path, default=None, help="Write the Markdown summary here"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    report = build_report(load_corpus(args.manifest))
+    markdown = render_markdown(report)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if args.markdown:
+        args.markdown.parent.mkdir(parents=True, exist_ok=True)
+        args.markdown.write_text(markdown, encoding="utf-8")
+    if not args.json and not args.markdown:
+        sys.stdout.write(markdown)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""Export viewer payloads and clause files into one SQLite database.
+
+Every book registered in ``viewer/data/manifest.json`` is loaded with its
+clause overlay (``clause_data_path`` or ``<book>.clauses.json`` beside the
+payload) into indexed tables, plus an FTS5 table over the verse text:
+
+* ``books`` – one row per book with the digests of the files it came from;
+  ``name`` is the SBL book code, which several builds of one book share
+* ``verses`` – ``verse_key`` (row key, also the ``verse_fts`` rowid),
+  ``book_id``, ``position``, ``reference``, ``verse_id`` (the packed id from
+  :mod:`scripts.verse_ref`, so id order is canonical order), ``chapter``,
+  ``verse``, ``text``, ``paragraph_index``. Verse ids are unique per
+  ``book_id``, so a text and an XML build of the same book can coexist.
+* ``clauses`` – boundaries as ``(verse_id, offset)`` pairs plus the full
+  clause record as JSON in ``data``, keyed by ``(book_id, clause_id)``;
+  ``clause_tags`` holds one row per tag
+* ``clause_spans`` – view with the text of single-verse clauses
+* ``verse_fts`` – FTS5 (trigram tokenizer) over ``text`` and the accent- and
+  case-folded ``folded`` form from :mod:`scripts.greek_text`
+
+Loading is incremental: a book is only reloaded (in one transaction) when
+the digest of its payload or clause file changed, and books that left the
+manifest are removed. A database written with an older ``SCHEMA_VERSION``
+is rebuilt in full in a single transaction, and only stamped with the new
+version once every book has loaded.
+
+Examples
+--------
+Build or refresh the database::
+
+    python scripts/export_sqlite.py
+
+Query it through the inspection helper::
+
+    python scripts/inspect_sblgnt.py --source sqlite --book Mark --contains "Ἰησοῦ"
+
+Speech clauses in Mark 4 that mention the sower::
+
+    SELECT c.clause_id, s.text FROM clauses c
+    JOIN clause_tags t USING (book_id, clause_id) JOIN clause_spans s USING (book_id, clause_id)
+    WHERE c.book_id = 'mark' AND c.chapter = 4 AND t.tag = 'speech'
+      AND s.text LIKE '%σπείρων%';
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from collections.abc import Iterator, Mapping
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.greek_text import normalize_text
+from scripts.verse_ref import parse_reference, try_parse_reference, unpack
+from scripts.viewer_manifest import DEFAULT_MANIFEST, BookFiles, manifest_books
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DATABASE = REPO_ROOT / "build" / "sblgnt.sqlite"
+
+# FTS5's trigram tokenizer cannot match needles shorter than this.
+FTS_MIN_QUERY = 3
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    book_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    display_name TEXT,
+    header TEXT,
+    source_path TEXT,
+    payload_digest TEXT NOT NULL,
+    clause_digest TEXT,
+    loaded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_by_name ON books (name);
+CREATE TABLE IF NOT EXISTS verses (
+    verse_key INTEGER PRIMARY KEY,
+    book_id TEXT NOT NULL REFERENCES books (book_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    reference TEXT NOT NULL,
+    verse_id INTEGER,
+    chapter INTEGER,
+    verse INTEGER,
+    text TEXT NOT NULL,
+    paragraph_index INTEGER,
+    UNIQUE (book_id, position),
+    UNIQUE (book_id, verse_id)
+);
+CREATE INDEX IF NOT EXISTS verses_by_location ON verses (book_id, chapter, verse);
+CREATE TABLE IF NOT EXISTS clauses (
+    book_id TEXT NOT NULL REFERENCES books (book_id) ON DELETE CASCADE,
+    clause_id TEXT NOT NULL,
+    chapter INTEGER,
+    start_verse_id INTEGER,
+    start_offset INTEGER NOT NULL,
+    end_verse_id INTEGER,
+    end_offset INTEGER NOT NULL,
+    function TEXT,
+    method TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (book_id, clause_id)
+);
+CREATE INDEX IF NOT EXISTS clauses_by_location ON clauses (book_id, chapter, start_verse_id);
+CREATE TABLE IF NOT EXISTS clause_tags (
+    book_id TEXT NOT NULL,
+    clause_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (book_id, clause_id, tag),
+    FOREIGN KEY (book_id, clause_id) REFERENCES clauses (book_id, clause_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS clause_tags_by_tag ON clause_tags (tag, book_id, clause_id);
+CREATE VIEW IF NOT EXISTS clause_spans AS
+    SELECT c.book_id, c.clause_id, v.reference,
+           substr(v.text, c.start_offset + 1, c.end_offset - c.start_offset) AS text
+    FROM clauses c JOIN verses v ON v.book_id = c.book_id AND v.verse_id = c.start_verse_id
+    WHERE c.start_verse_id = c.end_verse_id;
+CREATE VIRTUAL TABLE IF NOT EXISTS verse_fts USING fts5 (text, folded, tokenize = 'trigram');
+"""
+
+DROP_SCHEMA = """
+DROP VIEW IF EXISTS clause_spans;
+DROP TABLE IF EXISTS verse_fts;
+DROP TABLE IF EXISTS clause_tags;
+DROP TABLE IF EXISTS clauses;
+DROP TABLE IF EXISTS verses;
+DROP TABLE IF EXISTS books;
+"""
+
+
+class ExportError(ValueError):
+    """Raised when the manifest cannot be exported as listed."""
+
+
+def file_digest(path: Optional[Path]) -> Optional[str]:
+    if path is None:
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (creating the file if needed) the export database."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
+
+def delete_book(connection: sqlite3.Connection, book_id: str) -> None:
+    """Remove a book and everything that belongs to it."""
+
+    connection.execute(
+        "DELETE FROM verse_fts WHERE rowid IN (SELECT verse_key FROM verses WHERE book_id = ?)",
+        (book_id,),
+    )
+    connection.execute("DELETE FROM clauses WHERE book_id = ?", (book_id,))
+    connection.execute("DELETE FROM verses WHERE book_id = ?", (book_id,))
+    connection.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+
+
+def load_book(
+    connection: sqlite3.Connection,
+    payload: Mapping[str, Any],
+    clauses: Optional[Mapping[str, Any]],
+    *,
+    payload_digest: str,
+    clause_digest: Optional[str],
+    book_id: Optional[str] = None,
+) -> None:
+    """Replace one book's rows with ``payload`` and its ``clauses``.
+
+    ``book_id`` is the manifest's id for the book and defaults to the
+    payload's own ``book_id``. Verses and clause boundaries whose reference
+    does not parse are kept with ``NULL`` verse id, chapter and verse.
+    """
+
+    book_id = book_id or payload["book_id"]
+    verses = payload["verses"]
+    verse_ids = [try_parse_reference(verse["reference"]) for verse in verses]
+    first_id = next((verse_id for verse_id in verse_ids if verse_id is not None), None)
+    name = unpack(first_id)[0] if first_id is not None else book_id
+
+    delete_book(connection, book_id)
+    connection.execute(
+        "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            book_id,
+            name,
+            payload.get("display_name"),
+            payload.get("header"),
+            payload.get("source_path"),
+            payload_digest,
+            clause_digest,
+            datetime.now(timezone.utc).isoformat(),
+        ),
+    )
+
+    for position, (verse_id, verse) in enumerate(zip(verse_ids, verses)):
+        cursor = connection.execute(
+            "INSERT INTO verses (book_id, position, reference, verse_id, chapter, verse, text,"
+            " paragraph_index) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                book_id,
+                position,
+                verse["reference"],
+                verse_id,
+                *(unpack(verse_id)[1:] if verse_id is not None else (None, None)),
+                verse["text"],
+                verse.get("paragraph_index"),
+            ),
+        )
+        connection.execute(
+            "INSERT INTO verse_fts (rowid, text, folded) VALUES (?, ?, ?)",
+            (cursor.lastrowid, verse["text"], normalize_text(verse["text"])),
+        )
+
+    for clause in (clauses or {}).get("clauses", []):
+        start_id = try_parse_reference(clause["start"]["reference"])
+        connection.execute(
+            "INSERT INTO clauses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                book_id,
+                clause["clause_id"],
+                unpack(start_id)[1] if start_id is not None else None,
+                start_id,
+                clause["start"]["offset"],
+                try_parse_reference(clause["end"]["reference"]),
+                clause["end"]["offset"],
+                clause.get("function"),
+                clause.get("source", {}).get("method"),
+                json.dumps(clause, ensure_ascii=False),
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO clause_tags VALUES (?, ?, ?)",
+            ((book_id, clause["clause_id"], tag) for tag in clause["category_tags"]),
+        )
+
+
+def _check_unique_ids(books: Sequence[BookFiles]) -> None:
+    seen: set[str] = set()
+    for book in books:
+        if book.book_id in seen:
+            raise ExportError(f"Manifest lists book_id '{book.book_id}' more than once")
+        seen.add(book.book_id)
+
+
+def export(manifest_path: Path, database_path: Path, *, force: bool = False) -> dict[str, list[str]]:
+    """Bring the database in line with the manifest; return what was done per book."""
+
+    books = manifest_books(manifest_path)
+    _check_unique_ids(books)
+    summary: dict[str, list[str]] = {"loaded": [], "unchanged": [], "removed": []}
+    connection = connect(database_path)
+    try:
+        rebuild = connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION
+        if rebuild:
+            # Replace the tables and reload every book in one transaction, so
+            # a failed load leaves the previous database (and version) intact.
+            connection.executescript("BEGIN;" + DROP_SCHEMA + SCHEMA)
+            transaction: Any = nullcontext()
+            stored = {}
+        else:
+            transaction = connection
+            stored = {
+                row[0]: (row[1], row[2])
+                for row in connection.execute(
+                    "SELECT book_id, payload_digest, clause_digest FROM books"
+                )
+            }
+        for book in books:
+            digests = (file_digest(book.payload_path), file_digest(book.clause_path))
+            if not force and stored.get(book.book_id) == digests:
+                summary["unchanged"].append(book.book_id)
+                continue
+            payload = json.loads(book.payload_path.read_text(encoding="utf-8"))
+            clauses = (
+                json.loads(book.clause_path.read_text(encoding="utf-8"))
+                if book.clause_path is not None
+                else None
+            )
+            with transaction:
+                load_book(
+                    connection,
+                    payload,
+                    clauses,
+                    payload_digest=digests[0],
+                    clause_digest=digests[1],
+                    book_id=book.book_id,
+                )
+            summary["loaded"].append(book.book_id)
+
+        listed = {book.book_id for book in books}
+        for book_id in sorted(set(stored) - listed):
+            with transaction:
+                delete_book(connection, book_id)
+            summary["removed"].append(book_id)
+        if rebuild:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return summary
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def list_database_books(connection: sqlite3.Connection) -> list[str]:
+    return [row[0] for row in connection.execute("SELECT DISTINCT name FROM books ORDER BY name")]
+
+
+def resolve_book(connection: sqlite3.Connection, book: str) -> tuple[str, str, Optional[str]]:
+    """Return ``(book_id, name, header)`` for a book name or id (case-insensitive).
+
+    A name shared by several exported builds must be given as a ``book_id``.
+    """
+
+    rows = connection.execute(
+        "SELECT book_id, name, header FROM books"
+        " WHERE name = ?1 COLLATE NOCASE OR book_id = ?1 COLLATE NOCASE"
+        " ORDER BY book_id = ?1 COLLATE NOCASE DESC, book_id",
+        (book,),
+    ).fetchall()
+    if not rows:
+        options = ", ".join(list_database_books(connection))
+        raise SystemExit(f"Unknown book '{book}' for source 'sqlite'.\nAvailable options: {options}")
+    if len(rows) > 1 and rows[0][0].casefold() != book.casefold():
+        options = ", ".join(row[0] for row in rows)
+        raise SystemExit(f"Book '{book}' is exported more than once; pass one of: {options}")
+    return rows[0]
+
+
+def query_verses(
+    connection: sqlite3.Connection,
+    book: str,
+    *,
+    start: Optional[str] = None,
+    contains: Optional[str] = None,
+    limit: int = 0,
+) -> Iterator[tuple[str, str, Optional[int]]]:
+    """Yield ``(reference, text, paragraph_index)`` rows for the CLI selection.
+
+    Follows :func:`inspect_sblgnt.select_verses`: ``start`` begins at that
+    verse when it parses as a full reference (any spelling accepted by
+    :func:`scripts.verse_ref.parse_reference`) and otherwise at the first
+    reference with that prefix, ``contains`` is an exact substring
+    filter (narrowed through ``verse_fts`` first), and the title row is only
+    included when neither filter is given.
+    """
+
+    book_id, name, header = resolve_book(connection, book)
+    first_position = 0
+    if start:
+        try:
+            row = connection.execute(
+                "SELECT min(position) FROM verses WHERE book_id = ? AND verse_id = ?",
+                (book_id, parse_reference(start, name)),
+            ).fetchone()
+        except ValueError:
+            escaped = start.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            row = connection.execute(
+                "SELECT min(position) FROM verses WHERE book_id = ? AND reference LIKE ? ESCAPE '\\'",
+                (book_id, escaped + "%"),
+            ).fetchone()
+        if row[0] is None:
+            raise SystemExit(f"Start reference '{start}' not found in selection")
+        first_position = row[0]
+
+    remaining = limit if limit and limit > 0 else -1
+    if header and not start and not contains:
+        yield "TITLE", header, None
+        remaining = remaining - 1 if remaining > 0 else remaining
+        if remaining == 0:
+            return
+
+    sql = "SELECT reference, text, paragraph_index FROM verses WHERE book_id = ? AND position >= ?"
+    parameters: list[Any] = [book_id, first_position]
+    if contains:
+        sql += " AND instr(text, ?) > 0"
+        parameters.append(contains)
+        if len(contains) >= FTS_MIN_QUERY:
+            sql += " AND verse_key IN (SELECT rowid FROM verse_fts WHERE verse_fts MATCH ?)"
+            parameters.append("text : " + _fts_phrase(contains))
+    sql += " ORDER BY position LIMIT ?"
+    parameters.append(remaining)
+    yield from connection.execute(sql, parameters)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST,
+        help="Viewer manifest listing the payloads to export",
+    )
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=DEFAULT_DATABASE,
+        help=f"SQLite file to create or update (default: {DEFAULT_DATABASE.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Reload every book even if its files are unchanged"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        summary = export(args.manifest, args.database, force=args.force)
+    except ExportError as exc:
+        raise SystemExit(str(exc)) from None
+    for action, books in summary.items():
+        if books:
+            print(f"{action}: {', '.join(books)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
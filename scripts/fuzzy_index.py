@@ -0,0 +1,328 @@
+"""Persisted symmetric-deletion index for fuzzy word-form lookup.
+
+Computing an edit distance against every token of the corpus per query is
+far too slow for interactive use. :class:`FuzzyIndex` precomputes instead,
+for every distinct word form, all strings reachable by deleting up to
+``max_distance`` characters and maps each of them back to the forms that
+produce it. Two words within edit distance ``k`` always share such a
+deletion variant, so a query only looks up its own (few dozen) variants and
+checks the handful of candidate forms with a bounded
+optimal-string-alignment distance, which counts a swap of two adjacent
+characters as one edit.
+
+Forms are keyed by :func:`scripts.greek_text.accented_form`: case and final
+sigma are folded but accents are kept, so a wrong or missing accent on a
+precomposed letter is one edit. Every form carries its most frequent surface
+spelling for display and the packed verse ids (:mod:`scripts.verse_ref`) it
+occurs in, stored like search postings as delta-encoded varints.
+
+The index is saved as an SQLite database together with a fingerprint of the
+corpus files (name, size and modification time). :func:`load_or_build`
+reuses it until the corpus changes. The deletion variants outnumber the
+forms about thirty to one, so opening a saved index only reads the forms
+table; variants are looked up in the database per query instead of being
+decoded up front.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from scripts import inspect_sblgnt as inspect
+from scripts.greek_text import WORD_PATTERN, accented_form
+from scripts.search_index import decode_postings, encode_postings
+
+INDEX_VERSION = 2
+DEFAULT_MAX_DISTANCE = 2
+DEFAULT_INDEX_DIR = inspect.REPO_ROOT / "build"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE forms (
+    form_id INTEGER PRIMARY KEY,
+    form TEXT NOT NULL,
+    surface TEXT NOT NULL,
+    postings TEXT NOT NULL
+);
+CREATE TABLE deletes (variant TEXT PRIMARY KEY, form_ids TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+
+class FuzzyMatch(NamedTuple):
+    """An indexed ``form`` at ``distance`` edits from the query.
+
+    ``surface`` is the form's most frequent spelling in the corpus.
+    """
+
+    form: str
+    surface: str
+    distance: int
+    verse_ids: list[int]
+
+
+class _StoredDeletes(Mapping[str, list[int]]):
+    """Read-only mapping over the ``deletes`` table of a saved index."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __getitem__(self, variant: str) -> list[int]:
+        row = self._connection.execute(
+            "SELECT form_ids FROM deletes WHERE variant = ?", (variant,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(variant)
+        return decode_postings(row[0])
+
+    def __iter__(self) -> Iterator[str]:
+        for (variant,) in self._connection.execute("SELECT variant FROM deletes"):
+            yield variant
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM deletes").fetchone()[0]
+
+
+def deletion_variants(word: str, max_distance: int) -> set[str]:
+    """Return ``word`` and every string left after deleting up to ``max_distance`` characters."""
+
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            candidate[:position] + candidate[position + 1 :]
+            for candidate in frontier
+            for position in range(len(candidate))
+        }
+        frontier -= variants
+        if not frontier:
+            break
+        variants |= frontier
+    return variants
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """Return the optimal-string-alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_row: Optional[list[int]] = None
+    row = list(range(len(second) + 1))
+    for i, char in enumerate(first, start=1):
+        current = [i] + [0] * len(second)
+        for j, other in enumerate(second, start=1):
+            cost = 0 if char == other else 1
+            value = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (
+                previous_row is not None
+                and j > 1
+                and char == second[j - 2]
+                and first[i - 2] == other
+            ):
+                value = min(value, previous_row[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous_row, row = row, current
+    return row[-1] if row[-1] <= limit else limit + 1
+
+
+class FuzzyIndex:
+    """Distinct word forms, their verses and their deletion variants."""
+
+    def __init__(
+        self,
+        forms: list[str],
+        surfaces: list[str],
+        postings: list[str],
+        max_distance: int,
+        deletes: Optional[Mapping[str, list[int]]] = None,
+    ) -> None:
+        self.forms = forms
+        self.surfaces = surfaces
+        self.max_distance = max_distance
+        # Encoded like search postings; only the matched forms are decoded.
+        self._postings = postings
+        if deletes is None:
+            built: dict[str, list[int]] = {}
+            for form_id, form in enumerate(forms):
+                for variant in deletion_variants(form, max_distance):
+                    built.setdefault(variant, []).append(form_id)
+            deletes = built
+        self._deletes = deletes
+
+    @classmethod
+    def from_verses(
+        cls, verses: Iterable[tuple[int, str]], max_distance: int = DEFAULT_MAX_DISTANCE
+    ) -> "FuzzyIndex":
+        """Index ``(verse_id, text)`` pairs."""
+
+        occurrences: dict[str, set[int]] = {}
+        spellings: dict[str, Counter[str]] = {}
+        for verse_id, text in verses:
+            for match in WORD_PATTERN.finditer(text):
+                word = match.group()
+                form = accented_form(word)
+                occurrences.setdefault(form, set()).add(verse_id)
+                spellings.setdefault(form, Counter())[word] += 1
+        forms = sorted(occurrences)
+        surfaces = [
+            min(spellings[form], key=lambda word: (-spellings[form][word], word)) for form in forms
+        ]
+        postings = [encode_postings(sorted(occurrences[form])) for form in forms]
+        return cls(forms, surfaces, postings, max_distance)
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+    @property
+    def postings(self) -> list[list[int]]:
+        """The verse ids of every form, decoded."""
+
+        return [decode_postings(encoded) for encoded in self._postings]
+
+    def lookup(self, query: str, max_distance: Optional[int] = None) -> list[FuzzyMatch]:
+        """Return the forms within ``max_distance`` of ``query``, closest first."""
+
+        limit = self.max_distance if max_distance is None else max_distance
+        if limit > self.max_distance:
+            raise ValueError(
+                f"Index was built for distance {self.max_distance}, not {limit}"
+            )
+        key = accented_form(query)
+        candidates: set[int] = set()
+        for variant in deletion_variants(key, limit):
+            candidates.update(self._deletes.get(variant, ()))
+
+        matches = []
+        for form_id in candidates:
+            form = self.forms[form_id]
+            distance = edit_distance(key, form, limit)
+            if distance <= limit:
+                matches.append(
+                    FuzzyMatch(
+                        form,
+                        self.surfaces[form_id],
+                        distance,
+                        decode_postings(self._postings[form_id]),
+                    )
+                )
+        matches.sort(key=lambda match: (match.distance, match.form))
+        return matches
+
+    def save(self, path: Path, fingerprint: Optional[str] = None) -> None:
+        """Write the index to a fresh SQLite database at ``path``."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(path.name + ".tmp")
+        staging.unlink(missing_ok=True)
+        connection = sqlite3.connect(staging)
+        try:
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("version", str(INDEX_VERSION)),
+                        ("fingerprint", fingerprint or ""),
+                        ("max_distance", str(self.max_distance)),
+                    ],
+                )
+                connection.executemany(
+                    "INSERT INTO forms (form_id, form, surface, postings) VALUES (?, ?, ?, ?)",
+                    zip(range(len(self.forms)), self.forms, self.surfaces, self._postings),
+                )
+                connection.executemany(
+                    "INSERT INTO deletes (variant, form_ids) VALUES (?, ?)",
+                    (
+                        (variant, encode_postings(form_ids))
+                        for variant, form_ids in self._deletes.items()
+                    ),
+                )
+        finally:
+            connection.close()
+        os.replace(staging, path)
+
+    @classmethod
+    def open(cls, path: Path) -> tuple["FuzzyIndex", dict[str, str]]:
+        """Open a saved index; return it with its ``meta`` table.
+
+        Raises :class:`sqlite3.DatabaseError` when ``path`` is not an index.
+        """
+
+        connection = sqlite3.connect(path)
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            rows = connection.execute(
+                "SELECT form, surface, postings FROM forms ORDER BY form_id"
+            ).fetchall()
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        forms = [row[0] for row in rows]
+        surfaces = [row[1] for row in rows]
+        postings = [row[2] for row in rows]
+        index = cls(forms, surfaces, postings, int(meta["max_distance"]), _StoredDeletes(connection))
+        return index, meta
+
+
+def corpus_fingerprint(source: str) -> str:
+    """Return a cheap fingerprint of the corpus files for ``source``."""
+
+    directory, suffix = inspect._resolve_source_paths(source)
+    entries = [str(directory)]
+    for path in sorted(directory.glob(f"*{suffix}")):
+        stat = path.stat()
+        entries.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(entries)
+
+
+def default_index_path(source: str) -> Path:
+    return DEFAULT_INDEX_DIR / f"fuzzy-index.{source}.sqlite"
+
+
+def _corpus_verses(source: str) -> Iterable[tuple[int, str]]:
+    from scripts.corpus import shared_corpus
+
+    corpus = shared_corpus(source)
+    for name in corpus:
+        book = corpus[name]
+        for verse_id, text in zip(book.ids, book.texts):
+            if verse_id:
+                yield verse_id, text
+
+
+def load_or_build(
+    source: str,
+    path: Optional[Path] = None,
+    *,
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+    rebuild: bool = False,
+) -> FuzzyIndex:
+    """Return the persisted index for ``source``, (re)building it when stale.
+
+    An index is reused while the corpus fingerprint matches and it was built
+    for at least ``max_distance``.
+    """
+
+    path = path or default_index_path(source)
+    fingerprint = corpus_fingerprint(source)
+    if not rebuild and path.exists():
+        try:
+            index, meta = FuzzyIndex.open(path)
+        except (sqlite3.DatabaseError, KeyError, ValueError):
+            meta = {}
+        if (
+            meta.get("version") == str(INDEX_VERSION)
+            and meta.get("fingerprint") == fingerprint
+            and index.max_distance >= max_distance
+        ):
+            return index
+
+    index = FuzzyIndex.from_verses(_corpus_verses(source), max_distance)
+    index.save(path, fingerprint)
+    return index
@@ -0,0 +1,92 @@
+"""Normalization and tokenization helpers for Greek verse text.
+
+The SBLGNT surface text interleaves words with punctuation and text-critical
+sigla (⸀, ⸂ … ⸃). Search, comparison and statistics tooling wants a stable
+word form instead, so :func:`normalize_form` strips diacritics, folds case and
+final sigma, and :func:`iter_word_spans` reports each word together with its
+code-point offsets in the original verse string.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Iterator
+from functools import lru_cache
+
+# Letters optionally followed by combining marks; the elision mark ʼ (U+02BC)
+# is a modifier letter and therefore stays attached to the preceding word.
+WORD_PATTERN = re.compile(r"[^\W\d_](?:[^\W\d_]|[\u0300-\u036f])*")
+
+_STRIP_CHARACTERS = {ord("ʼ"): None, ord("’"): None}
+
+# Text-critical sigla used by the SBLGNT apparatus: ⸀ ⸁ ⸂ ⸃ ⸄ ⸅.
+SIGLA = frozenset("\u2e00\u2e01\u2e02\u2e03\u2e04\u2e05")
+_SIGLA_TABLE = str.maketrans({char: None for char in SIGLA})
+
+
+@lru_cache(maxsize=65536)
+def normalize_form(word: str) -> str:
+    """Return the accent-, case- and final-sigma-folded form of ``word``."""
+
+    decomposed = unicodedata.normalize("NFD", word)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    folded = stripped.casefold().replace("ς", "σ").translate(_STRIP_CHARACTERS)
+    return unicodedata.normalize("NFC", folded)
+
+
+@lru_cache(maxsize=65536)
+def accented_form(word: str) -> str:
+    """Return ``word`` case- and final-sigma-folded but with its accents kept."""
+
+    composed = unicodedata.normalize("NFC", word)
+    return unicodedata.normalize("NFC", composed.casefold().translate(_STRIP_CHARACTERS))
+
+
+@lru_cache(maxsize=4096)
+def _fold_character(char: str) -> str:
+    decomposed = unicodedata.normalize("NFD", char)
+    stripped = "".join(mark for mark in decomposed if not unicodedata.combining(mark))
+    return stripped.casefold().replace("ς", "σ").translate(_STRIP_CHARACTERS)
+
+
+def fold_with_offsets(text: str) -> tuple[str, list[int]]:
+    """Fold ``text`` like :func:`normalize_form` and map it back to ``text``.
+
+    Returns ``(folded, origins)`` where ``origins[i]`` is the code-point
+    offset in ``text`` of the character that produced ``folded[i]``, so
+    matches found in the folded string can be reported against the original.
+    """
+
+    folded: list[str] = []
+    origins: list[int] = []
+    for offset, char in enumerate(text):
+        replacement = _fold_character(char)
+        folded.append(replacement)
+        origins.extend([offset] * len(replacement))
+    return "".join(folded), origins
+
+
+def iter_word_spans(text: str) -> Iterator[tuple[str, int, int]]:
+    """Yield ``(word, start, end)`` code-point spans for each word in ``text``."""
+
+    for match in WORD_PATTERN.finditer(text):
+        yield match.group(), match.start(), match.end()
+
+
+def normalized_words(text: str) -> list[str]:
+    """Return the normalized forms of every word in ``text`` in order."""
+
+    return [normalize_form(match.group()) for match in WORD_PATTERN.finditer(text)]
+
+
+def normalize_text(text: str) -> str:
+    """Return ``text`` reduced to space-separated normalized word forms."""
+
+    return " ".join(normalized_words(text))
+
+
+def count_sigla(text: str) -> int:
+    """Return the number of apparatus sigla in ``text``."""
+
+    return len(text) - len(text.translate(_SIGLA_TABLE))
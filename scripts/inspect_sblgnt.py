@@ -24,19 +24,50 @@ Show the same verses from the plain text file for comparison::
 Search for a phrase anywhere in the book and print the matching verses::
 
     python scripts/inspect_sblgnt.py --book Mark --contains "Ἰησοῦ" --limit 10
+
+Check a whole word list in one pass over every book, ignoring accents, and
+report which forms matched where::
+
+    python scripts/inspect_sblgnt.py --all-books --contains-any forms.txt --fold --limit 0
+
+Find the forms within two edits of a mistyped word and the verses that use
+them (the edit-distance index is built once under ``build/`` and reused)::
+
+    python scripts/inspect_sblgnt.py --all-books --fuzzy "λογος" --limit 0
+
+Forward a query to a running ``corpus_daemon.py`` instead of re-parsing::
+
+    python scripts/inspect_sblgnt.py --daemon --book Mark --contains "Ἰησοῦ"
+
+Query the SQLite export from ``export_sqlite.py`` through its indexes::
+
+    python scripts/inspect_sblgnt.py --source sqlite --book Mark --contains "Ἰησοῦ"
+
+Export a whole book as JSON Lines (or ``tsv``) for downstream tooling::
+
+    python scripts/inspect_sblgnt.py --book Mark --limit 0 --format jsonl > mark.jsonl
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 import sys
 import textwrap
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Iterator, List, Optional, Sequence
-from xml.etree import ElementTree as ET
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+if __package__ in (None, ""):
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.greek_text import accented_form, iter_word_spans
+from scripts.multi_search import TermAutomaton, TermMatch, load_terms
+from scripts.sblgnt_text import iter_lines, iter_plain_text
+from scripts.sblgnt_xml import TITLE_REFERENCE, iter_xml_records
+from scripts.verse_ref import BOOKS, book_of, parse_reference, try_parse_reference
+
 TEXT_DIR = REPO_ROOT / "external-data" / "SBLGNT" / "data" / "sblgnt" / "text"
 XML_DIR = REPO_ROOT / "external-data" / "SBLGNT" / "data" / "sblgnt" / "xml"
 
@@ -73,7 +104,7 @@ def _resolve_source_paths(source: str) -> tuple[Path, str]:
     return directory, suffix
 
 
-@dataclass
+@dataclass(slots=True)
 class Verse:
     """Structured representation of a verse for display."""
 
@@ -110,112 +141,37 @@ def iter_plain_verses(book: str) -> Iterator[Verse]:
     """
 
     path = TEXT_DIR / f"{book}.txt"
-    with path.open(encoding="utf-8") as handle:
-        lines = handle.readlines()
-
-    if not lines:
+    lines = iter_lines(path)
+    title_line = next(lines, None)
+    if title_line is None:
         return
 
     # The first line is always the title in uppercase (e.g. ΚΑΤΑ ΜΑΡΚΟΝ).
-    title = lines[0].strip()
+    title = title_line.strip()
     if title:
         yield Verse(reference="TITLE", text=title, paragraph_index=None)
 
-    current_ref: Optional[str] = None
-    buffer: List[str] = []
+    def warn(line: str) -> None:
+        # Not a verse line; skip but warn so the user can investigate.
+        print(f"Skipping unexpected line in {book}.txt: {line}", file=sys.stderr)
 
-    for raw_line in lines[1:]:
-        if not raw_line.strip():
-            continue
-
-        if raw_line[0].isspace():
-            # Continuation of the current verse; just append trimmed text.
-            buffer.append(raw_line.strip())
-            continue
-
-        # Encountered a new verse header. Flush the previous verse first.
-        if current_ref is not None:
-            verse_text = " ".join(buffer).strip()
-            yield Verse(reference=current_ref, text=verse_text)
-            buffer = []
-
-        parts = raw_line.strip().split()
-        if len(parts) < 3:
-            # Not a verse line; skip but warn so the user can investigate.
-            print(
-                f"Skipping unexpected line in {book}.txt: {raw_line.rstrip()}",
-                file=sys.stderr,
-            )
-            current_ref = None
-            buffer = []
-            continue
-
-        current_ref = f"{parts[0]} {parts[1]}"
-        buffer.append(" ".join(parts[2:]))
-
-    if current_ref is not None:
-        verse_text = " ".join(buffer).strip()
-        yield Verse(reference=current_ref, text=verse_text)
+    for reference, text in iter_plain_text(lines, strict=False, on_skip=warn):
+        yield Verse(reference=reference, text=text)
 
 
 def iter_xml_verses(book: str) -> Iterator[Verse]:
     """Yield verses from the XML corpus with prefixes and suffixes merged."""
 
     path = XML_DIR / f"{book}.xml"
-    root = ET.parse(path).getroot()
-
-    verses: List[Verse] = []
-    current_ref: Optional[str] = None
-    parts: List[str] = []
-    prefix_buffer = ""
-    current_paragraph = -1
-    paragraph_index = -1
-
-    for node in root.iter():
-        tag = node.tag
-        if tag == "p":
-            paragraph_index += 1
-        elif tag == "verse-number":
-            if current_ref is not None:
-                verses.append(
-                    Verse(
-                        reference=current_ref,
-                        text="".join(parts).strip(),
-                        paragraph_index=current_paragraph,
-                    )
-                )
-                parts = []
-            current_ref = node.attrib.get("id", node.text or "")
-            current_paragraph = paragraph_index
-            prefix_buffer = ""
-        elif tag == "prefix":
-            if node.text:
-                prefix_buffer += node.text
-        elif tag == "w":
-            if not node.text:
-                continue
-            if prefix_buffer:
-                token = f"{prefix_buffer}{node.text}"
-            else:
-                needs_space = bool(parts) and not parts[-1].endswith(" ")
-                token = (" " if needs_space else "") + node.text
-            parts.append(token)
-            prefix_buffer = ""
-        elif tag == "suffix":
-            if node.text:
-                parts.append(node.text)
-
-    if current_ref is not None:
-        verses.append(
-            Verse(
-                reference=current_ref,
-                text="".join(parts).strip(),
-                paragraph_index=current_paragraph,
-            )
+    for record in iter_xml_records(path):
+        if record.reference == TITLE_REFERENCE:
+            continue
+        yield Verse(
+            reference=record.reference,
+            text=record.text,
+            paragraph_index=record.paragraph_index,
         )
 
-    return iter(verses)
-
 
 def filter_verses(
     verses: Iterable[Verse],
@@ -223,17 +179,40 @@ def filter_verses(
     start: Optional[str] = None,
     contains: Optional[str] = None,
 ) -> List[Verse]:
-    """Apply optional filters to a verse sequence and return a list."""
+    """Apply optional filters to a verse sequence and return a list.
+
+    A ``start`` that parses as a full reference is matched by verse id, so any
+    spelling :func:`scripts.verse_ref.parse_reference` accepts works. Anything
+    else (``"Mark 2"``), or a reference no verse id matches, selects the first
+    reference with that prefix.
+    """
 
     collected = list(verses)
     if start:
-        start_lower = start.lower()
-        for index, verse in enumerate(collected):
-            if verse.reference.lower().startswith(start_lower):
-                collected = collected[index:]
-                break
-        else:
+        index = None
+        start_id = try_parse_reference(start)
+        if start_id is not None:
+            index = next(
+                (
+                    i
+                    for i, verse in enumerate(collected)
+                    if try_parse_reference(verse.reference) == start_id
+                ),
+                None,
+            )
+        if index is None:
+            start_lower = start.lower()
+            index = next(
+                (
+                    i
+                    for i, verse in enumerate(collected)
+                    if verse.reference.lower().startswith(start_lower)
+                ),
+                None,
+            )
+        if index is None:
             raise SystemExit(f"Start reference '{start}' not found in selection")
+        collected = collected[index:]
 
     if contains:
         collected = [verse for verse in collected if contains in verse.text]
@@ -241,6 +220,54 @@ def filter_verses(
     return collected
 
 
+def select_verses(
+    verses: Iterable[Verse],
+    *,
+    start: Optional[str] = None,
+    contains: Optional[str] = None,
+    limit: int = 0,
+) -> List[Verse]:
+    """Apply the CLI selection rules: title handling, filters and ``limit``."""
+
+    collected = list(verses)
+
+    # TITLE entries make sense for the plain text output but we hide them if the
+    # caller applies substring filtering since the title is rarely relevant.
+    if contains and collected and collected[0].reference == "TITLE":
+        collected = collected[1:]
+
+    collected = filter_verses(collected, start=start, contains=contains)
+
+    if limit and limit > 0:
+        collected = collected[:limit]
+    return collected
+
+
+def search_terms(
+    verses: Iterable[Verse],
+    automaton: TermAutomaton,
+    *,
+    start: Optional[str] = None,
+    limit: int = 0,
+) -> List[tuple[Verse, List[TermMatch]]]:
+    """Return ``(verse, matches)`` for verses containing any automaton term.
+
+    Each verse is scanned once whatever the number of terms. ``start`` and
+    ``limit`` follow :func:`select_verses`; the title row is never searched.
+    """
+
+    collected = [verse for verse in verses if verse.reference != TITLE_REFERENCE]
+    collected = filter_verses(collected, start=start)
+    results = []
+    for verse in collected:
+        matches = automaton.find_all(verse.text)
+        if matches:
+            results.append((verse, matches))
+            if limit and len(results) >= limit:
+                break
+    return results
+
+
 def format_verse(verse: Verse, *, width: int = 88, show_paragraphs: bool = False) -> str:
     """Format a verse for console output."""
 
@@ -259,14 +286,220 @@ def format_verse(verse: Verse, *, width: int = 88, show_paragraphs: bool = False
     return wrapped
 
 
+TSV_HEADER = "reference\ttext\tparagraph_index\n"
+_TSV_ESCAPES = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
+
+
+def render_verses(
+    verses: Iterable[Verse],
+    *,
+    output_format: str = "text",
+    width: int = 88,
+    show_paragraphs: bool = False,
+) -> Iterator[str]:
+    """Yield newline-terminated output chunks for ``verses`` in ``output_format``.
+
+    ``jsonl`` and ``tsv`` emit one record per verse with ``reference``,
+    ``text`` and ``paragraph_index`` fields and never wrap text; ``text``
+    reproduces the wrapped console layout of :func:`format_verse`.
+    """
+
+    if output_format == "jsonl":
+        for verse in verses:
+            record = {
+                "reference": verse.reference,
+                "text": verse.text,
+                "paragraph_index": verse.paragraph_index,
+            }
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    elif output_format == "tsv":
+        yield TSV_HEADER
+        for verse in verses:
+            paragraph = "" if verse.paragraph_index is None else str(verse.paragraph_index)
+            yield f"{verse.reference}\t{verse.text.translate(_TSV_ESCAPES)}\t{paragraph}\n"
+    else:
+        for verse in verses:
+            if verse.reference == "TITLE":
+                yield verse.text + "\n"
+            else:
+                yield format_verse(verse, width=width, show_paragraphs=show_paragraphs) + "\n"
+
+
+TERM_TSV_HEADER = "reference\tterm\tstart\tend\n"
+
+
+def render_term_matches(
+    results: Iterable[tuple[Verse, Sequence[TermMatch]]],
+    *,
+    output_format: str = "text",
+    width: int = 88,
+    show_paragraphs: bool = False,
+) -> Iterator[str]:
+    """Yield output chunks for :func:`search_terms` results.
+
+    ``jsonl`` adds a ``matches`` list of ``{term, start, end}`` objects to
+    each verse record, ``tsv`` emits one row per match, and ``text`` follows
+    each wrapped verse with its ``term@start-end`` matches.
+    """
+
+    if output_format == "jsonl":
+        for verse, matches in results:
+            record = {
+                "reference": verse.reference,
+                "text": verse.text,
+                "paragraph_index": verse.paragraph_index,
+                "matches": [match._asdict() for match in matches],
+            }
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    elif output_format == "tsv":
+        yield TERM_TSV_HEADER
+        for verse, matches in results:
+            for match in matches:
+                yield f"{verse.reference}\t{match.term}\t{match.start}\t{match.end}\n"
+    else:
+        for verse, matches in results:
+            yield format_verse(verse, width=width, show_paragraphs=show_paragraphs) + "\n"
+            spans = ", ".join(f"{match.term}@{match.start}-{match.end}" for match in matches)
+            yield f"  matches: {spans}\n"
+
+
+def _canonical_order(book: str) -> tuple[int, str]:
+    return (BOOKS.index(book), book) if book in BOOKS else (len(BOOKS), book)
+
+
+def _run_term_search(args: argparse.Namespace) -> int:
+    """Answer ``--contains-any`` from the shared in-memory corpus."""
+
+    from scripts.corpus import shared_corpus
+
+    if args.source == "sqlite" or args.daemon is not None:
+        raise SystemExit("--contains-any reads the xml or text corpus directly")
+    try:
+        terms = load_terms(args.contains_any)
+    except OSError as exc:
+        raise SystemExit(f"Cannot read term list: {exc}") from None
+    automaton = TermAutomaton(terms, fold=args.fold)
+    if not len(automaton):
+        raise SystemExit(f"No terms found in {args.contains_any}")
+
+    corpus = shared_corpus(args.source)
+    if args.all_books:
+        books = sorted(corpus, key=_canonical_order)
+    else:
+        ensure_book(args.book, args.source)
+        books = [args.book]
+    verses = (verse for book in books for verse in corpus[book])
+    results = search_terms(verses, automaton, start=args.start, limit=args.limit)
+
+    counts = dict.fromkeys(automaton.terms, 0)
+    for _, matches in results:
+        for match in matches:
+            counts[match.term] += 1
+    matched = sum(1 for count in counts.values() if count)
+    print(
+        f"{matched} of {len(counts)} terms matched in {len(results)} verses", file=sys.stderr
+    )
+    for term, count in counts.items():
+        print(f"  {term}\t{count}", file=sys.stderr)
+
+    if not results:
+        stream = sys.stdout if args.output_format == "text" else sys.stderr
+        print("No verses matched the requested filters.", file=stream)
+        return 0
+    sys.stdout.writelines(
+        render_term_matches(
+            results,
+            output_format=args.output_format,
+            width=args.width,
+            show_paragraphs=args.show_paragraphs,
+        )
+    )
+    sys.stdout.flush()
+    return 0
+
+
+def _run_fuzzy_search(args: argparse.Namespace) -> int:
+    """Answer ``--fuzzy`` from the persisted edit-distance index."""
+
+    from scripts.corpus import shared_corpus
+    from scripts.fuzzy_index import DEFAULT_MAX_DISTANCE, load_or_build
+
+    if args.source == "sqlite" or args.daemon is not None:
+        raise SystemExit("--fuzzy reads the xml or text corpus directly")
+    if not args.all_books:
+        ensure_book(args.book, args.source)
+    distance = DEFAULT_MAX_DISTANCE if args.max_distance is None else args.max_distance
+    index = load_or_build(args.source, args.fuzzy_index, max_distance=distance)
+    found = index.lookup(args.fuzzy, distance)
+
+    corpus = shared_corpus(args.source)
+    forms_by_verse: dict[int, set[str]] = {}
+    verse_counts = []
+    for match in found:
+        verse_ids = [
+            verse_id
+            for verse_id in match.verse_ids
+            if args.all_books or book_of(verse_id) == args.book
+        ]
+        verse_counts.append(len(verse_ids))
+        for verse_id in verse_ids:
+            forms_by_verse.setdefault(verse_id, set()).add(match.form)
+
+    verses = []
+    for verse_id in sorted(forms_by_verse):
+        book = corpus[book_of(verse_id)]
+        verses.append(book[book.position(verse_id)])
+    verses = filter_verses(verses, start=args.start)
+    if args.limit and args.limit > 0:
+        verses = verses[: args.limit]
+    results = []
+    for verse in verses:
+        forms = forms_by_verse[parse_reference(verse.reference)]
+        matches = [
+            TermMatch(word, start, end)
+            for word, start, end in iter_word_spans(verse.text)
+            if accented_form(word) in forms
+        ]
+        results.append((verse, matches))
+
+    print(
+        f"{len(found)} forms within {distance} edits of '{args.fuzzy}' "
+        f"in {len(forms_by_verse)} verses",
+        file=sys.stderr,
+    )
+    for match, count in zip(found, verse_counts):
+        print(f"  {match.surface}\t{match.distance}\t{count}", file=sys.stderr)
+
+    if not results:
+        stream = sys.stdout if args.output_format == "text" else sys.stderr
+        print("No verses matched the requested filters.", file=stream)
+        return 0
+    sys.stdout.writelines(
+        render_term_matches(
+            results,
+            output_format=args.output_format,
+            width=args.width,
+            show_paragraphs=args.show_paragraphs,
+        )
+    )
+    sys.stdout.flush()
+    return 0
+
+
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--book", default="Mark", help="Book identifier to inspect")
     parser.add_argument(
         "--source",
-        choices=("xml", "text"),
+        choices=("xml", "text", "sqlite"),
         default="xml",
-        help="Corpus to use for verse extraction",
+        help="Corpus to use for verse extraction ('sqlite' reads the export_sqlite.py database)",
+    )
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=None,
+        help="SQLite database for --source sqlite (defaults to build/sblgnt.sqlite)",
     )
     parser.add_argument(
         "--limit",
@@ -278,10 +511,50 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         "--start",
         help="Start output at the first verse whose reference starts with this value",
     )
-    parser.add_argument(
+    terms = parser.add_mutually_exclusive_group()
+    terms.add_argument(
         "--contains",
         help="Filter verses to those containing this exact substring",
     )
+    terms.add_argument(
+        "--contains-any",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "Show verses containing any term listed in FILE (one per line, '#' comments) "
+            "with the matching terms and their code-point offsets"
+        ),
+    )
+    terms.add_argument(
+        "--fuzzy",
+        metavar="FORM",
+        help=(
+            "Show the corpus word forms within --max-distance edits of FORM "
+            "(accents kept, case ignored) and the verses using them"
+        ),
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=None,
+        help="Largest edit distance for --fuzzy (default: 2)",
+    )
+    parser.add_argument(
+        "--fuzzy-index",
+        type=Path,
+        default=None,
+        help="Edit-distance index file for --fuzzy (default: build/fuzzy-index.<source>.sqlite)",
+    )
+    parser.add_argument(
+        "--fold",
+        action="store_true",
+        help="Match --contains-any terms ignoring accents, case and final sigma",
+    )
+    parser.add_argument(
+        "--all-books",
+        action="store_true",
+        help="Search every book in canonical order (with --contains-any or --fuzzy)",
+    )
     parser.add_argument(
         "--list-books",
         action="store_true",
@@ -298,49 +571,139 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default=88,
         help="Wrap verse output to this column width",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="ADDRESS",
+        help=(
+            "Forward the query to a running corpus_daemon.py (Unix socket path or "
+            "host:port; defaults to the daemon's default socket)"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=("text", "jsonl", "tsv"),
+        default="text",
+        help="Output layout: wrapped console text, JSON Lines, or tab-separated values",
+    )
+    args = parser.parse_args(argv)
+    if args.contains_any is None and args.fold:
+        parser.error("--fold requires --contains-any")
+    if args.contains_any is None and args.fuzzy is None and args.all_books:
+        parser.error("--all-books requires --contains-any or --fuzzy")
+    if args.fuzzy is None and (args.max_distance is not None or args.fuzzy_index is not None):
+        parser.error("--max-distance and --fuzzy-index require --fuzzy")
+    if args.max_distance is not None and args.max_distance < 0:
+        parser.error("--max-distance must not be negative")
+    return args
 
 
-def main(argv: Optional[Sequence[str]] = None) -> int:
-    args = parse_args(argv)
+def _query_daemon(args: argparse.Namespace) -> Union[List[str], List[Verse]]:
+    """Answer the CLI request through a running corpus daemon."""
 
-    directory, suffix = _resolve_source_paths(args.source)
+    from scripts.corpus_daemon import DEFAULT_SOCKET, request_daemon, verse_from_dict
 
+    address = args.daemon or DEFAULT_SOCKET
     if args.list_books:
-        books = list_books(directory, suffix)
-        for book in books:
-            print(book)
-        return 0
+        return request_daemon(address, {"op": "books", "source": args.source})
+
+    records = request_daemon(
+        address,
+        {
+            "op": "select",
+            "source": args.source,
+            "book": args.book,
+            "start": args.start,
+            "contains": args.contains,
+            "limit": args.limit,
+        },
+    )
+    return [verse_from_dict(record) for record in records]
 
-    ensure_book(args.book, args.source)
 
-    if args.source == "text":
-        verses = list(iter_plain_verses(args.book))
-    else:
-        verses = list(iter_xml_verses(args.book))
+def _query_sqlite(args: argparse.Namespace) -> Union[List[str], List[Verse]]:
+    """Answer the CLI request from the SQLite export."""
 
-    # TITLE entries make sense for the plain text output but we hide them if the
-    # caller applies substring filtering since the title is rarely relevant.
-    if args.contains and verses and verses[0].reference == "TITLE":
-        verses = verses[1:]
+    import sqlite3
 
-    verses = filter_verses(verses, start=args.start, contains=args.contains)
+    from scripts.export_sqlite import DEFAULT_DATABASE, list_database_books, query_verses
 
-    to_render: Iterable[Verse]
-    if args.limit and args.limit > 0:
-        to_render = verses[: args.limit]
+    path = args.database or DEFAULT_DATABASE
+    if not path.exists():
+        raise SystemExit(
+            f"SQLite export not found at {path}.\n"
+            "Run `python scripts/export_sqlite.py` to build it first."
+        )
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        if args.list_books:
+            return list_database_books(connection)
+        rows = query_verses(
+            connection, args.book, start=args.start, contains=args.contains, limit=args.limit
+        )
+        return [Verse(reference, text, paragraph_index) for reference, text, paragraph_index in rows]
+    finally:
+        connection.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.contains_any is not None and not args.list_books:
+        return _run_term_search(args)
+    if args.fuzzy is not None and not args.list_books:
+        return _run_fuzzy_search(args)
+
+    if args.source == "sqlite" and args.daemon is None:
+        result = _query_sqlite(args)
+        if args.list_books:
+            for book in result:
+                print(book)
+            return 0
+        to_render = result
+    elif args.daemon is not None:
+        result = _query_daemon(args)
+        if args.list_books:
+            for book in result:
+                print(book)
+            return 0
+        to_render = result
     else:
-        to_render = verses
+        directory, suffix = _resolve_source_paths(args.source)
+
+        if args.list_books:
+            books = list_books(directory, suffix)
+            for book in books:
+                print(book)
+            return 0
+
+        ensure_book(args.book, args.source)
+
+        from scripts.corpus import shared_corpus
+
+        verses = shared_corpus(args.source)[args.book]
+        to_render = select_verses(
+            verses, start=args.start, contains=args.contains, limit=args.limit
+        )
 
     if not to_render:
-        print("No verses matched the requested filters.")
+        # Keep machine-readable streams empty so downstream parsers see no records.
+        stream = sys.stdout if args.output_format == "text" else sys.stderr
+        print("No verses matched the requested filters.", file=stream)
         return 0
 
-    for verse in to_render:
-        if verse.reference == "TITLE":
-            print(verse.text)
-        else:
-            print(format_verse(verse, width=args.width, show_paragraphs=args.show_paragraphs))
+    sys.stdout.writelines(
+        render_verses(
+            to_render,
+            output_format=args.output_format,
+            width=args.width,
+            show_paragraphs=args.show_paragraphs,
+        )
+    )
+    sys.stdout.flush()
 
     return 0
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Merge per-chapter clause shards into the published book clause file.
+
+Clause data is edited as one shard per chapter
+(``clause-shards/mark/mark-01.clauses.json``), each a complete clause payload
+in the ``docs/clause-schema.md`` format restricted to that chapter. Shards
+must keep their clauses in ``(verse_index, offset, clause_id)`` order and their
+registry in ``index`` order (``--split`` writes them that way), so the book
+file is produced with a streaming k-way merge (:func:`heapq.merge`) instead of
+a concatenate-and-sort. The order is checked while merging, and the verse
+registry and ``categories`` list are rebuilt in the same pass.
+
+The merged file records a digest of the shard contents in
+``generated.shard_digest`` and a digest of its own contents in
+``generated.content_digest``; when both still match, the merge is skipped.
+
+Examples
+--------
+Publish Mark's clauses from its shards::
+
+    python scripts/merge_clause_shards.py clause-shards/mark viewer/data/mark.clauses.json
+
+Split an existing book file into chapter shards::
+
+    python scripts/merge_clause_shards.py clause-shards/mark viewer/data/mark.clauses.json --split
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.clause_data import clause_sort_key, load_json, split_reference, write_json
+
+SHARD_GLOB = "*.clauses.json"
+CONFIDENCE_ORDER = ("low", "medium", "high")
+MERGE_AGENT = "clause-shard-merge.v1"
+
+
+class ShardError(ValueError):
+    """Raised when shards cannot be merged into one consistent book file."""
+
+
+def shard_paths(directory: Path) -> list[Path]:
+    """Return the shard files in ``directory`` in name (chapter) order."""
+
+    paths = sorted(directory.glob(SHARD_GLOB))
+    if not paths:
+        raise ShardError(f"No '{SHARD_GLOB}' shards found in '{directory}'")
+    return paths
+
+
+def shard_digest(paths: Iterable[Path]) -> str:
+    """Return a sha256 over the names and bytes of ``paths``."""
+
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def content_digest(payload: Mapping[str, Any]) -> str:
+    """Return a sha256 over ``payload`` without its own ``generated.content_digest``."""
+
+    generated = {
+        key: value for key, value in payload.get("generated", {}).items() if key != "content_digest"
+    }
+    body = json.dumps({**payload, "generated": generated}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _checked_order(
+    items: Iterable[Mapping[str, Any]], key: Callable[[Mapping[str, Any]], Any], label: str, order: str
+) -> Iterator[Mapping[str, Any]]:
+    """Yield ``items``, raising :class:`ShardError` as soon as ``key`` decreases."""
+
+    previous = None
+    for item in items:
+        current = key(item)
+        if previous is not None and current < previous:
+            raise ShardError(f"{item[label]}: shard is not in {order} order; re-split or sort it")
+        previous = current
+        yield item
+
+
+def _index_key(entry: Mapping[str, Any]) -> int:
+    return entry["index"]
+
+
+def _merge_registry(shards: Sequence[Mapping[str, Any]]) -> Iterator[dict[str, Any]]:
+    streams = [
+        _checked_order(shard["verses"], _index_key, "reference", "verse index") for shard in shards
+    ]
+    previous: Optional[Mapping[str, Any]] = None
+    for entry in heapq.merge(*streams, key=_index_key):
+        if previous is not None and entry["index"] == previous["index"]:
+            if entry != previous:
+                raise ShardError(f"{entry['reference']}: shards disagree on the registry entry")
+            continue
+        previous = entry
+        yield dict(entry)
+
+
+def _merged_generated(shards: Sequence[Mapping[str, Any]], digest: str) -> dict[str, Any]:
+    generated = [shard["generated"] for shard in shards]
+    agents = sorted({entry["agent"] for entry in generated})
+    confidence = min(
+        (entry.get("confidence", "low") for entry in generated),
+        key=lambda value: CONFIDENCE_ORDER.index(value) if value in CONFIDENCE_ORDER else 0,
+    )
+    if len(generated) == 1:
+        notes = generated[0].get("notes", "")
+    else:
+        notes = f"Merged from {len(generated)} chapter shards by {MERGE_AGENT}."
+    return {
+        "timestamp": max(entry["timestamp"] for entry in generated),
+        "agent": agents[0] if len(agents) == 1 else ", ".join(agents),
+        "confidence": confidence,
+        "notes": notes,
+        "shard_digest": digest,
+    }
+
+
+def merge_shards(shards: Sequence[Mapping[str, Any]], *, digest: str = "") -> dict[str, Any]:
+    """Merge already-loaded shard payloads into one book payload."""
+
+    if not shards:
+        raise ShardError("Nothing to merge")
+    book_ids = {shard["book_id"] for shard in shards}
+    if len(book_ids) != 1:
+        raise ShardError(f"Shards mix books: {', '.join(sorted(book_ids))}")
+
+    streams = [
+        _checked_order(shard["clauses"], clause_sort_key, "clause_id", "(verse_index, offset, clause_id)")
+        for shard in shards
+    ]
+    clauses = []
+    categories: set[str] = set()
+    seen_ids: set[str] = set()
+    for clause in heapq.merge(*streams, key=clause_sort_key):
+        if clause["clause_id"] in seen_ids:
+            raise ShardError(f"{clause['clause_id']}: clause_id appears in more than one shard")
+        seen_ids.add(clause["clause_id"])
+        categories.update(clause["category_tags"])
+        clauses.append(clause)
+
+    first = shards[0]
+    merged = {
+        "book_id": first["book_id"],
+        "display_name": first["display_name"],
+        "source_path": first["source_path"],
+        "generated": _merged_generated(shards, digest),
+        "verses": list(_merge_registry(shards)),
+        "clauses": clauses,
+        "categories": sorted(categories),
+    }
+    merged["generated"]["content_digest"] = content_digest(merged)
+    return merged
+
+
+def merge_directory(directory: Path) -> dict[str, Any]:
+    """Load and merge every shard in ``directory``."""
+
+    paths = shard_paths(directory)
+    return merge_shards([load_json(path) for path in paths], digest=shard_digest(paths))
+
+
+def is_up_to_date(directory: Path, output: Path) -> bool:
+    """Return ``True`` when ``output`` was merged from the current shards.
+
+    An output that was edited, truncated or no longer parses is never up to
+    date, whatever shard digest it records.
+    """
+
+    try:
+        payload = load_json(output)
+    except (OSError, ValueError):
+        return False
+    generated = payload.get("generated")
+    if not isinstance(generated, dict) or generated.get("content_digest") != content_digest(payload):
+        return False
+    return generated.get("shard_digest") == shard_digest(shard_paths(directory))
+
+
+def split_book_payload(payload: Mapping[str, Any]) -> dict[int, dict[str, Any]]:
+    """Split a book clause payload into ``{chapter: shard payload}``.
+
+    Clauses belong to the chapter of their start reference.
+    """
+
+    chapters: dict[int, dict[str, Any]] = {}
+
+    def shard_for(chapter: int) -> dict[str, Any]:
+        if chapter not in chapters:
+            generated = {
+                key: value
+                for key, value in payload["generated"].items()
+                if key not in ("shard_digest", "content_digest")
+            }
+            chapters[chapter] = {
+                "book_id": payload["book_id"],
+                "display_name": payload["display_name"],
+                "source_path": payload["source_path"],
+                "generated": generated,
+                "verses": [],
+                "clauses": [],
+                "categories": [],
+            }
+        return chapters[chapter]
+
+    for entry in payload["verses"]:
+        shard_for(entry["chapter"])["verses"].append(entry)
+    for clause in payload["clauses"]:
+        _, chapter, _ = split_reference(clause["start"]["reference"])
+        shard_for(chapter)["clauses"].append(clause)
+    for shard in chapters.values():
+        shard["categories"] = sorted(
+            {tag for clause in shard["clauses"] for tag in clause["category_tags"]}
+        )
+    return dict(sorted(chapters.items()))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("shards", type=Path, help="Directory holding the book's chapter shards")
+    parser.add_argument("output", type=Path, help="Published book clause file")
+    parser.add_argument(
+        "--force", action="store_true", help="Merge even when the shards are unchanged"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with status 1 if the output is stale instead of rewriting it",
+    )
+    parser.add_argument(
+        "--split",
+        action="store_true",
+        help="Write chapter shards from the existing output file instead of merging",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.split:
+        payload = load_json(args.output)
+        written = set()
+        for chapter, shard in split_book_payload(payload).items():
+            path = args.shards / f"{payload['book_id']}-{chapter:02d}.clauses.json"
+            write_json(path, shard)
+            written.add(path)
+        # Shards of chapters the book file no longer has would be merged back in.
+        stale = [path for path in args.shards.glob(SHARD_GLOB) if path not in written]
+        for path in stale:
+            path.unlink()
+        print(
+            f"Wrote {len(written)} shards to {args.shards}, removed {len(stale)} stale",
+            file=sys.stderr,
+        )
+        return 0
+
+    try:
+        if not args.force and is_up_to_date(args.shards, args.output):
+            print(f"{args.output} is up to date", file=sys.stderr)
+            return 0
+        if args.check:
+            print(f"{args.output} is stale; re-run without --check", file=sys.stderr)
+            return 1
+        merged = merge_directory(args.shards)
+    except ShardError as exc:
+        raise SystemExit(str(exc)) from None
+
+    write_json(args.output, merged)
+    print(
+        f"Merged {len(merged['clauses'])} clauses over {len(merged['verses'])} verses "
+        f"into {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""Aho–Corasick multi-term substring search over verse text.
+
+Checking a list of word forms with ``--contains`` means one corpus scan per
+term. :class:`TermAutomaton` compiles the whole list into a single automaton
+instead: a trie of the terms with failure links, where every node carries the
+terms that end there (directly or through its failure chain). One pass over a
+verse then reports every occurrence of every term, including overlapping
+ones, in time proportional to the text length plus the number of matches.
+
+With ``fold=True`` terms and text are compared in the accent-, case- and
+final-sigma-folded form of :func:`scripts.greek_text.fold_with_offsets`.
+Matches are always reported as code-point offsets into the original text.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from scripts.greek_text import fold_with_offsets
+
+
+class TermMatch(NamedTuple):
+    """One occurrence of ``term`` at ``text[start:end]``."""
+
+    term: str
+    start: int
+    end: int
+
+
+def load_terms(path: Path) -> list[str]:
+    """Read one term per line, skipping blank lines and ``#`` comments."""
+
+    terms = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        term = line.strip()
+        if term and not term.startswith("#"):
+            terms.append(term)
+    return terms
+
+
+class TermAutomaton:
+    """Aho–Corasick automaton over a fixed term list."""
+
+    def __init__(self, terms: Iterable[str], *, fold: bool = False) -> None:
+        self.fold = fold
+        self.terms: list[str] = []
+        self._lengths: list[int] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        seen: set[str] = set()
+        for term in terms:
+            key = self._key(term)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            node = 0
+            for char in key:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = child
+            self._outputs[node].append(len(self.terms))
+            self.terms.append(term)
+            self._lengths.append(len(key))
+
+        # Breadth-first, so a node's failure target is finished before it.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                target = self._fail[node]
+                while target and char not in self._goto[target]:
+                    target = self._fail[target]
+                self._fail[child] = self._goto[target].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def _key(self, term: str) -> str:
+        if self.fold:
+            return fold_with_offsets(term)[0]
+        return term
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _scan(self, text: str) -> Iterator[tuple[int, int, int]]:
+        goto, fail, outputs, lengths = self._goto, self._fail, self._outputs, self._lengths
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in outputs[node]:
+                yield index, position + 1 - lengths[index], position + 1
+
+    def find_all(self, text: str) -> list[TermMatch]:
+        """Return every term occurrence in ``text``, ordered by start and then end offset."""
+
+        if not self.fold:
+            matches = [
+                TermMatch(self.terms[index], start, end) for index, start, end in self._scan(text)
+            ]
+        else:
+            folded, origins = fold_with_offsets(text)
+            matches = []
+            for index, start, end in self._scan(folded):
+                # Extend over combining marks that followed the last matched
+                # base character in decomposed input.
+                stop = origins[end - 1] + 1
+                while stop < len(text) and unicodedata.combining(text[stop]):
+                    stop += 1
+                matches.append(TermMatch(self.terms[index], origins[start], stop))
+        matches.sort(key=lambda match: (match.start, match.end))
+        return matches
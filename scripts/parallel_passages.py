@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Find parallel passages between two books with MinHash and LSH.
+
+Comparing every verse of one book with every verse of another is quadratic.
+This script finds near-duplicate verses in roughly linear time instead:
+
+1. Each verse is reduced to :func:`scripts.greek_text.normalize_text` (no
+   accents, case or punctuation) and cut into overlapping character
+   shingles of ``--shingle-size`` code points.
+2. MinHash signatures of ``--bands × --rows`` universal hash functions
+   ``(a·x + b) mod (2³¹ − 1)`` are computed with NumPy in batches of
+   shingle memberships, so memory stays bounded.
+3. Signatures are cut into ``--bands`` bands of ``--rows`` values. Verses
+   that agree on a whole band share an LSH bucket and become a candidate
+   pair. A pair with Jaccard similarity ``s`` is caught with probability
+   ``1 − (1 − s^rows)^bands``; the defaults (32 × 4) make the switch around
+   ``s ≈ 0.42``.
+4. Every candidate is scored with its exact shingle Jaccard similarity, and
+   pairs at or above ``--threshold`` are ranked.
+
+Passing the same payload twice lists parallels within one book.
+
+Examples
+--------
+Rank Mark–Matthew parallels::
+
+    python scripts/parallel_passages.py viewer/data/mark.json viewer/data/matthew.json \\
+        --output build/mark-matthew.parallels.json --tsv build/mark-matthew.parallels.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.greek_text import normalize_text
+
+MERSENNE_PRIME = (1 << 31) - 1
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 4
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_SEED = 1
+BATCH_MEMBERSHIPS = 1 << 16
+
+
+@dataclass
+class ShingleSets:
+    """Shingle memberships of a verse list as parallel arrays."""
+
+    verse: np.ndarray  # verse index per membership, ascending
+    shingle: np.ndarray  # shingle id per membership
+    verse_count: int
+
+
+def shingle_verses(
+    verses: Sequence[Mapping[str, Any]], size: int, shingle_ids: dict[str, int]
+) -> ShingleSets:
+    """Return the distinct character shingles of every normalized verse.
+
+    ``shingle_ids`` is shared between the books being compared so equal
+    shingles get equal ids. Verses shorter than ``size`` become one shingle.
+    """
+
+    verse_column: list[int] = []
+    shingle_column: list[int] = []
+    for index, verse in enumerate(verses):
+        text = normalize_text(verse["text"])
+        if not text:
+            continue
+        pieces = {text[start : start + size] for start in range(max(len(text) - size + 1, 1))}
+        for piece in sorted(pieces):
+            verse_column.append(index)
+            shingle_column.append(shingle_ids.setdefault(piece, len(shingle_ids)))
+    return ShingleSets(
+        verse=np.asarray(verse_column, dtype=np.int64),
+        shingle=np.asarray(shingle_column, dtype=np.int64),
+        verse_count=len(verses),
+    )
+
+
+def hash_parameters(permutations: int, seed: int = DEFAULT_SEED) -> tuple[np.ndarray, np.ndarray]:
+    """Return the ``(a, b)`` coefficients of the universal hash family."""
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=permutations, dtype=np.int64)
+    b = rng.integers(0, MERSENNE_PRIME, size=permutations, dtype=np.int64)
+    return a, b
+
+
+def minhash_signatures(
+    sets: ShingleSets,
+    a: np.ndarray,
+    b: np.ndarray,
+    *,
+    batch: int = BATCH_MEMBERSHIPS,
+) -> np.ndarray:
+    """Return a ``(verse_count, permutations)`` signature matrix.
+
+    Memberships are hashed ``batch`` at a time and reduced per verse with
+    ``np.minimum.reduceat``. Verses without shingles keep the maximum value
+    and never collide with anything but each other.
+    """
+
+    signatures = np.full((sets.verse_count, a.size), MERSENNE_PRIME, dtype=np.int64)
+    for start in range(0, sets.verse.size, batch):
+        verse = sets.verse[start : start + batch]
+        hashed = (sets.shingle[start : start + batch, None] * a[None, :] + b[None, :]) % MERSENNE_PRIME
+        boundaries = np.flatnonzero(np.r_[True, verse[1:] != verse[:-1]])
+        rows = verse[boundaries]
+        # A verse may straddle two batches, so merge with what is already there.
+        signatures[rows] = np.minimum(
+            signatures[rows], np.minimum.reduceat(hashed, boundaries, axis=0)
+        )
+    return signatures
+
+
+def _band_buckets(signatures: np.ndarray, band: int, rows: int) -> np.ndarray:
+    block = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+    _, inverse = np.unique(block, axis=0, return_inverse=True)
+    return inverse.reshape(-1)
+
+
+def candidate_pairs(
+    left: np.ndarray, right: np.ndarray, bands: int, rows: int, *, same_book: bool = False
+) -> np.ndarray:
+    """Return ``(n, 2)`` unique ``(left, right)`` index pairs sharing any LSH bucket."""
+
+    left_count = left.shape[0]
+    right_count = right.shape[0]
+    keys = []
+    combined = np.concatenate([left, right])
+    for band in range(bands):
+        buckets = _band_buckets(combined, band, rows)
+        left_buckets, right_buckets = buckets[:left_count], buckets[left_count:]
+        order = np.argsort(left_buckets, kind="stable")
+        sorted_buckets = left_buckets[order]
+        low = np.searchsorted(sorted_buckets, right_buckets, side="left")
+        high = np.searchsorted(sorted_buckets, right_buckets, side="right")
+        counts = high - low
+        if not counts.any():
+            continue
+        right_index = np.repeat(np.arange(right_count), counts)
+        within = np.arange(right_index.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        left_index = order[np.repeat(low, counts) + within]
+        keys.append(left_index * right_count + right_index)
+    if not keys:
+        return np.empty((0, 2), dtype=np.int64)
+    unique = np.unique(np.concatenate(keys))
+    pairs = np.stack([unique // right_count, unique % right_count], axis=1)
+    if same_book:
+        pairs = pairs[pairs[:, 0] < pairs[:, 1]]
+    return pairs
+
+
+def _shingle_lists(sets: ShingleSets) -> list[frozenset[int]]:
+    boundaries = np.searchsorted(sets.verse, np.arange(sets.verse_count + 1))
+    shingles = sets.shingle.tolist()
+    return [
+        frozenset(shingles[boundaries[index] : boundaries[index + 1]])
+        for index in range(sets.verse_count)
+    ]
+
+
+def find_parallels(
+    left_payload: Mapping[str, Any],
+    right_payload: Mapping[str, Any],
+    *,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    bands: int = DEFAULT_BANDS,
+    rows: int = DEFAULT_ROWS,
+    threshold: float = DEFAULT_THRESHOLD,
+    seed: int = DEFAULT_SEED,
+) -> dict[str, Any]:
+    """Return the ranked parallels report for two payloads."""
+
+    left_verses = left_payload["verses"]
+    right_verses = right_payload["verses"]
+    same_book = left_payload is right_payload or (
+        left_payload.get("book_id") is not None
+        and left_payload.get("book_id") == right_payload.get("book_id")
+    )
+
+    shingle_ids: dict[str, int] = {}
+    left_sets = shingle_verses(left_verses, shingle_size, shingle_ids)
+    right_sets = shingle_verses(right_verses, shingle_size, shingle_ids)
+    a, b = hash_parameters(bands * rows, seed)
+    left_signatures = minhash_signatures(left_sets, a, b)
+    right_signatures = minhash_signatures(right_sets, a, b)
+
+    pairs = candidate_pairs(left_signatures, right_signatures, bands, rows, same_book=same_book)
+    left_shingles = _shingle_lists(left_sets)
+    right_shingles = _shingle_lists(right_sets)
+    estimates = (left_signatures[pairs[:, 0]] == right_signatures[pairs[:, 1]]).mean(axis=1)
+
+    rows_out = []
+    for (left_index, right_index), estimate in zip(pairs.tolist(), estimates.tolist()):
+        first, second = left_shingles[left_index], right_shingles[right_index]
+        if not first or not second:
+            continue
+        similarity = len(first & second) / len(first | second)
+        if similarity >= threshold:
+            rows_out.append(
+                {
+                    "left": left_verses[left_index]["reference"],
+                    "right": right_verses[right_index]["reference"],
+                    "similarity": round(similarity, 4),
+                    "estimate": round(estimate, 4),
+                    "left_index": left_index,
+                    "right_index": right_index,
+                }
+            )
+    rows_out.sort(key=lambda row: (-row["similarity"], row["left_index"], row["right_index"]))
+
+    return {
+        "left": left_payload.get("book_id"),
+        "right": right_payload.get("book_id"),
+        "method": {
+            "shingles": f"character {shingle_size}-grams of normalize_text",
+            "permutations": bands * rows,
+            "bands": bands,
+            "rows": rows,
+            "seed": seed,
+            "threshold": threshold,
+        },
+        "verse_counts": [len(left_verses), len(right_verses)],
+        "candidate_count": int(pairs.shape[0]),
+        "parallel_count": len(rows_out),
+        "parallels": rows_out,
+    }
+
+
+def write_tsv(path: Path, report: Mapping[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("rank\tleft\tright\tsimilarity\testimate\n")
+        for rank, row in enumerate(report["parallels"], start=1):
+            handle.write(
+                f"{rank}\t{row['left']}\t{row['right']}\t{row['similarity']}\t{row['estimate']}\n"
+            )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("left", type=Path, help="First viewer payload (e.g. viewer/data/mark.json)")
+    parser.add_argument("right", type=Path, help="Second viewer payload (may equal the first)")
+    parser.add_argument(
+        "--shingle-size",
+        type=int,
+        default=DEFAULT_SHINGLE_SIZE,
+        help="Characters per shingle of the normalized verse text",
+    )
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="LSH bands")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Signature rows per band")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Minimum exact Jaccard similarity for a reported parallel",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Hash family seed")
+    parser.add_argument("--output", type=Path, default=None, help="JSON report path (default: stdout)")
+    parser.add_argument("--tsv", type=Path, default=None, help="Also write the ranked table as TSV")
+    args = parser.parse_args(argv)
+    if args.shingle_size < 1 or args.bands < 1 or args.rows < 1:
+        parser.error("--shingle-size, --bands and --rows must be positive")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    left = json.loads(args.left.read_text(encoding="utf-8"))
+    right = left if args.right == args.left else json.loads(args.right.read_text(encoding="utf-8"))
+    report = find_parallels(
+        left,
+        right,
+        shingle_size=args.shingle_size,
+        bands=args.bands,
+        rows=args.rows,
+        threshold=args.threshold,
+        seed=args.seed,
+    )
+
+    rendered = json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered, encoding="utf-8")
+    else:
+        sys.stdout.write(rendered)
+    if args.tsv:
+        write_tsv(args.tsv, report)
+    print(
+        f"{report['candidate_count']} candidate pairs, {report['parallel_count']} parallels",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
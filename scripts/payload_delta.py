@@ -0,0 +1,133 @@
+"""Content hashes and build-to-build deltas for viewer payloads.
+
+Every verse record gets a ``hash`` over its canonical JSON form, each chapter
+a hash over its verses' hashes, and the payload a ``content_hash`` over the
+header and chapter hashes. Because the hashes depend only on content they can
+be recomputed for any earlier payload, hashed or not.
+
+A delta rebuilds the new ``verses`` array from the old one with a short edit
+script computed by :class:`difflib.SequenceMatcher` over the verse hashes:
+``["copy", start, end]`` reuses ``old[start:end]`` and ``["insert", [...]]``
+adds new verse records. Clients whose cached payload has the delta's
+``from`` hash apply it with :func:`apply_delta` (or its JavaScript
+equivalent) instead of downloading the whole book again.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from scripts import verse_ref
+
+HASH_LENGTH = 16
+DELTA_VERSION = 1
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def verse_hash(verse: Mapping[str, Any]) -> str:
+    """Hash the canonical JSON form of ``verse`` (ignoring any existing ``hash``)."""
+
+    record = {key: value for key, value in verse.items() if key != "hash"}
+    canonical = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return _digest(canonical.encode("utf-8"))
+
+
+def chapter_of(reference: str) -> str:
+    """Return the chapter number of ``"Book C:V"`` as a string.
+
+    A reference :mod:`scripts.verse_ref` cannot parse falls back to the text
+    after the last space, up to the colon.
+    """
+
+    verse_id = verse_ref.try_parse_reference(reference)
+    if verse_id is None:
+        return reference.rpartition(" ")[2].partition(":")[0]
+    return str(verse_ref.chapter_of(verse_id))
+
+
+def add_content_hashes(payload: dict[str, Any]) -> dict[str, Any]:
+    """Store verse, chapter and payload hashes in ``payload`` and return it."""
+
+    chapters: dict[str, list[str]] = {}
+    for verse in payload["verses"]:
+        verse["hash"] = verse_hash(verse)
+        chapters.setdefault(chapter_of(verse["reference"]), []).append(verse["hash"])
+
+    chapter_hashes = {
+        chapter: _digest("".join(hashes).encode("ascii")) for chapter, hashes in chapters.items()
+    }
+    payload["chapter_hashes"] = chapter_hashes
+    header = json.dumps(payload.get("header"), ensure_ascii=False)
+    combined = header + "".join(f"{chapter}:{value}" for chapter, value in chapter_hashes.items())
+    payload["content_hash"] = _digest(combined.encode("utf-8"))
+    return payload
+
+
+def content_hash(payload: Mapping[str, Any]) -> str:
+    """Return the ``content_hash`` ``payload`` has or would have once hashed."""
+
+    copy = dict(payload)
+    copy["verses"] = [dict(verse) for verse in payload["verses"]]
+    return add_content_hashes(copy)["content_hash"]
+
+
+def build_delta(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the delta that turns payload ``old`` into hashed payload ``new``."""
+
+    old_hashes = [verse_hash(verse) for verse in old["verses"]]
+    new_verses = new["verses"]
+    new_hashes = [verse["hash"] for verse in new_verses]
+
+    operations: list[list[Any]] = []
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append(["copy", i1, i2])
+        elif j2 > j1:
+            operations.append(["insert", [dict(verse) for verse in new_verses[j1:j2]]])
+
+    delta: dict[str, Any] = {
+        "version": DELTA_VERSION,
+        "book_id": new.get("book_id"),
+        "from": content_hash(old),
+        "to": new["content_hash"],
+        "verse_count": len(new_verses),
+        "operations": operations,
+    }
+    if old.get("header") != new.get("header"):
+        delta["header"] = new.get("header")
+    return delta
+
+
+def apply_delta(payload: Mapping[str, Any], delta: Mapping[str, Any]) -> dict[str, Any]:
+    """Return ``payload`` with ``delta`` applied; raise ``ValueError`` on a hash mismatch."""
+
+    if content_hash(payload) != delta["from"]:
+        raise ValueError("Delta does not apply to this payload version")
+
+    old_verses = payload["verses"]
+    verses: list[dict[str, Any]] = []
+    for operation in delta["operations"]:
+        if operation[0] == "copy":
+            verses.extend(dict(verse) for verse in old_verses[operation[1] : operation[2]])
+        elif operation[0] == "insert":
+            verses.extend(dict(verse) for verse in operation[1])
+        else:
+            raise ValueError(f"Unknown delta operation '{operation[0]}'")
+
+    updated = dict(payload)
+    if "header" in delta:
+        updated["header"] = delta["header"]
+    updated["verses"] = verses
+    add_content_hashes(updated)
+    if len(verses) != delta["verse_count"] or updated["content_hash"] != delta["to"]:
+        raise ValueError("Delta produced a payload that does not match its target hash")
+    return updated
+
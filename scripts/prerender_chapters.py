@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Prerender one static HTML fragment per chapter with clause spans in place.
+
+For every book in the viewer manifest this writes
+``viewer/data/prerendered/<book_id>/<chapter>.html`` containing the
+``<article class="verse">`` elements that ``renderVerses`` would build. Clause
+overlays from ``<book>.clauses.json`` become ``<span class="clause-highlight">``
+elements, exactly as ``createHighlightedContent`` produces them. The viewer
+can inject a fragment into its container and rely on its delegated click and
+keydown handlers instead of building the DOM verse by verse.
+
+Each book directory has an ``index.json`` listing its chapter fragments with
+a hash of their inputs. Chapters whose verses, clause ranges and renderer
+version are unchanged are skipped; the rest are rendered in a process pool.
+
+Examples
+--------
+Prerender every manifest book::
+
+    python scripts/prerender_chapters.py
+
+Force a full re-render on a single worker::
+
+    python scripts/prerender_chapters.py --force --jobs 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.payload_delta import chapter_of
+from scripts.viewer_manifest import DEFAULT_MANIFEST, manifest_books, manifest_locations
+
+RENDERER_VERSION = 1
+INDEX_NAME = "index.json"
+
+ClauseRange = dict[str, Any]
+
+
+def clause_ranges(clause_payload: Optional[Mapping[str, Any]]) -> dict[str, list[ClauseRange]]:
+    """Return ``{reference: [range, …]}`` the way the viewer's ``buildClauseLookup`` does."""
+
+    if not clause_payload:
+        return {}
+    counts = {
+        entry["reference"]: entry.get("character_count")
+        for entry in clause_payload.get("verses", [])
+    }
+    lookup: dict[str, list[ClauseRange]] = {}
+    for clause in clause_payload.get("clauses", []):
+        references = [reference.strip() for reference in clause.get("references", []) if reference.strip()]
+        if not references:
+            continue
+        start_offset = max(0, clause.get("start", {}).get("offset", 0))
+        end_offset = max(start_offset, clause.get("end", {}).get("offset", start_offset))
+        description = (clause.get("function") or "").strip()
+        tags = [tag.strip() for tag in clause.get("category_tags", []) if tag.strip()]
+
+        for index, reference in enumerate(references):
+            count = counts.get(reference)
+            if len(references) == 1:
+                start, end = start_offset, end_offset
+            elif index == 0:
+                start, end = start_offset, count if count is not None else end_offset
+            elif index == len(references) - 1:
+                start, end = 0, end_offset
+            else:
+                start, end = 0, count if count is not None else end_offset
+            lookup.setdefault(reference, []).append(
+                {
+                    "clause_id": clause.get("clause_id", "").strip(),
+                    "start": start,
+                    "end": end,
+                    "tags": tags,
+                    "description": description,
+                }
+            )
+    for ranges in lookup.values():
+        ranges.sort(key=lambda item: (item["start"], item["end"], item["clause_id"]))
+    return lookup
+
+
+def render_text(text: str, ranges: Sequence[ClauseRange]) -> str:
+    """Return the escaped verse text with clause highlight spans."""
+
+    if not ranges:
+        return escape(text, quote=False)
+    parts = []
+    cursor = 0
+    length = len(text)
+    for item in ranges:
+        start = min(max(item["start"], 0), length)
+        end = min(max(item["end"], start), length)
+        if start > cursor:
+            parts.append(escape(text[cursor:start], quote=False))
+        attributes = ['class="clause-highlight"']
+        if item["clause_id"]:
+            label = item["description"] or f"Clause {item['clause_id']}"
+            attributes += [
+                f'data-clause-id="{escape(item["clause_id"])}"',
+                'role="button"',
+                'tabindex="0"',
+                'aria-pressed="false"',
+                f'aria-label="{escape(label)}"',
+            ]
+        if item["tags"]:
+            attributes.append(f'data-clause-tags="{escape(",".join(item["tags"]))}"')
+        if item["description"]:
+            attributes.append(f'title="{escape(item["description"])}"')
+        parts.append(f"<span {' '.join(attributes)}>{escape(text[start:end], quote=False)}</span>")
+        cursor = end
+    if cursor < length:
+        parts.append(escape(text[cursor:], quote=False))
+    return "".join(parts)
+
+
+def render_chapter(verses: Sequence[Mapping[str, Any]], lookup: Mapping[str, list[ClauseRange]]) -> str:
+    """Return the HTML fragment for ``verses``."""
+
+    lines = []
+    for verse in verses:
+        reference = verse.get("reference", "")
+        ranges = lookup.get(reference, [])
+        attributes = ['class="verse"']
+        if reference:
+            attributes.append(f'data-reference="{escape(reference)}"')
+        if ranges:
+            attributes.append('data-has-clauses="true"')
+        lines.append(
+            f"<article {' '.join(attributes)}>"
+            f'<span class="verse-ref">{escape(reference, quote=False)}</span>'
+            f'<span class="verse-text">{render_text(verse.get("text", ""), ranges)}</span>'
+            "</article>"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def chapter_input_hash(
+    verses: Sequence[Mapping[str, Any]], lookup: Mapping[str, list[ClauseRange]]
+) -> str:
+    material = {
+        "renderer": RENDERER_VERSION,
+        "verses": [[verse.get("reference"), verse.get("text")] for verse in verses],
+        "ranges": [lookup.get(verse.get("reference", ""), []) for verse in verses],
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _render_job(job: tuple[Path, list[Mapping[str, Any]], dict[str, list[ClauseRange]]]) -> str:
+    path, verses, lookup = job
+    path.write_text(render_chapter(verses, lookup), encoding="utf-8")
+    return path.name
+
+
+def prerender(
+    manifest_path: Path,
+    output_dir: Path,
+    *,
+    force: bool = False,
+    jobs: Optional[int] = None,
+) -> dict[str, Any]:
+    """Render every changed chapter; return per-book rendered/skipped counts."""
+
+    work = []
+    summary: dict[str, Any] = {}
+    indexes: dict[Path, dict[str, Any]] = {}
+    for book in manifest_books(manifest_path):
+        payload = json.loads(book.payload_path.read_text(encoding="utf-8"))
+        clause_payload = (
+            json.loads(book.clause_path.read_text(encoding="utf-8")) if book.clause_path else None
+        )
+        lookup = clause_ranges(clause_payload)
+
+        chapters: dict[str, list[Mapping[str, Any]]] = {}
+        for verse in payload["verses"]:
+            chapters.setdefault(chapter_of(verse["reference"]), []).append(verse)
+
+        book_dir = output_dir / book.book_id
+        index_path = book_dir / INDEX_NAME
+        previous: dict[str, Any] = {}
+        if index_path.exists():
+            previous = json.loads(index_path.read_text(encoding="utf-8")).get("chapters", {})
+
+        entries = {}
+        rendered = 0
+        for chapter, verses in chapters.items():
+            file_name = f"{chapter}.html"
+            digest = chapter_input_hash(verses, lookup)
+            entries[chapter] = {
+                "path": file_name,
+                "input_hash": digest,
+                "first_reference": verses[0]["reference"],
+                "verse_count": len(verses),
+            }
+            if (
+                not force
+                and previous.get(chapter, {}).get("input_hash") == digest
+                and (book_dir / file_name).exists()
+            ):
+                continue
+            chapter_lookup = {
+                verse["reference"]: lookup[verse["reference"]]
+                for verse in verses
+                if verse["reference"] in lookup
+            }
+            work.append((book_dir / file_name, verses, chapter_lookup))
+            rendered += 1
+
+        book_dir.mkdir(parents=True, exist_ok=True)
+        # Chapters that no longer exist lose their fragments, forced run or not.
+        for stale in set(previous) - set(entries):
+            (book_dir / previous[stale]["path"]).unlink(missing_ok=True)
+        indexes[index_path] = {
+            "version": RENDERER_VERSION,
+            "book_id": book.book_id,
+            "chapters": entries,
+        }
+        summary[book.book_id] = {"rendered": rendered, "skipped": len(entries) - rendered}
+
+    if jobs == 1 or len(work) <= 1:
+        for job in work:
+            _render_job(job)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(_render_job, work, chunksize=8))
+
+    # Indexes are written last so an interrupted run re-renders what it missed.
+    for index_path, index in indexes.items():
+        index_path.write_text(json.dumps(index, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return summary
+
+
+def record_in_manifest(manifest_path: Path, output_dir: Path) -> None:
+    """Point each manifest entry with rendered fragments at its ``index.json``."""
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    changed = False
+    for entry in manifest.get("books", []):
+        if not isinstance(entry, dict):
+            continue
+        index_path = output_dir / entry.get("book_id", "") / INDEX_NAME
+        if not index_path.exists():
+            continue
+        relative, url = manifest_locations(manifest_path, index_path)
+        if entry.get("prerendered_path") != relative or entry.get("prerendered_url") != url:
+            entry["prerendered_path"] = relative
+            entry["prerendered_url"] = url
+            changed = True
+    if changed:
+        manifest_path.write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST,
+        help="Viewer manifest listing the books to render",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Fragment directory (defaults to <manifest dir>/prerendered)",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged chapters too")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes to use (defaults to the CPU count; 1 disables the pool)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    output_dir = args.output or args.manifest.parent / "prerendered"
+
+    summary = prerender(
+        args.manifest, output_dir, force=args.force, jobs=args.jobs or os.cpu_count()
+    )
+    record_in_manifest(args.manifest, output_dir)
+    for book_id, counts in summary.items():
+        print(
+            f"{book_id}: {counts['rendered']} chapters rendered, {counts['skipped']} unchanged",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Re-align clause offsets after verse text corrections.
+
+Clause boundaries are code-point offsets into verse text, so any upstream
+edit (a sigla fix, whitespace normalization, …) shifts them. Rather than
+regenerating clauses, this tool diffs the old and new text of every verse in
+a clause file's registry, maps each ``start``/``end`` offset through the
+:class:`difflib.SequenceMatcher` edit script, and updates ``character_count``.
+Verses whose text is unchanged are not touched.
+
+A boundary that falls strictly inside a replaced or deleted region has no
+exact counterpart in the new text. It is moved to the start of the
+replacement and its clause is flagged for review by setting
+``source.validation.alignment`` to ``"pending"``. Text inserted or replaced
+exactly at a boundary joins the following clause, except for leading
+whitespace, which stays in front of the boundary.
+
+Examples
+--------
+Re-align Mark's clause shards after regenerating ``viewer/data/mark.json``::
+
+    git show HEAD:viewer/data/mark.json > /tmp/mark-old.json
+    python scripts/realign_clauses.py /tmp/mark-old.json viewer/data/mark.json \\
+        clause-shards/mark/*.clauses.json
+    python scripts/merge_clause_shards.py clause-shards/mark viewer/data/mark.clauses.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import sys
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.clause_data import load_json, write_json
+
+REVIEW_STATUS = "pending"
+
+
+class OffsetMap:
+    """Maps code-point offsets in an old string onto a new string."""
+
+    def __init__(self, old: str, new: str) -> None:
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        self._opcodes = matcher.get_opcodes()
+        self._starts = [opcode[1] for opcode in self._opcodes]
+        self.old_length = len(old)
+        self.new_length = len(new)
+        self._new = new
+
+    def map(self, offset: int) -> tuple[int, bool]:
+        """Return ``(new_offset, exact)`` for ``offset`` in the old string.
+
+        ``exact`` is ``False`` when ``offset`` lies strictly inside an edited
+        region.
+        """
+
+        if offset >= self.old_length:
+            return self.new_length, True
+        position = bisect_left(self._starts, offset)
+        if position < len(self._starts) and self._starts[position] == offset:
+            # The boundary sits on an opcode edge: new text from an insert or
+            # replace goes to the clause starting here, minus leading spaces.
+            tag, _, _, j1, j2 = self._opcodes[position]
+            if tag in ("insert", "replace"):
+                inserted = self._new[j1:j2]
+                j1 += len(inserted) - len(inserted.lstrip())
+            return j1, True
+        tag, i1, _, j1, _ = self._opcodes[position - 1]
+        if tag == "equal":
+            return j1 + offset - i1, True
+        return j1, False
+
+
+@dataclass
+class RealignReport:
+    """What :func:`realign_payload` changed in one clause payload."""
+
+    changed_verses: list[str] = field(default_factory=list)
+    moved_clauses: list[str] = field(default_factory=list)
+    flagged_clauses: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return {
+            "changed_verses": self.changed_verses,
+            "moved_clauses": self.moved_clauses,
+            "flagged_clauses": self.flagged_clauses,
+        }
+
+
+def _texts_by_reference(verses: Sequence[Mapping[str, Any]]) -> dict[str, tuple[int, str]]:
+    return {verse["reference"]: (index, verse["text"]) for index, verse in enumerate(verses)}
+
+
+def realign_payload(
+    payload: dict[str, Any],
+    old_verses: Sequence[Mapping[str, Any]],
+    new_verses: Sequence[Mapping[str, Any]],
+) -> RealignReport:
+    """Update ``payload`` in place for the text change ``old_verses`` → ``new_verses``."""
+
+    old_texts = _texts_by_reference(old_verses)
+    new_texts = _texts_by_reference(new_verses)
+    report = RealignReport()
+
+    maps: dict[str, OffsetMap] = {}
+    for entry in payload["verses"]:
+        reference = entry["reference"]
+        if reference not in old_texts or reference not in new_texts:
+            raise ValueError(f"{reference}: verse missing from the old or new payload")
+        _, old_text = old_texts[reference]
+        new_index, new_text = new_texts[reference]
+        if len(old_text) != entry["character_count"]:
+            raise ValueError(
+                f"{reference}: old text has {len(old_text)} code points but the registry "
+                f"records {entry['character_count']}; is this the payload the clauses were built on?"
+            )
+        if new_index != entry["index"]:
+            raise ValueError(f"{reference}: verse moved from index {entry['index']} to {new_index}")
+        if old_text == new_text:
+            continue
+        maps[reference] = OffsetMap(old_text, new_text)
+        entry["character_count"] = len(new_text)
+        report.changed_verses.append(reference)
+
+    if not maps:
+        return report
+
+    for clause in payload["clauses"]:
+        moved = False
+        exact = True
+        for boundary in (clause["start"], clause["end"]):
+            offset_map = maps.get(boundary["reference"])
+            if offset_map is None:
+                continue
+            new_offset, boundary_exact = offset_map.map(boundary["offset"])
+            moved = moved or new_offset != boundary["offset"]
+            exact = exact and boundary_exact
+            boundary["offset"] = new_offset
+        if moved:
+            report.moved_clauses.append(clause["clause_id"])
+        if not exact:
+            clause["source"].setdefault("validation", {})["alignment"] = REVIEW_STATUS
+            report.flagged_clauses.append(clause["clause_id"])
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("old_payload", type=Path, help="Viewer payload the clauses were built on")
+    parser.add_argument("new_payload", type=Path, help="Corrected viewer payload")
+    parser.add_argument(
+        "clause_files", type=Path, nargs="+", help="Clause files or shards to update in place"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report the changes without writing any file"
+    )
+    parser.add_argument(
+        "--report", type=Path, default=None, help="Write a JSON report of the changes here"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    old_verses = load_json(args.old_payload)["verses"]
+    new_verses = load_json(args.new_payload)["verses"]
+
+    reports: dict[str, dict[str, list[str]]] = {}
+    for path in args.clause_files:
+        payload = load_json(path)
+        try:
+            report = realign_payload(payload, old_verses, new_verses)
+        except ValueError as exc:
+            raise SystemExit(f"{path}: {exc}") from None
+        reports[str(path)] = report.as_dict()
+        if report.changed_verses and not args.dry_run:
+            write_json(path, payload)
+        print(
+            f"{path}: {len(report.changed_verses)} verses changed, "
+            f"{len(report.moved_clauses)} clauses moved, "
+            f"{len(report.flagged_clauses)} flagged for review",
+            file=sys.stderr,
+        )
+        for clause_id in report.flagged_clauses:
+            print(f"  review {clause_id}", file=sys.stderr)
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(
+            json.dumps(reports, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Shared reader for the SBLGNT plain-text corpus.
+
+The plain-text books start with a title line followed by one verse per line
+(``Mark 1:1 Ἀρχὴ …``); wrapped verses continue on following lines. Both
+``build_viewer_data.py`` and ``inspect_sblgnt.py`` parse this format through
+:func:`iter_plain_text`, which keeps each verse's fragments in a list that is
+joined once and only runs :data:`VERSE_PATTERN` on lines whose first
+non-blank character could start a reference. :func:`iter_lines` reads large files
+through a memory map instead of materializing the whole file.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import string
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Optional
+
+VERSE_PATTERN = re.compile(
+    r"^(?P<book>[1-3]?\s?[A-Za-z]+)\s+(?P<chapter>\d+):(?P<verse>\d+)\s+(?P<text>\S.*)$"
+)
+
+# VERSE_PATTERN can only match lines whose first non-blank character is a book
+# digit or an ASCII letter; everything else, such as an indented line of Greek,
+# is a continuation line.
+_HEADER_START_CHARACTERS = frozenset("123" + string.ascii_letters)
+
+MMAP_THRESHOLD = 1 << 20
+
+
+def iter_lines(path: Path) -> Iterator[str]:
+    """Yield the lines of a UTF-8 file like ``read_text().splitlines()`` would.
+
+    Files of at least :data:`MMAP_THRESHOLD` bytes are memory-mapped and
+    decoded line by line.
+    """
+
+    with path.open("rb") as handle:
+        size = path.stat().st_size
+        if size < MMAP_THRESHOLD or size == 0:
+            yield from handle.read().decode("utf-8").splitlines()
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for raw_line in iter(mapped.readline, b""):
+                yield from raw_line.decode("utf-8").splitlines()
+
+
+def iter_plain_text(
+    lines: Iterable[str],
+    *,
+    strict: bool = True,
+    on_skip: Optional[Callable[[str], None]] = None,
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(reference, text)`` for each verse in ``lines`` (title excluded).
+
+    In ``strict`` mode a verse starts at any line matching
+    :data:`VERSE_PATTERN`, every other line continues the current verse, and
+    text before the first verse raises ``ValueError``. Otherwise indented
+    lines are continuations, any other line with at least three tokens starts
+    a verse (reference = first two tokens), and shorter lines are reported to
+    ``on_skip`` and discarded along with the verse state.
+    """
+
+    current_ref: Optional[str] = None
+    buffer: list[str] = []
+
+    for raw_line in lines:
+        line = raw_line.rstrip()
+        if not line:
+            continue
+
+        first = line[0]
+        if strict:
+            match = None
+            if line.lstrip()[0] in _HEADER_START_CHARACTERS:
+                match = VERSE_PATTERN.match(line)
+            if match is None:
+                if current_ref is None:
+                    raise ValueError(f"Unexpected line before any verse content: {line}")
+                buffer.append(line.strip())
+                continue
+            if current_ref is not None:
+                yield current_ref, " ".join(buffer)
+            current_ref = f"{match.group('book')} {match.group('chapter')}:{match.group('verse')}"
+            buffer = [match.group("text").strip()]
+            continue
+
+        if first.isspace():
+            buffer.append(line.strip())
+            continue
+
+        if current_ref is not None:
+            yield current_ref, " ".join(buffer)
+            buffer = []
+
+        parts = line.split()
+        if len(parts) < 3:
+            if on_skip is not None:
+                on_skip(line)
+            current_ref = None
+            buffer = []
+            continue
+
+        current_ref = f"{parts[0]} {parts[1]}"
+        buffer.append(" ".join(parts[2:]))
+
+    if current_ref is not None:
+        yield current_ref, " ".join(buffer)
@@ -0,0 +1,129 @@
+"""Streaming reader for the SBLGNT XML corpus.
+
+The XML marks paragraphs with ``<p>``, verse starts with ``<verse-number>``
+and stores each word in ``<w>`` with optional ``<prefix>``/``<suffix>``
+siblings carrying punctuation, sigla and spacing. :func:`iter_xml_records`
+walks a book once with :func:`xml.etree.ElementTree.iterparse`, releasing
+elements as it goes, and yields one :class:`XmlVerse` per verse with the
+merged text plus the structural information that is otherwise lost when
+only the text is kept:
+
+* ``paragraph_index`` – zero-based index of the paragraph the verse starts in
+* ``paragraph_breaks`` – code-point offsets where a new paragraph starts
+  inside the verse
+* ``words`` – ``(start, end)`` code-point offsets of every ``<w>`` token
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Optional, Union
+from xml.etree import ElementTree as ET
+
+TITLE_REFERENCE = "TITLE"
+
+
+@dataclass
+class XmlVerse:
+    """A verse recovered from the XML corpus with its structural offsets."""
+
+    reference: str
+    text: str
+    paragraph_index: Optional[int] = None
+    words: list[tuple[int, int]] = field(default_factory=list)
+    paragraph_breaks: list[int] = field(default_factory=list)
+
+
+def _finish_verse(
+    reference: str,
+    parts: list[str],
+    paragraph_index: int,
+    words: list[tuple[int, int]],
+    breaks: list[int],
+) -> XmlVerse:
+    raw = "".join(parts)
+    lead = len(raw) - len(raw.lstrip())
+    text = raw.strip()
+    limit = len(text)
+
+    def shift(offset: int) -> int:
+        return min(max(offset - lead, 0), limit)
+
+    return XmlVerse(
+        reference=reference,
+        text=text,
+        paragraph_index=paragraph_index,
+        words=[(shift(start), shift(end)) for start, end in words],
+        paragraph_breaks=[offset for offset in map(shift, breaks) if 0 < offset < limit],
+    )
+
+
+def iter_xml_records(source: Union[str, Path, IO[bytes]]) -> Iterator[XmlVerse]:
+    """Yield the book title (as ``TITLE``) and then every verse in ``source``."""
+
+    current_ref: Optional[str] = None
+    parts: list[str] = []
+    length = 0
+    words: list[tuple[int, int]] = []
+    breaks: list[int] = []
+    prefix_buffer = ""
+    current_paragraph = -1
+    paragraph_index = -1
+    root: Optional[ET.Element] = None
+
+    for event, node in ET.iterparse(source, events=("start", "end")):
+        tag = node.tag
+        if event == "start":
+            if root is None:
+                root = node
+            elif tag == "p":
+                paragraph_index += 1
+                if current_ref is not None and length:
+                    breaks.append(length)
+            continue
+
+        if tag == "title":
+            if node.text and node.text.strip():
+                yield XmlVerse(reference=TITLE_REFERENCE, text=node.text.strip())
+        elif tag == "verse-number":
+            if current_ref is not None:
+                yield _finish_verse(current_ref, parts, current_paragraph, words, breaks)
+                parts = []
+                length = 0
+                words = []
+                breaks = []
+            current_ref = node.attrib.get("id", node.text or "")
+            current_paragraph = paragraph_index
+            prefix_buffer = ""
+        elif tag == "prefix":
+            if node.text:
+                prefix_buffer += node.text
+        elif tag == "w":
+            if node.text:
+                if prefix_buffer:
+                    lead = prefix_buffer
+                else:
+                    needs_space = bool(parts) and not parts[-1].endswith(" ")
+                    lead = " " if needs_space else ""
+                word = node.text.rstrip()
+                start = length + len(lead)
+                words.append((start, start + len(word)))
+                token = f"{lead}{node.text}"
+                parts.append(token)
+                length += len(token)
+                prefix_buffer = ""
+        elif tag == "suffix":
+            if node.text:
+                parts.append(node.text)
+                length += len(node.text)
+        elif tag == "p" and root is not None:
+            root.clear()
+            continue
+
+        if node is not root:
+            node.clear()
+
+    if current_ref is not None:
+        yield _finish_verse(current_ref, parts, current_paragraph, words, breaks)
@@ -0,0 +1,150 @@
+"""Build sharded, delta-encoded search indexes for viewer payloads.
+
+Each book gets a directory containing a small ``index.json`` plus one shard
+per normalized term prefix::
+
+    search/<book_id>/index.json
+    search/<book_id>/03ba.json        # terms starting with "κ"
+
+A shard holds a sorted ``terms`` array and a parallel ``postings`` array. Each
+posting list is the ascending sequence of verse indices (positions in the
+payload's ``verses`` array) that contain the term, delta-encoded as unsigned
+LEB128 varints and serialized as base64. A client normalizes the query with
+the same rules as :func:`scripts.greek_text.normalize_form`, fetches the shard
+named by the query prefix and binary-searches ``terms``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from scripts.greek_text import normalized_words
+
+INDEX_VERSION = 1
+NORMALIZATION = "nfd-strip-marks+casefold+final-sigma"
+DEFAULT_PREFIX_LENGTH = 1
+
+
+def encode_postings(indices: Iterable[int]) -> str:
+    """Delta-encode ascending ``indices`` as base64 LEB128 varints."""
+
+    buffer = bytearray()
+    previous = 0
+    for index in indices:
+        delta = index - previous
+        if delta < 0:
+            raise ValueError("Postings must be sorted in ascending order")
+        previous = index
+        while delta >= 0x80:
+            buffer.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        buffer.append(delta)
+    return base64.b64encode(bytes(buffer)).decode("ascii")
+
+
+def decode_postings(encoded: str) -> list[int]:
+    """Inverse of :func:`encode_postings`."""
+
+    indices: list[int] = []
+    current = 0
+    value = 0
+    shift = 0
+    for byte in base64.b64decode(encoded):
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += value
+        indices.append(current)
+        value = 0
+        shift = 0
+    return indices
+
+
+def shard_key(term: str, prefix_length: int) -> str:
+    """Return the shard prefix for ``term``."""
+
+    return term[:prefix_length]
+
+
+def shard_filename(prefix: str) -> str:
+    """Return an ASCII-safe file name for a shard prefix (e.g. ``03ba.json``)."""
+
+    return "-".join(f"{ord(char):04x}" for char in prefix) + ".json"
+
+
+def build_search_index(
+    verses: Iterable[Mapping[str, Any]],
+    *,
+    book_id: str,
+    prefix_length: int = DEFAULT_PREFIX_LENGTH,
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Return the root index and a mapping of shard file names to shard bodies."""
+
+    if prefix_length < 1:
+        raise ValueError("prefix_length must be at least 1")
+
+    postings: dict[str, list[int]] = defaultdict(list)
+    verse_count = 0
+    for verse_index, verse in enumerate(verses):
+        verse_count += 1
+        for term in normalized_words(verse["text"]):
+            term_postings = postings[term]
+            if not term_postings or term_postings[-1] != verse_index:
+                term_postings.append(verse_index)
+
+    shards: dict[str, dict[str, Any]] = {}
+    shard_entries: dict[str, dict[str, Any]] = {}
+    for term in sorted(postings):
+        prefix = shard_key(term, prefix_length)
+        filename = shard_filename(prefix)
+        shard = shards.get(filename)
+        if shard is None:
+            shard = shards[filename] = {"prefix": prefix, "terms": [], "postings": []}
+            shard_entries[prefix] = {"path": filename, "terms": 0}
+        shard["terms"].append(term)
+        shard["postings"].append(encode_postings(postings[term]))
+        shard_entries[prefix]["terms"] += 1
+
+    index = {
+        "version": INDEX_VERSION,
+        "book_id": book_id,
+        "normalization": NORMALIZATION,
+        "prefix_length": prefix_length,
+        "posting_encoding": "delta-leb128-base64",
+        "verse_count": verse_count,
+        "term_count": len(postings),
+        "shards": shard_entries,
+    }
+    return index, shards
+
+
+def write_search_index(
+    directory: Path,
+    verses: Iterable[Mapping[str, Any]],
+    *,
+    book_id: str,
+    prefix_length: int = DEFAULT_PREFIX_LENGTH,
+) -> Path:
+    """Write the root index and shards into ``directory``; return ``index.json``."""
+
+    index, shards = build_search_index(verses, book_id=book_id, prefix_length=prefix_length)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.json"):
+        if stale.name != "index.json" and stale.name not in shards:
+            stale.unlink()
+    for filename, shard in shards.items():
+        (directory / filename).write_text(
+            json.dumps(shard, ensure_ascii=False, separators=(",", ":")) + "\n",
+            encoding="utf-8",
+        )
+
+    index_path = directory / "index.json"
+    index_path.write_text(json.dumps(index, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return index_path
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Serve the static viewer locally with production-like caching behaviour.
+
+``python -m http.server`` re-sends every payload in full on each reload and
+never compresses it, which makes local timings and load tests misleading. This
+server keeps the same zero-dependency footprint but adds:
+
+* strong ``ETag`` validators derived from a content hash, answering
+  ``If-None-Match`` with ``304 Not Modified``
+* negotiation of precompressed ``.gz`` sidecars when the client sends
+  ``Accept-Encoding: gzip``
+* single-range ``Range``/``If-Range`` support with ``206 Partial Content``
+
+Examples
+--------
+Serve ``viewer/`` on http://127.0.0.1:8000/::
+
+    python scripts/serve_viewer.py
+
+Write ``.gz`` sidecars for the JSON/JS/CSS/HTML assets before serving::
+
+    python scripts/serve_viewer.py --precompress
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import shutil
+import sys
+import threading
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import BinaryIO, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+VIEWER_DIR = REPO_ROOT / "viewer"
+
+PRECOMPRESS_SUFFIXES = (".json", ".js", ".css", ".html", ".svg", ".txt")
+COPY_CHUNK_SIZE = 64 * 1024
+
+_etag_cache: dict[str, tuple[int, int, str]] = {}
+_etag_lock = threading.Lock()
+
+
+def compute_etag(path: Path) -> str:
+    """Return a strong ETag for ``path``, memoized on ``(mtime_ns, size)``."""
+
+    stat = path.stat()
+    key = str(path)
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(partial(handle.read, COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:32]}"'
+
+    with _etag_lock:
+        _etag_cache[key] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """Return ``True`` when an ``Accept-Encoding`` header allows gzip."""
+
+    if not header:
+        return False
+
+    wildcard: Optional[bool] = None
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return bool(wildcard)
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single ``bytes=`` range into an inclusive ``(start, end)`` pair.
+
+    Returns ``None`` when the header should be ignored (unsupported unit or
+    multiple ranges) and raises ``ValueError`` when the range is syntactically
+    valid but cannot be satisfied for a representation of ``size`` bytes.
+    """
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not all(part == "" or part.isdigit() for part in (first, last)):
+        return None
+
+    if first == "":
+        if last == "":
+            return None
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - suffix_length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+
+    if header.strip() == "*":
+        return True
+    candidates = (item.strip() for item in header.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def precompress(directory: Path, suffixes: Sequence[str] = PRECOMPRESS_SUFFIXES) -> list[Path]:
+    """Write deterministic ``.gz`` sidecars for stale or missing assets.
+
+    Returns the sidecar paths that were (re)written.
+    """
+
+    written: list[Path] = []
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix not in suffixes:
+            continue
+        sidecar = path.with_name(path.name + ".gz")
+        if sidecar.exists() and sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            continue
+        sidecar.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+        written.append(sidecar)
+    return written
+
+
+class CachingRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with ETag, gzip sidecar and Range support."""
+
+    cache_control = "no-cache"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        body = self._send_cached_head()
+        if body is None:
+            return
+        handle, remaining = body
+        try:
+            while remaining > 0:
+                chunk = handle.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+        finally:
+            handle.close()
+
+    def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+        body = self._send_cached_head()
+        if body is not None:
+            body[0].close()
+
+    def _send_cached_head(self) -> Optional[tuple[BinaryIO, int]]:
+        """Send status and headers; return the open file and byte count to copy."""
+
+        path = Path(self.translate_path(self.path))
+        if path.is_dir():
+            index = path / "index.html"
+            if not self.path.split("?", 1)[0].endswith("/") or not index.is_file():
+                # Let the stock handler issue the redirect or directory listing.
+                handle = super().send_head()
+                if handle is not None:
+                    if self.command == "GET":
+                        shutil.copyfileobj(handle, self.wfile)
+                    handle.close()
+                return None
+            path = index
+
+        if not path.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        content_type = self.guess_type(str(path))
+        selected = path
+        encoding: Optional[str] = None
+        sidecar = path.with_name(path.name + ".gz")
+        has_sidecar = path.suffix != ".gz" and sidecar.is_file()
+        if (
+            has_sidecar
+            and sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns
+            and accepts_gzip(self.headers.get("Accept-Encoding"))
+        ):
+            selected = sidecar
+            encoding = "gzip"
+
+        etag = compute_etag(selected)
+        stat = selected.stat()
+        size = stat.st_size
+
+        def send_validators() -> None:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", self.date_time_string(int(stat.st_mtime)))
+            self.send_header("Cache-Control", self.cache_control)
+            if has_sidecar:
+                self.send_header("Vary", "Accept-Encoding")
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            send_validators()
+            self.end_headers()
+            return None
+
+        byte_range: Optional[tuple[int, int]] = None
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range.strip() == etag):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                send_validators()
+                self.end_headers()
+                return None
+
+        handle = selected.open("rb")
+        if byte_range is None:
+            start, length = 0, size
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            handle.seek(start)
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        send_validators()
+        self.end_headers()
+        return handle, length
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+def create_server(
+    directory: Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_control: str = CachingRequestHandler.cache_control,
+    quiet: bool = False,
+) -> ThreadingHTTPServer:
+    """Return a threading HTTP server bound to ``host:port`` serving ``directory``."""
+
+    handler = type(
+        "ConfiguredCachingRequestHandler",
+        (CachingRequestHandler,),
+        {"cache_control": cache_control},
+    )
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=str(directory)))
+    server.quiet = quiet  # type: ignore[attr-defined]
+    return server
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=VIEWER_DIR,
+        help="Directory to serve (defaults to the repository viewer/)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind (0 picks a free port)")
+    parser.add_argument(
+        "--cache-control",
+        default=CachingRequestHandler.cache_control,
+        help="Cache-Control header sent with every response (e.g. 'max-age=600')",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Write .gz sidecars for stale or missing text assets before serving",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-request logging")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if not args.directory.is_dir():
+        raise SystemExit(f"Directory '{args.directory}' does not exist")
+
+    if args.precompress:
+        written = precompress(args.directory)
+        print(f"Wrote {len(written)} gzip sidecar(s)", file=sys.stderr)
+
+    server = create_server(
+        args.directory,
+        host=args.host,
+        port=args.port,
+        cache_control=args.cache_control,
+        quiet=args.quiet,
+    )
+    host, port = server.server_address[:2]
+    print(f"Serving {args.directory} at http://{host}:{port}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
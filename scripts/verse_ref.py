@@ -0,0 +1,167 @@
+"""Packed integer verse ids shared by the corpus scripts.
+
+References travel through payloads and CLIs as text (``"Mark 1:1"``), but
+everything that compares, sorts, indexes or range-checks them works on a
+single integer instead::
+
+    verse_id = book_number << 16 | chapter << 8 | verse
+
+``book_number`` is the 1-based position of the book in :data:`BOOKS`
+(canonical New Testament order), so numeric order is canonical reading
+order across the whole corpus. ``verse_id >> 8`` identifies a chapter and
+``verse_id >> 16`` a book.
+
+:func:`parse_reference` accepts the spellings found in the corpora and on
+the command line: the plain-text form with SBL book codes
+(``"Matt 1:1"``), the ``<verse-number id>`` form with full book names
+(``"Matthew 1:1"``, ``"1 Corinthians 1:1"``), dotted OSIS-style ids
+(``"Matt.1.1"``), common abbreviations (``"Mt 1:1"``), case-insensitively,
+and a bare ``"1:1"`` when the book is passed separately (the
+``<verse-number>`` element text). Parsing and formatting are memoized, since
+the same few thousand references are resolved over and over.
+
+Payloads may still carry references no spelling covers (a title row, an
+unknown book). Code that walks whole payloads uses
+:func:`try_parse_reference` and decides explicitly what such a row becomes.
+Verse ids are never 0, so 0 is free to mean "no id".
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Optional
+
+BOOKS = (
+    "Matt", "Mark", "Luke", "John", "Acts", "Rom", "1Cor", "2Cor", "Gal",
+    "Eph", "Phil", "Col", "1Thess", "2Thess", "1Tim", "2Tim", "Titus", "Phlm",
+    "Heb", "Jas", "1Pet", "2Pet", "1John", "2John", "3John", "Jude", "Rev",
+)
+
+# Full names as spelled in the SBLGNT ``<verse-number id>`` attributes, in
+# :data:`BOOKS` order.
+BOOK_NAMES = (
+    "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians",
+    "2 Corinthians", "Galatians", "Ephesians", "Philippians", "Colossians",
+    "1 Thessalonians", "2 Thessalonians", "1 Timothy", "2 Timothy", "Titus",
+    "Philemon", "Hebrews", "James", "1 Peter", "2 Peter", "1 John", "2 John",
+    "3 John", "Jude", "Revelation",
+)
+
+# Other common abbreviations (SBL handbook and short forms).
+_ALIASES = {
+    "Mt": "Matt", "Mk": "Mark", "Lk": "Luke", "Jn": "John", "Ro": "Rom",
+    "1Co": "1Cor", "2Co": "2Cor", "Ep": "Eph", "Php": "Phil", "Phm": "Phlm",
+    "Philem": "Phlm", "Jam": "Jas", "1Pe": "1Pet", "2Pe": "2Pet", "1Jn": "1John",
+    "2Jn": "2John", "3Jn": "3John", "Re": "Rev", "Apoc": "Rev",
+    "1Thes": "1Thess", "2Thes": "2Thess", "Tit": "Titus",
+}
+
+
+def _book_key(book: str) -> str:
+    return book.replace(" ", "").casefold()
+
+
+_BOOK_NUMBERS = {
+    _book_key(name): number
+    for number, names in enumerate(zip(BOOKS, BOOK_NAMES), start=1)
+    for name in names
+}
+_BOOK_NUMBERS.update(
+    {_book_key(alias): _BOOK_NUMBERS[_book_key(code)] for alias, code in _ALIASES.items()}
+)
+
+_REFERENCE = re.compile(
+    r"^\s*(?:(?P<book>[1-3]?\s?[A-Za-z]+)[\s.]+)?(?P<chapter>\d+)[:.](?P<verse>\d+)\s*$"
+)
+
+_FIELD_LIMIT = 1 << 8
+
+
+def book_number(book: str) -> int:
+    """Return the 1-based canonical number of ``book`` (code, full name or alias)."""
+
+    try:
+        return _BOOK_NUMBERS[_book_key(book)]
+    except KeyError:
+        raise ValueError(f"Unknown book '{book}'") from None
+
+
+def pack(book: int, chapter: int, verse: int) -> int:
+    """Return the verse id for book number ``book``, ``chapter`` and ``verse``."""
+
+    if not 1 <= book <= len(BOOKS) or not (
+        0 <= chapter < _FIELD_LIMIT and 0 <= verse < _FIELD_LIMIT
+    ):
+        raise ValueError(f"Reference out of range: book {book}, {chapter}:{verse}")
+    return book << 16 | chapter << 8 | verse
+
+
+@lru_cache(maxsize=65536)
+def parse_reference(reference: str, book: Optional[str] = None) -> int:
+    """Return the verse id of ``reference``; raise ``ValueError`` if malformed.
+
+    ``book`` supplies the book for a bare ``"chapter:verse"`` reference and is
+    ignored when ``reference`` names its own book.
+    """
+
+    match = _REFERENCE.match(reference)
+    if match is None:
+        raise ValueError(f"Malformed reference '{reference}'")
+    name = match.group("book") or book
+    if not name:
+        raise ValueError(f"Reference '{reference}' does not name a book")
+    return pack(book_number(name), int(match.group("chapter")), int(match.group("verse")))
+
+
+def try_parse_reference(reference: str, book: Optional[str] = None) -> Optional[int]:
+    """Return the verse id of ``reference``, or ``None`` if it does not parse."""
+
+    try:
+        return parse_reference(reference, book)
+    except ValueError:
+        return None
+
+
+def unpack(verse_id: int) -> tuple[str, int, int]:
+    """Return ``(book_code, chapter, verse)`` for ``verse_id``."""
+
+    return BOOKS[(verse_id >> 16) - 1], verse_id >> 8 & 0xFF, verse_id & 0xFF
+
+
+@lru_cache(maxsize=65536)
+def format_reference(verse_id: int) -> str:
+    """Return the ``"Book C:V"`` spelling of ``verse_id``."""
+
+    book, chapter, verse = unpack(verse_id)
+    return f"{book} {chapter}:{verse}"
+
+
+def book_of(verse_id: int) -> str:
+    return BOOKS[(verse_id >> 16) - 1]
+
+
+def chapter_of(verse_id: int) -> int:
+    return verse_id >> 8 & 0xFF
+
+
+def verse_of(verse_id: int) -> int:
+    return verse_id & 0xFF
+
+
+def chapter_bounds(verse_id: int) -> tuple[int, int]:
+    """Return the inclusive ``(first, last)`` ids of the chapter containing ``verse_id``."""
+
+    first = verse_id >> 8 << 8
+    return first, first | 0xFF
+
+
+def reference_array(references: Iterable[str]) -> array:
+    """Return the verse ids of ``references`` as a compact unsigned ``array``.
+
+    References that do not parse are stored as 0.
+    """
+
+    return array("I", (try_parse_reference(reference) or 0 for reference in references))
@@ -0,0 +1,68 @@
+"""Reading the viewer manifest and locating files relative to it.
+
+``viewer/data/manifest.json`` lists every book the viewer can load. Each
+entry names its payload (``data_path``) and optionally its clause overlay
+(``clause_data_path``) relative to the manifest's directory, plus the site
+URL path the browser fetches them from. The build and export scripts share
+these helpers so that they resolve the same files in the same way.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_MANIFEST = REPO_ROOT / "viewer" / "data" / "manifest.json"
+
+
+@dataclass(frozen=True)
+class BookFiles:
+    """A manifest book and the files it is loaded from."""
+
+    book_id: str
+    payload_path: Path
+    clause_path: Optional[Path]
+
+
+def manifest_books(manifest_path: Path) -> list[BookFiles]:
+    """Return the payload and clause files listed in the manifest.
+
+    A book without ``clause_data_path`` falls back to ``<payload>.clauses.json``
+    next to its payload; ``clause_path`` is ``None`` when no such file exists.
+    """
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    base = manifest_path.parent
+    books = []
+    for entry in manifest.get("books", []):
+        if not isinstance(entry, dict) or not entry.get("data_path"):
+            continue
+        payload_path = base / entry["data_path"]
+        if entry.get("clause_data_path"):
+            clause_path: Optional[Path] = base / entry["clause_data_path"]
+        else:
+            clause_path = payload_path.with_name(f"{payload_path.stem}.clauses.json")
+        if clause_path is not None and not clause_path.exists():
+            clause_path = None
+        books.append(BookFiles(entry["book_id"], payload_path, clause_path))
+    return books
+
+
+def manifest_locations(manifest_path: Path, target_path: Path) -> tuple[str, str]:
+    """Return the manifest-relative path and site URL path for ``target_path``."""
+
+    try:
+        relative_path = target_path.relative_to(manifest_path.parent)
+        relative_path_str = relative_path.as_posix()
+    except ValueError:
+        relative_path_str = target_path.name
+
+    manifest_dir_name = manifest_path.parent.name
+    if manifest_dir_name:
+        data_url_path = Path(manifest_dir_name) / Path(relative_path_str)
+    else:
+        data_url_path = Path(relative_path_str)
+    return relative_path_str, data_url_path.as_posix()
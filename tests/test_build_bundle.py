@@ -0,0 +1,76 @@
+"""Tests for the single-file corpus bundle."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import build_bundle
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    target = tmp_path / "data"
+    target.mkdir()
+    for name in ("manifest.json", "mark.json", "matthew.json"):
+        shutil.copy(DATA_DIR / name, target / name)
+    return target
+
+
+def test_members_decode_independently_from_raw_byte_ranges(data_dir: Path):
+    mark = json.loads((data_dir / "mark.json").read_text(encoding="utf-8"))
+    matthew = json.loads((data_dir / "matthew.json").read_text(encoding="utf-8"))
+    data = build_bundle.build_bundle([mark, matthew])
+
+    index_length = build_bundle.PREAMBLE.unpack_from(data)[1]
+    index = build_bundle.parse_index(data[: build_bundle.PREAMBLE.size + index_length])
+    assert [entry["book_id"] for entry in index["books"]] == ["mark", "matthew"]
+
+    entry = index["books"][0]
+    book = build_bundle.read_payload(data[entry["offset"] : entry["offset"] + entry["length"]])
+    assert book["verses"] == mark["verses"]
+    assert book["header"] == mark["header"]
+
+    chapter = entry["chapters"]["2"]
+    verses = json.loads(data[chapter["offset"] : chapter["offset"] + chapter["length"]])
+    assert verses == [verse for verse in mark["verses"] if verse["reference"].startswith("Mark 2:")]
+    assert chapter["verses"] == len(verses)
+    assert index["books"][1]["offset"] == entry["offset"] + entry["length"]
+
+
+def test_reader_and_manifest_entry(data_dir: Path):
+    manifest_path = data_dir / "manifest.json"
+    bundle_path = data_dir / "corpus.bundle"
+
+    assert build_bundle.main(["--manifest", str(manifest_path)]) == 0
+    assert build_bundle.write_bundle(manifest_path, bundle_path) is False
+
+    entry = json.loads(manifest_path.read_text(encoding="utf-8"))["bundle"]
+    assert entry["path"] == "corpus.bundle"
+    assert entry["url"] == "data/corpus.bundle"
+
+    with build_bundle.Bundle(bundle_path) as bundle:
+        assert bundle.book_ids == ["mark", "matthew"]
+        assert build_bundle.PREAMBLE.size + entry["index_length"] == bundle.index["books"][0]["offset"]
+        matthew = json.loads((data_dir / "matthew.json").read_text(encoding="utf-8"))
+        assert bundle.payload("matthew")["verses"] == matthew["verses"]
+        assert bundle.chapter("mark", "16")[-1]["reference"] == "Mark 16:20"
+        with pytest.raises(KeyError, match="Chapter 99"):
+            bundle.member("mark", "99")
+
+
+def test_parse_index_rejects_other_files():
+    with pytest.raises(build_bundle.BundleError, match="Not a corpus bundle"):
+        build_bundle.parse_index(b"{" * 32)
+    with pytest.raises(build_bundle.BundleError, match="truncated"):
+        build_bundle.parse_index(build_bundle.PREAMBLE.pack(build_bundle.MAGIC, 100))
@@ -13,7 +13,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from scripts.build_viewer_data import build_payload, parse_verses, update_manifest
+from scripts.build_viewer_data import (
+    build_payload,
+    build_xml_payload,
+    parse_verses,
+    update_manifest,
+)
+from scripts.payload_delta import apply_delta
 
 
 @pytest.fixture
@@ -86,6 +92,46 @@ def test_build_payload_reads_file(tmp_path: Path, sample_lines: list[str]) -> No
     assert len(verses) == 2
 
 
+SAMPLE_XML = """<book id="Mark">
+  <title>ΚΑΤΑ ΜΑΡΚΟΝ</title>
+  <p>
+    <verse-number id="Mark 1:1">1:1</verse-number>
+    <w>Ἀρχὴ</w><suffix> </suffix><w>τοῦ</w><suffix> </suffix><w>εὐαγγελίου</w><suffix>.</suffix>
+  </p>
+  <p>
+    <verse-number id="Mark 1:2">1:2</verse-number>
+    <prefix>⸀</prefix><w>Καθὼς</w><suffix> </suffix><w>γέγραπται</w>
+  </p>
+</book>
+"""
+
+
+def test_build_xml_payload_adds_structure(tmp_path: Path) -> None:
+    input_file = tmp_path / "Mark.xml"
+    input_file.write_text(SAMPLE_XML, encoding="utf-8")
+
+    header, verses = build_xml_payload(input_file)
+
+    assert header == "ΚΑΤΑ ΜΑΡΚΟΝ"
+    assert verses[0] == {
+        "reference": "Mark 1:1",
+        "text": "Ἀρχὴ τοῦ εὐαγγελίου.",
+        "paragraph_index": 0,
+        "words": [[0, 4], [5, 8], [9, 19]],
+    }
+    assert verses[1]["paragraph_index"] == 1
+    assert verses[1]["text"] == "⸀Καθὼς γέγραπται"
+    assert verses[1]["words"][0] == [1, 6]
+
+
+def test_build_xml_payload_requires_verses(tmp_path: Path) -> None:
+    input_file = tmp_path / "Empty.xml"
+    input_file.write_text("<book><title>Only</title></book>", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="No verses were parsed"):
+        build_xml_payload(input_file)
+
+
 def _run_cli(args: list[str]) -> subprocess.CompletedProcess:
     script_path = PROJECT_ROOT / "scripts" / "build_viewer_data.py"
     command = [sys.executable, str(script_path), *args]
@@ -149,6 +195,38 @@ def test_main_generates_manifest(tmp_path: Path, sample_lines: list[str]) -> Non
     assert entry["data_url"] == "data/mark.json"
 
 
+def test_main_supports_xml_source(tmp_path: Path) -> None:
+    input_file = tmp_path / "Mark.xml"
+    input_file.write_text(SAMPLE_XML, encoding="utf-8")
+    output_file = tmp_path / "data" / "mark.json"
+
+    _run_cli([str(input_file), str(output_file), "--source", "xml"])
+
+    payload = json.loads(output_file.read_text(encoding="utf-8"))
+    assert payload["source_format"] == "xml"
+    assert payload["header"] == "ΚΑΤΑ ΜΑΡΚΟΝ"
+    assert payload["verses"][1]["paragraph_index"] == 1
+    assert payload["verses"][0]["words"][2] == [9, 19]
+
+
+def test_main_writes_search_index(tmp_path: Path, sample_lines: list[str]) -> None:
+    input_file = tmp_path / "Mark.txt"
+    input_file.write_text("\n".join(sample_lines), encoding="utf-8")
+    output_file = tmp_path / "viewer" / "data" / "mark.json"
+
+    _run_cli([str(input_file), str(output_file), "--search-index"])
+
+    index_file = output_file.parent / "search" / "mark" / "index.json"
+    index = json.loads(index_file.read_text(encoding="utf-8"))
+    assert index["book_id"] == "mark"
+    assert index["verse_count"] == 2
+
+    manifest = json.loads((output_file.parent / "manifest.json").read_text(encoding="utf-8"))
+    entry = manifest["books"][0]
+    assert entry["search_index_path"] == "search/mark/index.json"
+    assert entry["search_index_url"] == "data/search/mark/index.json"
+
+
 def test_manifest_updates_existing_entry(tmp_path: Path, sample_lines: list[str]) -> None:
     manifest_dir = tmp_path / "viewer" / "data"
     manifest_dir.mkdir(parents=True)
@@ -255,3 +333,37 @@ def test_update_manifest_handles_non_list_books_and_external_payload(tmp_path: P
     assert entry["book_id"] == "mark"
     assert entry["data_path"] == "mark.json"
     assert entry["data_url"] == "data/mark.json"
+
+
+def test_main_writes_hashes_and_delta_between_builds(
+    tmp_path: Path, sample_lines: list[str]
+) -> None:
+    input_file = tmp_path / "Mark.txt"
+    input_file.write_text("\n".join(sample_lines), encoding="utf-8")
+    output_file = tmp_path / "viewer" / "data" / "mark.json"
+    delta_file = output_file.with_name("mark.delta.json")
+    manifest_file = output_file.parent / "manifest.json"
+
+    _run_cli([str(input_file), str(output_file)])
+    first = json.loads(output_file.read_text(encoding="utf-8"))
+    assert first["chapter_hashes"].keys() == {"1"}
+    assert all(verse["hash"] for verse in first["verses"])
+    assert not delta_file.exists()
+
+    _run_cli([str(input_file), str(output_file)])
+    assert not delta_file.exists()
+
+    input_file.write_text("\n".join(sample_lines).replace("Καθὼς", "Καθως"), encoding="utf-8")
+    _run_cli([str(input_file), str(output_file)])
+
+    second = json.loads(output_file.read_text(encoding="utf-8"))
+    delta = json.loads(delta_file.read_text(encoding="utf-8"))
+    assert second["content_hash"] != first["content_hash"]
+    assert delta["from"] == first["content_hash"]
+    assert apply_delta(first, delta) == second
+
+    entry = json.loads(manifest_file.read_text(encoding="utf-8"))["books"][0]
+    assert entry["content_hash"] == second["content_hash"]
+    assert entry["previous_content_hash"] == first["content_hash"]
+    assert entry["delta_path"] == "mark.delta.json"
+    assert entry["delta_url"] == "data/mark.delta.json"
@@ -0,0 +1,142 @@
+"""Tests for the text-vs-XML consistency checker."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import check_source_consistency as check
+from scripts import inspect_sblgnt as inspect
+
+
+def _xml(verses: list[tuple[str, list[str]]]) -> str:
+    body = []
+    for reference, words in verses:
+        body.append(f'<verse-number id="{reference}">{reference}</verse-number>')
+        body.extend(f"<w>{word}</w><suffix> </suffix>" for word in words)
+    return "<book><p>" + "".join(body) + "</p></book>"
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    text_dir = tmp_path / "text"
+    xml_dir = tmp_path / "xml"
+    text_dir.mkdir()
+    xml_dir.mkdir()
+
+    (text_dir / "Mark.txt").write_text(
+        "KATA MARKON\nMark 1:1 Ἀρχὴ τοῦ\n  εὐαγγελίου\nMark 1:2 Καθὼς γέγραπται\n",
+        encoding="utf-8",
+    )
+    (xml_dir / "Mark.xml").write_text(
+        _xml([("Mark 1:1", ["Ἀρχὴ", "τοῦ", "εὐαγγελίου"]), ("Mark 1:2", ["Καθὼς", "γέγραπται"])]),
+        encoding="utf-8",
+    )
+
+    (text_dir / "Jude.txt").write_text(
+        "ΙΟΥΔΑ\nJude 1:1 Ἰούδας δοῦλος\nJude 1:2 ἔλεος ὑμῖν\n", encoding="utf-8"
+    )
+    (xml_dir / "Jude.xml").write_text(
+        _xml([("Jude 1:1", ["Ἰούδας", "δούλος"]), ("Jude 1:3", ["Ἀγαπητοί"])]),
+        encoding="utf-8",
+    )
+    (text_dir / "Phlm.txt").write_text("ΠΡΟΣ ΦΙΛΗΜΟΝΑ\nPhlm 1:1 Παῦλος\n", encoding="utf-8")
+
+    monkeypatch.setattr(inspect, "TEXT_DIR", text_dir)
+    monkeypatch.setattr(inspect, "XML_DIR", xml_dir)
+    return text_dir, xml_dir
+
+
+def test_normalize_for_comparison_modes():
+    assert check.normalize_for_comparison("  Ἀρχὴ \n τοῦ ") == "Ἀρχὴ τοῦ"
+    assert check.normalize_for_comparison("⸀Ἀρχὴ τοῦ·", fold=True) == "αρχη του"
+
+
+def test_character_diffs_reports_ranges():
+    diffs = check.character_diffs("δοῦλος", "δούλος")
+
+    assert diffs == [
+        {"op": "replace", "text_range": [2, 3], "xml_range": [2, 3], "text": "ῦ", "xml": "ύ"}
+    ]
+
+
+def test_compare_book_consistent(corpus):
+    result = check.compare_book("Mark")
+
+    assert result["consistent"] is True
+    assert result["text_verses"] == result["xml_verses"] == 2
+
+
+def test_compare_book_reports_differences(corpus):
+    result = check.compare_book("Jude")
+
+    assert result["missing_in_xml"] == ["Jude 1:2"]
+    assert result["missing_in_text"] == ["Jude 1:3"]
+    assert [entry["reference"] for entry in result["mismatches"]] == ["Jude 1:1"]
+    assert check.compare_book("Jude", fold=True)["mismatches"] == []
+
+
+def test_compare_book_aligns_full_name_references(corpus):
+    text_dir, xml_dir = corpus
+    (text_dir / "Matt.txt").write_text(
+        "ΚΑΤΑ ΜΑΘΘΑΙΟΝ\nMatt 1:1 Βίβλος γενέσεως\nMatt 1:2 Ἀβραὰμ ἐγέννησεν\n",
+        encoding="utf-8",
+    )
+    (xml_dir / "Matt.xml").write_text(
+        _xml(
+            [
+                ("Matthew 1:1", ["Βίβλος", "γενέσεως"]),
+                ("Matthew 1:2", ["Ἀβραὰμ", "ἐγεννησεν"]),
+                ("Matthew 1:3", ["Ἰούδας"]),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    result = check.compare_book("Matt")
+
+    assert result["missing_in_xml"] == []
+    assert result["missing_in_text"] == ["Matt 1:3"]
+    assert [entry["reference"] for entry in result["mismatches"]] == ["Matt 1:2"]
+
+
+def test_check_corpus_parallel_matches_serial(corpus):
+    text_dir, xml_dir = corpus
+
+    serial = check.check_corpus(["Jude", "Mark"], text_dir=text_dir, xml_dir=xml_dir, jobs=1)
+    parallel = check.check_corpus(["Jude", "Mark"], text_dir=text_dir, xml_dir=xml_dir, jobs=2)
+
+    assert serial == parallel
+    assert serial["summary"]["inconsistent_books"] == 1
+    assert serial["consistent"] is False
+
+
+def test_main_writes_report_and_fails_on_differences(corpus, tmp_path):
+    output = tmp_path / "report" / "consistency.json"
+
+    exit_code = check.main(["--jobs", "1", "--output", str(output)])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert exit_code == 1
+    assert [entry["book"] for entry in report["books"]] == ["Jude", "Mark"]
+    assert report["missing_books"] == {"text": [], "xml": ["Phlm"]}
+
+
+def test_main_passes_for_consistent_selection(corpus, capsys):
+    exit_code = check.main(["--books", "Mark", "--jobs", "1"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert exit_code == 0
+    assert report["consistent"] is True
+
+
+def test_main_rejects_unknown_books(corpus):
+    with pytest.raises(SystemExit, match="Unknown book"):
+        check.main(["--books", "Nope"])
@@ -0,0 +1,71 @@
+"""Tests for the shared clause payload helpers."""
+
+from __future__ import annotations
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import clause_data
+
+CLAUSE_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.clauses.json"
+MARK_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.json"
+
+
+@pytest.fixture(scope="module")
+def sample() -> tuple[dict, list[dict]]:
+    return clause_data.load_json(CLAUSE_PATH), clause_data.load_json(MARK_PATH)["verses"]
+
+
+def test_identifier_helpers():
+    assert clause_data.split_reference("1Cor 12:3") == ("1Cor", 12, 3)
+    assert clause_data.split_reference("1 Corinthians 12:3") == ("1 Corinthians", 12, 3)
+    assert clause_data.split_reference("Enoch 1:1") == ("Enoch", 1, 1)
+    assert clause_data.make_clause_id("mark", 1, 2, 2) == "mark-01-02-c"
+    assert clause_data.order_category_tags(["speech", "main", "narrative", "speech"]) == [
+        "main",
+        "narrative",
+        "speech",
+    ]
+    with pytest.raises(ValueError, match="Malformed reference"):
+        clause_data.split_reference("Mark")
+
+
+def test_load_category_vocabulary_reads_inventory():
+    vocabulary = clause_data.load_category_vocabulary()
+
+    assert vocabulary[0] == "main"
+    assert {"narrative", "speech", "quotation"} <= set(vocabulary)
+
+
+def test_validate_accepts_sample(sample):
+    payload, verses = sample
+
+    assert clause_data.validate_clause_payload(payload, verses) == []
+
+
+def test_validate_reports_problems(sample):
+    payload, verses = sample
+    broken = copy.deepcopy(payload)
+    broken["clauses"][0]["end"]["offset"] = 10_000
+    broken["clauses"][1]["category_tags"] = ["narrative"]
+    broken["clauses"][2], broken["clauses"][3] = broken["clauses"][3], broken["clauses"][2]
+    broken["verses"][0]["character_count"] += 1
+    broken["categories"] = ["main"]
+
+    problems = clause_data.validate_clause_payload(broken, verses, allowed_tags=["main", "narrative"])
+
+    joined = "\n".join(problems)
+    assert "mark-01-01-a: end offset out of bounds" in joined
+    assert "mark-01-02-a: category_tags must start with 'main'" in joined
+    assert "not in (verse_index, offset, clause_id) order" in joined
+    assert "Mark 1:1: character_count differs" in joined
+    assert "unknown category tags" in joined
+    assert "categories does not list" in joined
+    assert clause_data.validate_clause_payload({})[0] == "missing top-level field 'book_id'"
@@ -0,0 +1,186 @@
+"""Tests for the structural clause dataset diff."""
+
+from __future__ import annotations
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import clause_diff
+
+CLAUSE_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.clauses.json"
+
+
+@pytest.fixture
+def payloads():
+    old = json.loads(CLAUSE_PATH.read_text(encoding="utf-8"))
+    new = copy.deepcopy(old)
+    clauses = new["clauses"]
+    clauses[1]["end"]["offset"] -= 10
+    clauses[1]["category_tags"] = ["main"]
+    clauses[3]["analysis"] = {"note": "revised"}
+    clauses[4]["source"]["reviewed_by"] = ["analyst.other"]
+    removed = clauses.pop(5)
+    added = copy.deepcopy(clauses[0])
+    added["clause_id"] = "mark-01-01-b"
+    added["start"]["offset"] = 12
+    clauses.insert(1, added)
+    return old, new, removed
+
+
+def _span(clause_id: str, start: int, end: int, reference: str = "Mark 1:1") -> dict:
+    return {
+        "clause_id": clause_id,
+        "start": {"reference": reference, "offset": start},
+        "end": {"reference": reference, "offset": end},
+    }
+
+
+def test_join_clauses_pairs_by_id():
+    old = [_span("b", 5, 9), _span("a", 0, 5), _span("d", 0, 4, "Mark 1:2")]
+    new = [_span("c", 9, 12), _span("a", 0, 6), _span("d", 0, 4, "Mark 1:2")]
+
+    pairs = [
+        (left and left["clause_id"], right and right["clause_id"])
+        for left, right in clause_diff.join_clauses(old, new)
+    ]
+
+    assert pairs == [("a", "a"), ("b", None), (None, "c"), ("d", "d")]
+
+
+def test_join_clauses_pairs_renumbered_clauses_by_boundaries():
+    old = [
+        _span("v-a", 0, 10),
+        _span("v-b", 10, 20),
+        _span("v-c", 20, 30),
+        _span("w-a", 0, 8, "Mark 1:2"),
+    ]
+    # Splitting v-a renumbers the rest of the verse; w-b has v-c's offsets in another verse.
+    new = [
+        _span("v-a", 0, 5),
+        _span("v-b", 5, 10),
+        _span("v-c", 10, 20),
+        _span("v-d", 20, 30),
+        _span("w-a", 0, 8, "Mark 1:2"),
+        _span("w-b", 20, 30, "Mark 1:2"),
+    ]
+
+    pairs = [
+        (left and left["clause_id"], right and right["clause_id"])
+        for left, right in clause_diff.join_clauses(old, new)
+    ]
+
+    assert pairs == [
+        ("v-a", "v-a"),
+        (None, "v-b"),
+        ("v-b", "v-c"),
+        ("v-c", "v-d"),
+        ("w-a", "w-a"),
+        (None, "w-b"),
+    ]
+
+
+def test_join_clauses_rejects_duplicate_ids():
+    with pytest.raises(clause_diff.ClauseDiffError, match="duplicate clause_id 'a'"):
+        list(clause_diff.join_clauses([{"clause_id": "a"}, {"clause_id": "a"}], []))
+
+
+def test_diff_classifies_every_change(payloads):
+    old, new, removed = payloads
+
+    report = clause_diff.diff_clauses(old, new)
+
+    changes = {record["clause_id"]: record["changes"] for record in report["clauses"]}
+    assert changes == {
+        "mark-01-01-b": ["added"],
+        old["clauses"][1]["clause_id"]: ["boundary-shifted", "retagged"],
+        old["clauses"][3]["clause_id"]: ["analysis-changed"],
+        old["clauses"][4]["clause_id"]: ["provenance-changed"],
+        removed["clause_id"]: ["removed"],
+    }
+    total = report["summary"]["total"]
+    assert total["unchanged"] == len(old["clauses"]) - 4
+    assert total["boundary-shifted"] == total["retagged"] == 1
+    assert report["summary"]["chapters"]["1"]["added"] == 1
+    # The retagged clause counts under the tag it lost.
+    assert report["summary"]["categories"]["quotation"]["retagged"] == 1
+
+    shifted = next(r for r in report["clauses"] if "boundary-shifted" in r["changes"])
+    assert shifted["fields"]["end"]["new"]["offset"] == old["clauses"][1]["end"]["offset"] - 10
+    assert shifted["fields"]["category_tags"] == {
+        "old": old["clauses"][1]["category_tags"],
+        "new": ["main"],
+    }
+
+
+def test_tag_order_alone_is_not_a_change(payloads):
+    old, _, _ = payloads
+    new = copy.deepcopy(old)
+    new["clauses"][0]["category_tags"].reverse()
+
+    report = clause_diff.diff_clauses(old, new)
+
+    assert report["clauses"] == []
+    assert report["summary"]["total"]["unchanged"] == len(old["clauses"])
+
+
+def test_main_prints_summary_and_writes_json(payloads, tmp_path, capsys):
+    old, new, removed = payloads
+    old_path = tmp_path / "old.clauses.json"
+    new_path = tmp_path / "new.clauses.json"
+    old_path.write_text(json.dumps(old, ensure_ascii=False), encoding="utf-8")
+    new_path.write_text(json.dumps(new, ensure_ascii=False), encoding="utf-8")
+    report_path = tmp_path / "out" / "diff.json"
+
+    exit_code = clause_diff.main(
+        [str(old_path), str(new_path), "--json", str(report_path), "--exit-code"]
+    )
+
+    out = capsys.readouterr().out
+    assert exit_code == 1
+    assert out.startswith("mark: 5 clauses changed")
+    assert f"- {removed['clause_id']}" in out
+    assert "+ mark-01-01-b  Mark 1:1@12–Mark 1:1@35  [main, narrative]" in out
+    assert "retagged ([main, quotation] → [main])" in out
+    assert json.loads(report_path.read_text(encoding="utf-8"))["summary"]["total"]["added"] == 1
+
+    assert clause_diff.main([str(old_path), str(old_path), "--exit-code"]) == 0
+
+
+def _split(clause: dict, *offsets: int) -> list[dict]:
+    """Return copies of ``clause`` cut at ``offsets`` with consecutive suffixes."""
+
+    bounds = [clause["start"]["offset"], *offsets, clause["end"]["offset"]]
+    parts = []
+    for position, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        part = copy.deepcopy(clause)
+        part["clause_id"] = clause["clause_id"][:-1] + "abc"[position]
+        part["start"]["offset"], part["end"]["offset"] = start, end
+        parts.append(part)
+    return parts
+
+
+def test_split_clause_reports_one_addition(payloads):
+    old, _, _ = payloads
+    new = copy.deepcopy(old)
+    verse = old["clauses"][1]
+    old["clauses"][1:2] = _split(verse, 60)
+    new["clauses"][1:2] = _split(verse, 30, 60)
+
+    report = clause_diff.diff_clauses(old, new)
+
+    # Only the split is reported; the old second clause keeps its boundaries.
+    changes = {record["clause_id"]: record["changes"] for record in report["clauses"]}
+    assert changes == {
+        "mark-01-02-a": ["boundary-shifted"],
+        "mark-01-02-b": ["added"],
+        "mark-01-02-c": ["renumbered"],
+    }
+    assert "~ mark-01-02-c  renumbered (from mark-01-02-b)" in clause_diff.render_text(report)
@@ -0,0 +1,232 @@
+"""Tests for the resumable clause generation pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import clause_data
+from scripts import clause_pipeline as pipeline
+
+VERSES = [
+    {"reference": "Mark 1:1", "text": "Ἀρχὴ τοῦ εὐαγγελίου Ἰησοῦ χριστοῦ."},
+    {"reference": "Mark 1:2", "text": "Καθὼς γέγραπται ἐν τῷ Ἠσαΐᾳ· Ἰδοὺ ἀποστέλλω τὸν ἄγγελόν μου"},
+    {"reference": "Mark 1:3", "text": "φωνὴ βοῶντος ἐν τῇ ἐρήμῳ· Ἑτοιμάσατε τὴν ὁδὸν κυρίου"},
+    {"reference": "Mark 1:4", "text": "ἐγένετο Ἰωάννης ὁ βαπτίζων ἐν τῇ ἐρήμῳ"},
+]
+TAGS = {"main", "narrative", "speech", "quotation"}
+
+
+class CountingSegmenter(pipeline.StubSegmenter):
+    agent = "test.counting"
+    method = "llm"
+
+    def __init__(self, fail_references: set[str] | None = None) -> None:
+        self.calls: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_references = fail_references or set()
+
+    async def segment(self, batch, prompt_version):
+        self.calls.append([task.reference for task in batch])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if any(task.reference in self.fail_references for task in batch):
+            raise RuntimeError("model unavailable")
+        return await super().segment(batch, prompt_version)
+
+
+def _tasks(prompt_version: str = "v1", agent: str = CountingSegmenter.agent) -> list[pipeline.VerseTask]:
+    return [
+        pipeline.VerseTask(
+            reference=verse["reference"],
+            index=index,
+            text=verse["text"],
+            key=pipeline.cache_key(verse["text"], prompt_version, agent),
+        )
+        for index, verse in enumerate(VERSES)
+    ]
+
+
+def test_stub_segmenter_splits_after_strong_punctuation():
+    segments = asyncio.run(pipeline.StubSegmenter().segment(_tasks()[1:2], "v1"))[0]
+    text = VERSES[1]["text"]
+
+    assert [text[item["start"] : item["end"]] for item in segments] == [
+        "Καθὼς γέγραπται ἐν τῷ Ἠσαΐᾳ·",
+        "Ἰδοὺ ἀποστέλλω τὸν ἄγγελόν μου",
+    ]
+
+
+def test_run_segmentation_bounds_concurrency_and_resumes(tmp_path: Path):
+    cache = pipeline.SegmentCache(tmp_path / "cache.jsonl")
+    backend = CountingSegmenter()
+
+    run = asyncio.run(
+        pipeline.run_segmentation(
+            _tasks(), backend, cache, prompt_version="v1", allowed_tags=TAGS, batch_size=1, concurrency=2
+        )
+    )
+
+    assert run.failures == {}
+    assert run.segmented == 4
+    assert len(backend.calls) == 4
+    assert backend.max_in_flight == 2
+
+    # A fresh process reloads the checkpoint and sends nothing.
+    reloaded = pipeline.SegmentCache(tmp_path / "cache.jsonl")
+    second = CountingSegmenter()
+    asyncio.run(pipeline.run_segmentation(_tasks(), second, reloaded, prompt_version="v1", allowed_tags=TAGS))
+    assert second.calls == []
+
+    # Changing the prompt version invalidates every verse.
+    third = CountingSegmenter()
+    asyncio.run(
+        pipeline.run_segmentation(_tasks("v2"), third, reloaded, prompt_version="v2", allowed_tags=TAGS)
+    )
+    assert sum(len(call) for call in third.calls) == 4
+
+
+def test_cache_entries_are_not_shared_between_backends(tmp_path: Path):
+    cache = pipeline.SegmentCache(tmp_path / "cache.jsonl")
+    stub = pipeline.StubSegmenter()
+    asyncio.run(
+        pipeline.run_segmentation(
+            _tasks(agent=stub.agent), stub, cache, prompt_version="v1", allowed_tags=TAGS
+        )
+    )
+
+    # A real backend with the same prompt version re-segments every verse.
+    backend = CountingSegmenter()
+    asyncio.run(pipeline.run_segmentation(_tasks(), backend, cache, prompt_version="v1", allowed_tags=TAGS))
+    assert sum(len(call) for call in backend.calls) == 4
+
+    selection = list(enumerate(VERSES))
+    payload = {"book_id": "mark", "verses": VERSES}
+    stub_clauses = pipeline.assemble_clause_payload(
+        payload, selection, cache, prompt_version="v1", agent=stub.agent
+    )
+    clauses = pipeline.assemble_clause_payload(
+        payload, selection, cache, prompt_version="v1", agent=backend.agent
+    )
+    assert stub_clauses["generated"]["agent"] == stub.agent
+    assert {clause["source"]["agent"] for clause in stub_clauses["clauses"]} == {stub.agent}
+    assert clauses["generated"]["agent"] == "test.counting"
+    assert {clause["source"]["method"] for clause in clauses["clauses"]} == {"llm"}
+
+
+def test_run_segmentation_records_failures_after_retries(tmp_path: Path):
+    cache = pipeline.SegmentCache(tmp_path / "cache.jsonl")
+    backend = CountingSegmenter(fail_references={"Mark 1:3"})
+
+    run = asyncio.run(
+        pipeline.run_segmentation(
+            _tasks(), backend, cache, prompt_version="v1", allowed_tags=TAGS, batch_size=2, retries=1
+        )
+    )
+
+    assert run.segmented == 2
+    assert set(run.failures) == {"Mark 1:3", "Mark 1:4"}
+    assert "model unavailable" in run.failures["Mark 1:3"]
+    assert backend.calls.count(["Mark 1:3", "Mark 1:4"]) == 2
+    assert sum(1 for task in _tasks() if task.key in cache) == 2
+
+
+def test_check_segments_rejects_bad_output():
+    task = _tasks()[0]
+
+    with pytest.raises(ValueError, match="out of bounds"):
+        pipeline.check_segments(task, [{"start": 0, "end": 999}], TAGS)
+    with pytest.raises(ValueError, match="unknown category tags"):
+        pipeline.check_segments(task, [{"start": 0, "end": 4, "category_tags": ["poetry"]}], TAGS)
+    with pytest.raises(ValueError, match="no segments"):
+        pipeline.check_segments(task, [], TAGS)
+
+    cleaned = pipeline.check_segments(
+        task, [{"start": 0, "end": 4, "category_tags": ["speech"], "function": "Title"}], TAGS
+    )
+    assert cleaned == [{"start": 0, "end": 4, "category_tags": ["main", "speech"], "function": "Title"}]
+
+
+def test_segment_cache_ignores_truncated_line(tmp_path: Path):
+    path = tmp_path / "cache.jsonl"
+    path.write_text('{"key": "a", "segments": []}\n{"key": "b", "segm', encoding="utf-8")
+
+    cache = pipeline.SegmentCache(path)
+
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_main_writes_schema_valid_clauses(tmp_path: Path):
+    payload_path = tmp_path / "mark.json"
+    payload_path.write_text(
+        json.dumps({"book_id": "mark", "display_name": "Gospel of Mark", "verses": VERSES}),
+        encoding="utf-8",
+    )
+    output = tmp_path / "out" / "mark.clauses.json"
+
+    exit_code = pipeline.main([str(payload_path), str(output), "--start", "Mark 1:2", "--end", "Mark 1:3"])
+
+    clauses = json.loads(output.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert [entry["index"] for entry in clauses["verses"]] == [1, 2]
+    assert [clause["clause_id"] for clause in clauses["clauses"]] == [
+        "mark-01-02-a",
+        "mark-01-02-b",
+        "mark-01-03-a",
+        "mark-01-03-b",
+    ]
+    assert clauses["generated"]["timestamp"].endswith("Z")
+    assert clause_data.validate_clause_payload(clauses, VERSES) == []
+    assert (tmp_path / "out" / "mark.clauses.json.cache.jsonl").exists()
+
+
+def test_run_segmentation_counts_verses_sharing_a_cache_key(tmp_path: Path):
+    verses = [{"reference": "Mark 1:1", "text": "Ἀμήν."}, {"reference": "Mark 1:2", "text": "Ἀμήν."}]
+    key = pipeline.cache_key("Ἀμήν.", "v1", CountingSegmenter.agent)
+    tasks = [
+        pipeline.VerseTask(verse["reference"], index, verse["text"], key)
+        for index, verse in enumerate(verses)
+    ]
+    cache = pipeline.SegmentCache(tmp_path / "cache.jsonl")
+    backend = CountingSegmenter()
+
+    run = asyncio.run(pipeline.run_segmentation(tasks, backend, cache, prompt_version="v1", allowed_tags=TAGS))
+    assert backend.calls == [["Mark 1:1"]]
+    assert run.segmented == 2
+
+    failing = CountingSegmenter(fail_references={"Mark 1:1"})
+    fresh = pipeline.SegmentCache(tmp_path / "other.jsonl")
+    run = asyncio.run(
+        pipeline.run_segmentation(tasks, failing, fresh, prompt_version="v1", allowed_tags=TAGS, retries=0)
+    )
+    assert run.segmented == 0
+    assert set(run.failures) == {"Mark 1:1", "Mark 1:2"}
+
+
+def test_select_range_compares_verse_ids():
+    assert [index for index, _ in pipeline.select_range(VERSES, "Mk 1:2", "1:3")] == [1, 2]
+    assert len(pipeline.select_range(VERSES, None, "Mark 1.4")) == 4
+
+
+def test_select_range_and_backend_errors():
+    with pytest.raises(SystemExit, match="Reference not found in payload: Mark 9:9"):
+        pipeline.select_range(VERSES, "Mark 9:9", None)
+    with pytest.raises(SystemExit, match="Invalid reference 'Mark'"):
+        pipeline.select_range(VERSES, "Mark", None)
+    with pytest.raises(SystemExit, match="precedes"):
+        pipeline.select_range(VERSES, "Mark 1:3", "Mark 1:1")
+    with pytest.raises(SystemExit, match="package.module:factory"):
+        pipeline.load_backend("not-a-spec")
+    assert isinstance(pipeline.load_backend("scripts.clause_pipeline:StubSegmenter"), pipeline.StubSegmenter)
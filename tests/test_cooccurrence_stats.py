@@ -0,0 +1,209 @@
+"""Tests for the vectorized co-occurrence statistics."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import cooccurrence_stats as stats
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+VERSES = [
+    {"reference": "Mark 1:1", "text": "καὶ λέγει αὐτοῖς· Ἔρχεται."},
+    {"reference": "Mark 1:2", "text": "καὶ ἦλθεν εἰς τὴν πόλιν"},
+    {"reference": "Mark 1:3", "text": "καὶ λέγει· Ἔρχεται εἰς τὴν πόλιν"},
+]
+
+
+def _clause(index: int, start: int, end: int, tags: list[str]) -> dict:
+    return {
+        "start": {"verse_index": index, "offset": start},
+        "end": {"verse_index": index, "offset": end},
+        "category_tags": tags,
+    }
+
+
+def _brute_force(units, items) -> tuple[Counter, Counter]:
+    members: dict[int, set[int]] = {}
+    for unit, item in zip(units.tolist(), items.tolist()):
+        members.setdefault(unit, set()).add(item)
+    frequency, pairs = Counter(), Counter()
+    for group in members.values():
+        frequency.update(group)
+        pairs.update(itertools.combinations(sorted(group), 2))
+    return frequency, pairs
+
+
+def test_clause_units_assign_tokens_and_tags():
+    vocabulary = stats.Vocabulary()
+    tokens = stats.tokenize_payload(VERSES, vocabulary)
+    clauses = [
+        _clause(0, 0, 17, ["main", "narrative"]),
+        _clause(0, 18, 26, ["main", "speech"]),
+        _clause(2, 0, 9, ["main"]),
+    ]
+
+    units, items, unit_count = stats.clause_units(tokens, clauses, vocabulary)
+
+    members = {}
+    for unit, item in zip(units.tolist(), items.tolist()):
+        members.setdefault(unit, []).append(vocabulary.items[item])
+    assert unit_count == 3
+    assert members[0] == ["και", "λεγει", "αυτοισ", "#main", "#narrative"]
+    assert members[1] == ["ερχεται", "#main", "#speech"]
+    # Verse 2 has no clause, and only the first two words of verse 3 are covered.
+    assert members[2] == ["και", "λεγει", "#main"]
+
+
+def test_counts_and_measures_match_brute_force():
+    payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    vocabulary = stats.Vocabulary()
+    tokens = stats.tokenize_payload(payload["verses"][:120], vocabulary)
+    units, items, unit_count = stats.window_units(tokens, 120, 3)
+
+    table = stats.count_cooccurrences(units, items, unit_count, len(vocabulary))
+
+    frequency, pairs = _brute_force(units, items)
+    observed = {
+        (first, second): count
+        for first, second, count in zip(
+            table.first.tolist(), table.second.tolist(), table.count.tolist()
+        )
+    }
+    assert unit_count == 118
+    assert observed == dict(pairs)
+    assert table.frequency.tolist() == [frequency[item] for item in range(len(vocabulary))]
+
+    row = int(np.argmax(table.count < unit_count // 4))
+    a, b, c, n = int(table.first[row]), int(table.second[row]), int(table.count[row]), unit_count
+    fa, fb = frequency[a], frequency[b]
+    cells = [
+        (c, fa * fb / n),
+        (fa - c, fa * (n - fb) / n),
+        (fb - c, (n - fa) * fb / n),
+        (n - fa - fb + c, (n - fa) * (n - fb) / n),
+    ]
+    expected_llr = 2 * sum(o * math.log(o / e) for o, e in cells if o > 0)
+    assert table.pmi[row] == pytest.approx(math.log2(c * n / (fa * fb)))
+    assert table.llr[row] == pytest.approx(expected_llr)
+
+
+def test_batched_pair_counts_match_single_pass(monkeypatch):
+    payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    vocabulary = stats.Vocabulary()
+    tokens = stats.tokenize_payload(payload["verses"][:60], vocabulary)
+    units, items, unit_count = stats.window_units(tokens, 60, 2)
+
+    whole = stats.count_cooccurrences(units, items, unit_count, len(vocabulary))
+    monkeypatch.setattr(stats, "PAIR_BATCH", 50)
+    batched = stats.count_cooccurrences(units, items, unit_count, len(vocabulary))
+
+    for field in ("first", "second", "count", "pmi", "llr"):
+        assert np.array_equal(getattr(batched, field), getattr(whole, field))
+
+
+def test_ranked_tables_sort_by_llr_and_respect_thresholds():
+    payload = {"book_id": "mark", "verses": VERSES}
+    report = stats.build_report([(payload, None)], unit="verse", min_count=2, top=2)
+
+    collocates = report["collocates"]
+    assert report["unit_count"] == 3
+    assert set(collocates) >= {"και", "λεγει", "ερχεται", "πολιν"}
+    for rows in collocates.values():
+        assert len(rows) <= 2
+        assert all(row["count"] >= 2 for row in rows)
+        assert [row["llr"] for row in rows] == sorted((row["llr"] for row in rows), reverse=True)
+    assert {row["collocate"] for row in collocates["πολιν"]} <= {"εισ", "την", "και"}
+
+
+def test_main_writes_json_and_tsv(tmp_path: Path):
+    output = tmp_path / "mark.json"
+    tsv = tmp_path / "mark.tsv"
+
+    exit_code = stats.main(
+        [str(DATA_DIR / "mark.json"), "--output", str(output), "--tsv", str(tsv), "--top", "3"]
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert report["unit"] == "clause"
+    assert report["books"] == ["mark"]
+    assert report["unit_count"] == 45
+    assert "#speech" in report["collocates"]
+    lines = tsv.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "item\trank\tcollocate\tcount\tpmi\tllr"
+    assert len(lines) - 1 == sum(len(rows) for rows in report["collocates"].values())
+
+
+def test_clause_units_count_tokens_in_every_enclosing_clause():
+    vocabulary = stats.Vocabulary()
+    tokens = stats.tokenize_payload(VERSES, vocabulary)
+    # The outer clause spans verses 1-2; the nested one covers "λέγει αὐτοῖς".
+    clauses = [
+        {
+            "start": {"verse_index": 0, "offset": 0},
+            "end": {"verse_index": 1, "offset": 8},
+            "category_tags": [],
+        },
+        _clause(0, 4, 17, []),
+    ]
+
+    units, items, unit_count = stats.clause_units(tokens, clauses, vocabulary)
+
+    members = {}
+    for unit, item in zip(units.tolist(), items.tolist()):
+        members.setdefault(unit, []).append(vocabulary.items[item])
+    assert unit_count == 2
+    assert members[0] == ["και", "λεγει", "αυτοισ", "ερχεται", "και", "ηλθεν"]
+    assert members[1] == ["λεγει", "αυτοισ"]
+
+
+def test_build_report_counts_books_together_without_crossing_windows():
+    first = {"book_id": "mark", "verses": VERSES[:2]}
+    second = {"book_id": "matthew", "verses": VERSES[2:]}
+
+    report = stats.build_report(
+        [(first, None), (second, None)], unit="verse", window=2, min_count=1, top=0
+    )
+
+    # One window per book: the one-verse second book is a window of its own, and
+    # no window pairs verse 2 with verse 3.
+    assert report["books"] == ["mark", "matthew"]
+    assert report["unit_count"] == 2
+    assert report["token_count"] == 15
+    assert report["frequencies"]["πολιν"] == 2
+    assert report["frequencies"]["ηλθεν"] == 1
+    assert {row["collocate"] for row in report["collocates"]["ηλθεν"]} == {
+        "και",
+        "λεγει",
+        "αυτοισ",
+        "ερχεται",
+        "εισ",
+        "την",
+        "πολιν",
+    }
+
+
+def test_main_counts_every_manifest_book(tmp_path: Path):
+    output = tmp_path / "corpus.json"
+
+    exit_code = stats.main(
+        ["--manifest", str(DATA_DIR / "manifest.json"), "--unit", "verse", "--output", str(output)]
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert report["books"] == ["mark", "matthew"]
@@ -0,0 +1,103 @@
+"""Tests for the shared in-memory corpus."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import corpus as corpus_module
+from scripts import inspect_sblgnt as inspect
+
+
+@pytest.fixture
+def text_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "text"
+    directory.mkdir()
+    (directory / "Mark.txt").write_text(
+        "ΚΑΤΑ ΜΑΡΚΟΝ\nMark 1:1 Ἀρχὴ τοῦ εὐαγγελίου\nMark 1:2 Καθὼς γέγραπται\n"
+        "  ἐν τῷ Ἠσαΐᾳ\nMark 2:1 Καὶ εἰσελθὼν\n",
+        encoding="utf-8",
+    )
+    (directory / "Jude.txt").write_text("ΙΟΥΔΑ\nJude 1:1 Ἰούδας\n", encoding="utf-8")
+    (directory / "sblgnt.txt").write_text("ALL\nMark 1:1 ignored\n", encoding="utf-8")
+    monkeypatch.setattr(inspect, "TEXT_DIR", directory)
+    return directory
+
+
+def test_books_load_lazily_and_match_the_inspector(text_dir):
+    corpus = corpus_module.Corpus("text")
+
+    assert list(corpus) == ["Jude", "Mark"]
+    assert "sblgnt" in corpus and len(corpus) == 2
+    assert corpus.loaded() == []
+
+    mark = corpus["Mark"]
+    assert corpus.loaded() == ["Mark"]
+    assert corpus["Mark"] is mark
+    assert list(mark) == list(inspect.iter_plain_verses("Mark"))
+    assert mark[-1].reference == "Mark 2:1"
+    assert [verse.reference for verse in mark[1:3]] == ["Mark 1:1", "Mark 1:2"]
+    with pytest.raises(KeyError):
+        corpus["Luke"]
+
+
+def test_book_columns_are_compact_and_references_shared(text_dir):
+    mark = corpus_module.Corpus("text")["Mark"]
+
+    assert mark.ids.typecode == "I" and mark.paragraphs.typecode == "i"
+    assert not hasattr(mark, "__dict__")
+    assert not hasattr(mark[1], "__dict__")
+    assert mark[1].reference is mark[1].reference
+    assert mark[2].text == "Καθὼς γέγραπται ἐν τῷ Ἠσαΐᾳ"
+
+
+def test_verse_lookup_by_any_spelling(text_dir):
+    corpus = corpus_module.Corpus("text")
+
+    assert corpus.verse("mark.1.2").text.startswith("Καθὼς")
+    assert corpus.verse("Jude 1:1").text == "Ἰούδας"
+    with pytest.raises(KeyError):
+        corpus.verse("Mark 1:3")
+
+
+def test_shared_corpus_is_built_once_per_directory(text_dir, tmp_path, monkeypatch):
+    first = corpus_module.shared_corpus("text")
+    assert corpus_module.shared_corpus("text") is first
+
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "Jude.txt").write_text("ΙΟΥΔΑ\nJude 1:1 Ἰούδας\n", encoding="utf-8")
+    monkeypatch.setattr(inspect, "TEXT_DIR", other)
+    assert list(corpus_module.shared_corpus("text")) == ["Jude"]
+
+
+def test_books_keep_xml_spellings_and_unparseable_references(tmp_path, monkeypatch):
+    directory = tmp_path / "text"
+    directory.mkdir()
+    (directory / "Matt.txt").write_text(
+        "ΚΑΤΑ ΜΑΘΘΑΙΟΝ\nMatthew 1:1 Βίβλος γενέσεως\nMatthew 1:2 Ἀβραὰμ ἐγέννησεν\n"
+        "Appendix 1:1 σημείωσις\nMatthew 1:3 Ἰούδας δὲ\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(inspect, "TEXT_DIR", directory)
+
+    matthew = corpus_module.Corpus("text")["Matt"]
+
+    assert [verse.reference for verse in matthew] == [
+        "TITLE",
+        "Matthew 1:1",
+        "Matthew 1:2",
+        "Appendix 1:1",
+        "Matthew 1:3",
+    ]
+    assert list(matthew) == list(inspect.iter_plain_verses("Matt"))
+    assert matthew.label == "Matthew"
+    assert matthew[1].reference is matthew[1].reference
+    assert matthew.position(matthew.ids[4]) == 4
+    assert corpus_module.Corpus("text").verse("Matt 1:2").text == "Ἀβραὰμ ἐγέννησεν"
@@ -0,0 +1,172 @@
+"""Tests for the in-memory corpus query daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import corpus_daemon as daemon
+from scripts import inspect_sblgnt as inspect
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    (text_dir / "Mark.txt").write_text(
+        "\n".join(
+            [
+                "ΚΑΤΑ ΜΑΡΚΟΝ",
+                "Mark 1:1 Ἀρχὴ τοῦ εὐαγγελίου Ἰησοῦ",
+                "Mark 1:2 Καθὼς γέγραπται ἐν τῷ Ἠσαΐᾳ",
+                "Mark 1:3 φωνὴ βοῶντος ἐν τῇ ἐρήμῳ",
+                "Mark 1:4 ἐγένετο Ἰωάννης ἐν τῇ ἐρήμῳ",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    (text_dir / "Jude.txt").write_text(
+        "ΙΟΥΔΑ\nJude 1:1 Ἰούδας Ἰησοῦ Χριστοῦ δοῦλος\n", encoding="utf-8"
+    )
+    (text_dir / "sblgnt.txt").write_text("ALL\nMark 1:1 ignored text\n", encoding="utf-8")
+    monkeypatch.setattr(inspect, "TEXT_DIR", text_dir)
+    return text_dir
+
+
+@pytest.fixture
+def index(corpus) -> daemon.CorpusIndex:
+    return daemon.CorpusIndex.load("text")
+
+
+def test_load_skips_aggregate_file(index):
+    assert sorted(index.books) == ["Jude", "Mark"]
+    assert index.handle({"op": "ping"}) == {"ok": True, "result": {"source": "text", "books": 2}}
+
+
+def test_verse_and_range_queries(index):
+    verse = index.handle({"op": "verse", "reference": "mark 1:2"})
+    assert verse["result"]["reference"] == "Mark 1:2"
+    assert verse["result"]["book"] == "Mark"
+
+    verses = index.handle({"op": "range", "start": "Mark 1:2", "end": "Mark 1:4"})["result"]
+    assert [entry["reference"] for entry in verses] == ["Mark 1:2", "Mark 1:3", "Mark 1:4"]
+
+    assert "same book" in index.handle({"op": "range", "start": "Mark 1:1", "end": "Jude 1:1"})["error"]
+    assert "precedes" in index.handle({"op": "range", "start": "Mark 1:3", "end": "Mark 1:1"})["error"]
+    assert "not found" in index.handle({"op": "verse", "reference": "Mark 9:9"})["error"]
+
+
+def test_index_accepts_full_names_and_unparseable_references():
+    books = {
+        "Matt": [
+            inspect.Verse("Matthew 1:1", "Βίβλος γενέσεως"),
+            inspect.Verse("Appendix 1:1", "σημείωσις"),
+        ]
+    }
+    index = daemon.CorpusIndex(books, source="xml")
+
+    assert index.handle({"op": "verse", "reference": "Matt 1:1"})["result"]["reference"] == "Matthew 1:1"
+    assert index.handle({"op": "verse", "reference": "Appendix 1:1"})["result"]["text"] == "σημείωσις"
+
+
+def test_contains_uses_text_index_across_books(index):
+    result = index.handle({"op": "contains", "text": "Ἰησοῦ"})["result"]
+    assert [(entry["book"], entry["reference"]) for entry in result] == [
+        ("Jude", "Jude 1:1"),
+        ("Mark", "Mark 1:1"),
+    ]
+
+    repeated = index.contains("ἐν τ", book="Mark")
+    assert [entry["reference"] for entry in repeated] == ["Mark 1:2", "Mark 1:3", "Mark 1:4"]
+    assert len(index.contains("ἐν τ", book="Mark", limit=2)) == 2
+    assert index.handle({"op": "contains", "text": ""})["ok"] is False
+
+
+def test_select_matches_cli_rules(index):
+    verses = index.books["Mark"]
+    for request in (
+        {"contains": "ἐρήμῳ"},
+        {"start": "Mark 1:3"},
+        {"start": "Mark 1:2", "contains": "ἐν", "limit": 1},
+        {"limit": 2},
+    ):
+        expected = inspect.select_verses(verses, **request)
+        actual = index.select("Mark", **request)
+        assert [daemon.verse_from_dict(record) for record in actual] == expected
+
+    assert "not found" in index.handle({"op": "select", "book": "Mark", "start": "Mark 7"})["error"]
+
+
+def test_handle_rejects_bad_requests(index):
+    assert "Unknown op" in index.handle({"op": "explode"})["error"]
+    assert "Missing request field" in index.handle({"op": "verse"})["error"]
+    assert "Unknown book" in index.handle({"op": "select", "book": "Luke"})["error"]
+    assert "not 'xml'" in index.handle({"op": "books", "source": "xml"})["error"]
+
+
+def test_parse_address():
+    assert daemon.parse_address("127.0.0.1:8765") == ("127.0.0.1", 8765)
+    assert daemon.parse_address("/tmp/sblgnt.sock") == "/tmp/sblgnt.sock"
+
+
+@pytest.fixture
+def running_daemon(index, tmp_path):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    address = str(tmp_path / "corpus.sock")
+    server = asyncio.run_coroutine_threadsafe(daemon.start_server(index, address), loop).result(5)
+    yield address
+
+    async def shutdown() -> None:
+        server.close()
+        await server.wait_closed()
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def test_daemon_serves_concurrent_clients(running_daemon):
+    def query(position: int) -> str:
+        verse = daemon.request_daemon(running_daemon, {"op": "verse", "reference": f"Mark 1:{position}"})
+        return verse["reference"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        references = list(executor.map(query, [1, 2, 3, 4] * 8))
+
+    assert references == [f"Mark 1:{position}" for position in [1, 2, 3, 4] * 8]
+
+    with pytest.raises(SystemExit, match="not found"):
+        daemon.request_daemon(running_daemon, {"op": "verse", "reference": "Mark 2:1"})
+
+
+def test_inspect_cli_forwards_to_daemon(running_daemon, capsys):
+    exit_code = inspect.main(
+        ["--daemon", running_daemon, "--source", "text", "--contains", "ἐρήμῳ", "--format", "tsv"]
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == 0
+    assert [line.split("\t")[0] for line in lines[1:]] == ["Mark 1:3", "Mark 1:4"]
+
+    inspect.main(["--daemon", running_daemon, "--source", "text", "--list-books"])
+    assert capsys.readouterr().out.split() == ["Jude", "Mark"]
+
+
+def test_request_daemon_reports_missing_daemon(tmp_path):
+    with pytest.raises(SystemExit, match="Could not reach the corpus daemon"):
+        daemon.request_daemon(str(tmp_path / "absent.sock"), {"op": "ping"})
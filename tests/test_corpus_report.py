@@ -0,0 +1,84 @@
+"""Tests for the vectorized corpus statistics report."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import corpus_report
+from scripts.greek_text import count_sigla, normalized_words
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+
+def test_grouped_summary_matches_per_group_numpy():
+    rng = np.random.default_rng(7)
+    groups = rng.integers(0, 5, size=300)
+    groups[groups == 3] = 4  # leave group 3 empty
+    values = rng.integers(0, 120, size=300)
+
+    summary = corpus_report.grouped_summary(values, groups, 6)
+
+    for group in range(6):
+        members = values[groups == group]
+        assert summary["count"][group] == members.size
+        if members.size == 0:
+            assert summary["mean"][group] == 0 and summary["p50"][group] == 0
+            continue
+        assert summary["mean"][group] == pytest.approx(members.mean())
+        assert summary["std"][group] == pytest.approx(members.std())
+        assert summary["min"][group] == members.min()
+        assert summary["max"][group] == members.max()
+        for q in corpus_report.PERCENTILES:
+            assert summary[f"p{q}"][group] == pytest.approx(np.percentile(members, q))
+
+
+def test_report_covers_books_chapters_and_categories():
+    report = corpus_report.build_report(corpus_report.load_corpus(DATA_DIR / "manifest.json"))
+
+    mark_payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    clauses = json.loads((DATA_DIR / "mark.clauses.json").read_text(encoding="utf-8"))["clauses"]
+    mark = report["books"]["mark"]
+    verses = mark_payload["verses"]
+
+    assert set(report["books"]) == {"mark", "matthew"}
+    assert mark["verses"] == len(verses)
+    assert mark["metrics"]["tokens"]["total"] == sum(len(normalized_words(v["text"])) for v in verses)
+    assert mark["metrics"]["sigla"]["total"] == sum(count_sigla(v["text"]) for v in verses)
+    assert mark["metrics"]["clauses"]["total"] == len(clauses)
+    assert mark["categories"]["speech"] == sum("speech" in c["category_tags"] for c in clauses)
+
+    chapter_two = [v for v in verses if v["reference"].startswith("Mark 2:")]
+    lengths = [len(v["text"]) for v in chapter_two]
+    assert mark["chapters"]["2"]["verses"] == len(chapter_two)
+    assert mark["chapters"]["2"]["metrics"]["characters"]["p50"] == pytest.approx(
+        np.percentile(lengths, 50), abs=0.01
+    )
+    assert report["totals"]["verses"] == sum(book["verses"] for book in report["books"].values())
+
+
+def test_main_writes_json_and_markdown(tmp_path: Path):
+    json_path = tmp_path / "stats.json"
+    markdown_path = tmp_path / "stats.md"
+
+    exit_code = corpus_report.main(
+        ["--json", str(json_path), "--markdown", str(markdown_path)]
+    )
+
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    markdown = markdown_path.read_text(encoding="utf-8")
+    assert exit_code == 0
+    assert report["version"] == corpus_report.REPORT_VERSION
+    assert "## Gospel of Mark (`mark`)" in markdown
+    assert "| `speech` |" in markdown
+    chapter_tokens = report["books"]["mark"]["chapters"]["1"]["metrics"]["tokens"]["total"]
+    assert f"| 1 | 45 | {chapter_tokens} |" in markdown
@@ -0,0 +1,214 @@
+"""Tests for the SQLite corpus and clause export."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import export_sqlite
+from scripts import inspect_sblgnt as inspect
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    target = tmp_path / "data"
+    target.mkdir()
+    for name in ("manifest.json", "mark.json", "mark.clauses.json", "matthew.json"):
+        shutil.copy(DATA_DIR / name, target / name)
+    return target
+
+
+@pytest.fixture
+def database(data_dir: Path, tmp_path: Path) -> Path:
+    path = tmp_path / "corpus.sqlite"
+    export_sqlite.export(data_dir / "manifest.json", path)
+    return path
+
+
+def test_export_loads_verses_clauses_and_tags(database: Path):
+    mark = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    clauses = json.loads((DATA_DIR / "mark.clauses.json").read_text(encoding="utf-8"))["clauses"]
+
+    with sqlite3.connect(database) as connection:
+        books = connection.execute("SELECT book_id, name FROM books ORDER BY book_id").fetchall()
+        verse_count = connection.execute(
+            "SELECT count(*) FROM verses WHERE book_id = 'mark'"
+        ).fetchone()[0]
+        spans = dict(connection.execute("SELECT clause_id, text FROM clause_spans"))
+        speech = connection.execute(
+            "SELECT count(*) FROM clause_tags WHERE tag = 'speech'"
+        ).fetchone()[0]
+        folded = connection.execute(
+            "SELECT count(*) FROM verse_fts WHERE verse_fts MATCH 'folded : \"ιησου\"'"
+        ).fetchone()[0]
+
+    assert books == [("mark", "Mark"), ("matthew", "Matt")]
+    assert verse_count == len(mark["verses"])
+    first = clauses[0]
+    verse_text = mark["verses"][first["start"]["verse_index"]]["text"]
+    assert spans[first["clause_id"]] == verse_text[first["start"]["offset"] : first["end"]["offset"]]
+    assert speech == sum("speech" in clause["category_tags"] for clause in clauses)
+    assert folded >= sum("Ἰησο" in verse["text"] for verse in mark["verses"])
+
+
+def test_export_is_incremental_per_book(data_dir: Path, database: Path):
+    manifest = data_dir / "manifest.json"
+    assert export_sqlite.export(manifest, database)["unchanged"] == ["mark", "matthew"]
+
+    clause_path = data_dir / "mark.clauses.json"
+    clauses = json.loads(clause_path.read_text(encoding="utf-8"))
+    clauses["clauses"] = clauses["clauses"][:3]
+    clause_path.write_text(json.dumps(clauses, ensure_ascii=False), encoding="utf-8")
+
+    summary = export_sqlite.export(manifest, database)
+    assert summary["loaded"] == ["mark"]
+    assert summary["unchanged"] == ["matthew"]
+
+    entries = json.loads(manifest.read_text(encoding="utf-8"))
+    entries["books"] = [entry for entry in entries["books"] if entry["book_id"] == "mark"]
+    manifest.write_text(json.dumps(entries), encoding="utf-8")
+
+    assert export_sqlite.export(manifest, database)["removed"] == ["matthew"]
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT count(*) FROM clauses").fetchone()[0] == 3
+        books = connection.execute("SELECT book_id FROM books").fetchall()
+        assert books == [("mark",)]
+        remaining_fts = connection.execute("SELECT count(*) FROM verse_fts").fetchone()[0]
+        assert remaining_fts == connection.execute("SELECT count(*) FROM verses").fetchone()[0]
+
+
+def test_export_keeps_two_builds_of_one_book(data_dir: Path, tmp_path: Path):
+    manifest = data_dir / "manifest.json"
+    shutil.copy(data_dir / "mark.json", data_dir / "mark-text.json")
+    shutil.copy(data_dir / "mark.clauses.json", data_dir / "mark-text.clauses.json")
+    entries = json.loads(manifest.read_text(encoding="utf-8"))
+    entries["books"].append({"book_id": "mark-text", "data_path": "mark-text.json"})
+    manifest.write_text(json.dumps(entries), encoding="utf-8")
+    database = tmp_path / "two.sqlite"
+
+    summary = export_sqlite.export(manifest, database)
+
+    assert summary["loaded"] == ["mark", "matthew", "mark-text"]
+    with sqlite3.connect(database) as connection:
+        counts = dict(connection.execute("SELECT book_id, count(*) FROM clauses GROUP BY book_id"))
+        assert counts["mark"] == counts["mark-text"] > 0
+        rows = list(export_sqlite.query_verses(connection, "mark-text", start="Mark 1:4", limit=1))
+        assert rows[0][0] == "Mark 1:4"
+        # An exact book_id wins over the shared name.
+        assert export_sqlite.resolve_book(connection, "mark")[0] == "mark"
+        connection.execute("UPDATE books SET book_id = 'mark-xml' WHERE book_id = 'mark'")
+        with pytest.raises(SystemExit, match="more than once; pass one of: mark-text, mark-xml"):
+            export_sqlite.resolve_book(connection, "Mark")
+        connection.rollback()
+
+    entries["books"].append({"book_id": "mark", "data_path": "mark.json"})
+    manifest.write_text(json.dumps(entries), encoding="utf-8")
+    with pytest.raises(export_sqlite.ExportError, match="book_id 'mark' more than once"):
+        export_sqlite.export(manifest, database)
+
+
+def test_export_keeps_verses_with_unparseable_references(data_dir: Path, tmp_path: Path):
+    payload_path = data_dir / "matthew.json"
+    payload = json.loads(payload_path.read_text(encoding="utf-8"))
+    payload["verses"][0]["reference"] = "Matthew Prologue"
+    payload_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    database = tmp_path / "odd.sqlite"
+
+    assert export_sqlite.export(data_dir / "manifest.json", database)["loaded"] == ["mark", "matthew"]
+
+    with sqlite3.connect(database) as connection:
+        name = connection.execute("SELECT name FROM books WHERE book_id = 'matthew'").fetchone()[0]
+        odd = connection.execute(
+            "SELECT verse_id, chapter FROM verses WHERE reference = 'Matthew Prologue'"
+        ).fetchone()
+    assert name == "Matt"
+    assert odd == (None, None)
+
+
+def test_failed_rebuild_keeps_previous_database(data_dir: Path, database: Path, monkeypatch):
+    with sqlite3.connect(database) as connection:
+        connection.execute("PRAGMA user_version = 1")
+    (data_dir / "matthew.json").write_text('{"book_id": "matthew"}', encoding="utf-8")
+
+    with pytest.raises(KeyError):
+        export_sqlite.export(data_dir / "manifest.json", database)
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == 1
+        books = connection.execute("SELECT book_id FROM books ORDER BY book_id").fetchall()
+        assert books == [("mark",), ("matthew",)]
+
+
+@pytest.mark.parametrize(
+    "start, contains, limit",
+    [
+        (None, None, 5),
+        ("Mark 1:4", None, 3),
+        ("mark.1.4", None, 3),
+        (None, "Ἰησοῦ", 0),
+        ("Mark 2", "καὶ", 4),
+        (None, "ὁ", 6),
+    ],
+)
+def test_query_matches_inspect_selection(database: Path, start, contains, limit):
+    payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    verses = [inspect.Verse("TITLE", payload["header"])]
+    verses += [inspect.Verse(verse["reference"], verse["text"]) for verse in payload["verses"]]
+    expected = inspect.select_verses(verses, start=start, contains=contains, limit=limit)
+
+    with sqlite3.connect(database) as connection:
+        rows = list(
+            export_sqlite.query_verses(
+                connection, "mark", start=start, contains=contains, limit=limit
+            )
+        )
+
+    assert [(row[0], row[1]) for row in rows] == [(verse.reference, verse.text) for verse in expected]
+
+
+def test_query_reports_unknown_book_and_start(database: Path):
+    with sqlite3.connect(database) as connection:
+        with pytest.raises(SystemExit, match="Available options: Mark, Matt"):
+            list(export_sqlite.query_verses(connection, "Luke"))
+        with pytest.raises(SystemExit, match="not found in selection"):
+            list(export_sqlite.query_verses(connection, "Mark", start="Mark 99"))
+
+
+def test_inspect_main_reads_sqlite(database: Path, capsys):
+    exit_code = inspect.main(
+        [
+            "--source",
+            "sqlite",
+            "--database",
+            str(database),
+            "--book",
+            "Mark",
+            "--contains",
+            "Ἰησοῦ",
+            "--limit",
+            "2",
+            "--format",
+            "jsonl",
+        ]
+    )
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_code == 0
+    assert [record["reference"] for record in records] == ["Mark 1:1", "Mark 1:9"]
+
+    inspect.main(["--source", "sqlite", "--database", str(database), "--list-books"])
+    assert capsys.readouterr().out.split() == ["Mark", "Matt"]
+
+    with pytest.raises(SystemExit, match="export_sqlite.py"):
+        inspect.main(["--source", "sqlite", "--database", str(database.with_suffix(".missing"))])
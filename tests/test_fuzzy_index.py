@@ -0,0 +1,138 @@
+"""Tests for the persisted fuzzy word-form index."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import corpus, fuzzy_index
+from scripts import inspect_sblgnt as inspect
+from scripts.greek_text import WORD_PATTERN, accented_form
+from scripts.verse_ref import parse_reference
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+
+def _osa(first: str, second: str) -> int:
+    rows = [[0] * (len(second) + 1) for _ in range(len(first) + 1)]
+    for i in range(len(first) + 1):
+        rows[i][0] = i
+    for j in range(len(second) + 1):
+        rows[0][j] = j
+    for i in range(1, len(first) + 1):
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+def _mark_verses() -> list[tuple[int, str]]:
+    payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    return [(parse_reference(verse["reference"]), verse["text"]) for verse in payload["verses"]]
+
+
+def test_deletion_variants_cover_every_deletion():
+    assert fuzzy_index.deletion_variants("abc", 1) == {"abc", "bc", "ac", "ab"}
+    assert fuzzy_index.deletion_variants("ab", 3) == {"ab", "a", "b", ""}
+
+
+def test_edit_distance_matches_reference_within_limit():
+    pairs = [
+        ("λόγος", "λογος"),
+        ("λόγος", "λόγοι"),
+        ("καθώς", "καθὼς"),
+        ("abcd", "badc"),
+        ("ἀρχή", "ἀρχὴ"),
+        ("πνεῦμα", "πνευματος"),
+        ("", "ab"),
+    ]
+    for first, second in pairs:
+        expected = _osa(first, second)
+        for limit in range(4):
+            assert fuzzy_index.edit_distance(first, second, limit) == min(expected, limit + 1)
+
+
+def test_lookup_agrees_with_a_full_scan():
+    verses = _mark_verses()
+    index = fuzzy_index.FuzzyIndex.from_verses(verses, max_distance=2)
+
+    for query in ("Ἰησοῦς", "λεγει", "βασιλεία", "θαλασης", "εὐθὺς"):
+        key = accented_form(query)
+        expected = sorted(
+            (distance, form)
+            for form in index.forms
+            if (distance := _osa(key, form)) <= 2
+        )
+        assert [(match.distance, match.form) for match in index.lookup(query)] == expected
+
+    assert [(match.form, match.distance) for match in index.lookup("θαλασης")] == [("θαλάσσησ", 2)]
+    assert index.lookup("θαλασης", 1) == []
+    exact = index.lookup("εὐθὺς", 0)
+    assert [match.form for match in exact] == ["εὐθὺσ"]
+    texts = dict(verses)
+    for verse_id in exact[0].verse_ids:
+        assert any(
+            accented_form(word.group()) == "εὐθὺσ" for word in WORD_PATTERN.finditer(texts[verse_id])
+        )
+
+
+def test_surfaces_are_the_most_frequent_spelling():
+    index = fuzzy_index.FuzzyIndex.from_verses(
+        [(1, "Λόγος ἦν"), (2, "ὁ λόγος"), (3, "λόγος τοῦ")], max_distance=1
+    )
+
+    assert [(match.form, match.surface) for match in index.lookup("λογος")] == [
+        ("λόγοσ", "λόγος")
+    ]
+
+
+def test_round_trip_through_sqlite(tmp_path):
+    index = fuzzy_index.FuzzyIndex.from_verses(_mark_verses()[:40], max_distance=1)
+    path = tmp_path / "fuzzy.sqlite"
+
+    index.save(path, "x")
+    restored, meta = fuzzy_index.FuzzyIndex.open(path)
+
+    assert meta["fingerprint"] == "x"
+    assert restored.forms == index.forms
+    assert restored.surfaces == index.surfaces
+    assert restored.postings == index.postings
+    assert restored.lookup("ἀρχη") == index.lookup("ἀρχη")
+    assert dict(restored._deletes) == index._deletes
+
+
+def test_load_or_build_reuses_until_the_corpus_changes(tmp_path, monkeypatch):
+    text_dir = tmp_path / "text"
+    text_dir.mkdir()
+    book = text_dir / "Mark.txt"
+    book.write_text("KATA MARKON\nMark 1:1 Ἀρχὴ τοῦ εὐαγγελίου\n", encoding="utf-8")
+    monkeypatch.setattr(inspect, "TEXT_DIR", text_dir)
+    path = tmp_path / "fuzzy.sqlite"
+
+    first = fuzzy_index.load_or_build("text", path)
+    stored = path.read_bytes()
+    again = fuzzy_index.load_or_build("text", path)
+
+    assert first.forms == again.forms == sorted(["ἀρχὴ", "εὐαγγελίου", "τοῦ"])
+    assert again.surfaces[again.forms.index("ἀρχὴ")] == "Ἀρχὴ"
+    assert path.read_bytes() == stored
+
+    # A file that is not an index (e.g. the old JSON format) is replaced.
+    path.write_text("{}", encoding="utf-8")
+    assert fuzzy_index.load_or_build("text", path).forms == first.forms
+
+    wider = fuzzy_index.load_or_build("text", path, max_distance=3)
+    assert wider.max_distance == 3
+
+    book.write_text("KATA MARKON\nMark 1:1 Ἀρχὴ τοῦ εὐαγγελίου Ἰησοῦ\n", encoding="utf-8")
+    # Drop the cached, already parsed book.
+    monkeypatch.setattr(corpus, "_SHARED", {})
+    rebuilt = fuzzy_index.load_or_build("text", path)
+    assert "ἰησοῦ" in rebuilt.forms
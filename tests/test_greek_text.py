@@ -0,0 +1,43 @@
+"""Tests for the shared Greek normalization helpers."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import greek_text
+
+
+def test_normalize_form_folds_accents_case_and_final_sigma():
+    assert greek_text.normalize_form("Καθὼς") == "καθωσ"
+    assert greek_text.normalize_form("Ἠσαΐᾳ") == "ησαια"
+    assert greek_text.normalize_form("ὑπʼ") == "υπ"
+
+
+def test_accented_form_keeps_accents():
+    assert greek_text.accented_form("Ἰησοῦς") == "ἰησοῦσ"
+    assert greek_text.accented_form("ὑπʼ") == "ὑπ"
+    assert greek_text.accented_form("Λόγος") != greek_text.accented_form("λογος")
+
+
+def test_iter_word_spans_skips_sigla_and_punctuation():
+    text = "⸀Καθὼς γέγραπται ἐν ⸂τῷ Ἠσαΐᾳ⸃·"
+
+    spans = list(greek_text.iter_word_spans(text))
+
+    assert [word for word, _, _ in spans] == ["Καθὼς", "γέγραπται", "ἐν", "τῷ", "Ἠσαΐᾳ"]
+    for word, start, end in spans:
+        assert text[start:end] == word
+
+
+def test_normalize_text_joins_forms():
+    assert greek_text.normalize_text("⸀Ἰδοὺ ἀποστέλλω, τὸν ἄγγελόν·") == "ιδου αποστελλω τον αγγελον"
+
+
+def test_count_sigla():
+    assert greek_text.count_sigla("⸀Καθὼς γέγραπται ἐν ⸂τῷ Ἠσαΐᾳ⸃· ⸁σου") == 4
+    assert greek_text.count_sigla("Ἀρχὴ τοῦ εὐαγγελίου") == 0
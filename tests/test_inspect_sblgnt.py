@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """Tests for the SBLGNT inspection utility."""
 
+import json
 import sys
 from pathlib import Path
 
@@ -128,11 +129,23 @@ def test_filter_verses_start_and_contains():
 
     filtered = inspect.filter_verses(verses, start="Mark 1:2")
     assert filtered == [verses[1]]
+    assert inspect.filter_verses(verses, start="mark.1.2") == [verses[1]]
 
     contains_filtered = inspect.filter_verses(verses, contains="Καθ")
     assert contains_filtered == [verses[0]]
 
 
+def test_filter_verses_tolerates_unparseable_references():
+    verses = [
+        inspect.Verse(reference="TITLE", text="ΚΑΤΑ ΜΑΘΘΑΙΟΝ"),
+        inspect.Verse(reference="Appendix 1:1", text="—"),
+        inspect.Verse(reference="Matthew 1:2", text="Ἀβραὰμ"),
+    ]
+
+    assert inspect.filter_verses(verses, start="Matt 1:2") == [verses[2]]
+    assert inspect.filter_verses(verses, start="Appendix 1:1") == verses[1:]
+
+
 def test_filter_verses_start_not_found():
     verses = [inspect.Verse(reference="Mark 1:1", text="Καθὼς")]
 
@@ -165,6 +178,8 @@ def test_parse_args_accepts_overrides():
             "--show-paragraphs",
             "--width",
             "72",
+            "--format",
+            "tsv",
         ]
     )
 
@@ -176,6 +191,7 @@ def test_parse_args_accepts_overrides():
     assert args.list_books is True
     assert args.show_paragraphs is True
     assert args.width == 72
+    assert args.output_format == "tsv"
 
 
 def test_main_lists_books(fake_corpus, capsys):
@@ -209,6 +225,19 @@ def test_main_filters_plain_text(fake_corpus, capsys):
     assert exit_code == 0
 
 
+def test_main_prints_books_with_full_name_references(fake_corpus, capsys):
+    text_dir, _ = fake_corpus
+    (text_dir / "Matt.txt").write_text(
+        "ΚΑΤΑ ΜΑΘΘΑΙΟΝ\nMatthew 1:1 Βίβλος γενέσεως\nMatthew 1:2 Ἀβραὰμ ἐγέννησεν\n",
+        encoding="utf-8",
+    )
+
+    exit_code = inspect.main(["--book", "Matt", "--source", "text", "--start", "Matt 1:2"])
+
+    assert exit_code == 0
+    assert capsys.readouterr().out.startswith("Matthew 1:2: Ἀβραὰμ ἐγέννησεν")
+
+
 def test_main_reports_no_matches(fake_corpus, capsys):
     exit_code = inspect.main(
         ["--source", "text", "--book", "Mark", "--contains", "NotPresent"]
@@ -249,6 +278,50 @@ def test_main_renders_xml_with_paragraphs(fake_corpus, capsys):
     assert exit_code == 0
 
 
+def test_render_verses_machine_formats_skip_wrapping():
+    verses = [
+        inspect.Verse(reference="Mark 1:1", text="Καθὼς\tἐστίν " * 20, paragraph_index=3),
+        inspect.Verse(reference="Mark 1:2", text="Ἀρχή"),
+    ]
+
+    jsonl = list(inspect.render_verses(verses, output_format="jsonl", width=20))
+    assert len(jsonl) == 2
+    assert json.loads(jsonl[0]) == {
+        "reference": "Mark 1:1",
+        "text": "Καθὼς\tἐστίν " * 20,
+        "paragraph_index": 3,
+    }
+    assert json.loads(jsonl[1])["paragraph_index"] is None
+
+    tsv = list(inspect.render_verses(verses, output_format="tsv", width=20))
+    assert tsv[0] == inspect.TSV_HEADER
+    reference, text, paragraph = tsv[1].rstrip("\n").split("\t")
+    assert (reference, paragraph) == ("Mark 1:1", "3")
+    assert "\n" not in text
+    assert tsv[2] == "Mark 1:2\tἈρχή\t\n"
+
+
+def test_main_streams_jsonl_with_paragraphs(fake_corpus, capsys):
+    exit_code = inspect.main(["--book", "Mark", "--limit", "0", "--format", "jsonl"])
+
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["reference"] for record in records] == ["Mark 1:1", "Mark 1:2"]
+    assert records[1]["paragraph_index"] == 1
+    assert exit_code == 0
+
+
+def test_main_machine_format_reports_no_matches_on_stderr(fake_corpus, capsys):
+    exit_code = inspect.main(
+        ["--source", "text", "--book", "Mark", "--contains", "NotPresent", "--format", "tsv"]
+    )
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "No verses matched" in captured.err
+    assert exit_code == 0
+
+
 def test_main_instructs_when_corpus_missing(monkeypatch, tmp_path):
     missing = tmp_path / "absent"
     monkeypatch.setattr(inspect, "TEXT_DIR", missing)
@@ -259,3 +332,83 @@ def test_main_instructs_when_corpus_missing(monkeypatch, tmp_path):
     message = str(exc.value)
     assert "SBLGNT text corpus not found" in message
     assert "git submodule update --init --recursive" in message
+
+
+def test_main_contains_any_reports_terms_and_offsets(fake_corpus, tmp_path, capsys):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("# forms\nκαθως\nερημω\nμηδεν\n", encoding="utf-8")
+
+    exit_code = inspect.main(
+        ["--source", "text", "--contains-any", str(terms), "--fold", "--format", "jsonl"]
+    )
+
+    captured = capsys.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert exit_code == 0
+    assert [record["reference"] for record in records] == ["Mark 1:2", "Mark 1:3"]
+    first = records[0]
+    match = first["matches"][0]
+    assert first["text"][match["start"] : match["end"]] == "Καθὼς"
+    assert records[1]["matches"][0]["term"] == "ερημω"
+    assert "2 of 3 terms matched in 2 verses" in captured.err
+    assert "μηδεν\t0" in captured.err
+
+
+def test_main_contains_any_across_books_as_tsv(fake_corpus, tmp_path, capsys):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("Ἀρχή\nγέγραπται\n", encoding="utf-8")
+
+    exit_code = inspect.main(["--all-books", "--contains-any", str(terms), "--format", "tsv"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == 0
+    assert lines == [
+        "reference\tterm\tstart\tend",
+        "Mark 1:1\tἈρχή\t0\t4",
+        "Mark 1:2\tγέγραπται\t12\t21",
+    ]
+
+
+def test_term_search_flags_require_contains_any():
+    with pytest.raises(SystemExit):
+        inspect.parse_args(["--fold"])
+
+
+def test_main_fuzzy_lists_close_forms_and_verses(fake_corpus, tmp_path, capsys):
+    index_path = tmp_path / "fuzzy.sqlite"
+
+    exit_code = inspect.main(
+        ["--fuzzy", "γεγραπτα", "--fuzzy-index", str(index_path), "--format", "tsv"]
+    )
+
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    assert index_path.exists()
+    assert captured.out.splitlines() == [
+        "reference\tterm\tstart\tend",
+        "Mark 1:2\tγέγραπται\t12\t21",
+    ]
+    assert "1 forms within 2 edits of 'γεγραπτα' in 1 verses" in captured.err
+    assert "γέγραπται\t2\t1" in captured.err
+
+
+def test_main_fuzzy_reports_surface_spellings(fake_corpus, tmp_path, capsys):
+    index_path = tmp_path / "fuzzy.sqlite"
+
+    exit_code = inspect.main(
+        [
+            "--source", "text", "--fuzzy", "λογος", "--max-distance", "1",
+            "--fuzzy-index", str(index_path), "--format", "tsv",
+        ]
+    )
+
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    # Not the folded key "λόγοσ".
+    assert "  Λόγος\t1\t1" in captured.err
+    assert captured.out.splitlines()[1:] == ["Mark 1:1\tΛόγος\t0\t5"]
+
+
+def test_fuzzy_flags_require_fuzzy():
+    with pytest.raises(SystemExit):
+        inspect.parse_args(["--max-distance", "1"])
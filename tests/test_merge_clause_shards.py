@@ -0,0 +1,160 @@
+"""Tests for the per-chapter clause shard merge."""
+
+from __future__ import annotations
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import clause_data
+from scripts import merge_clause_shards as merge
+
+SHARD_DIR = PROJECT_ROOT / "clause-shards" / "mark"
+CLAUSE_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.clauses.json"
+
+
+def _shifted_chapter(shard: dict, chapter: int, index_offset: int) -> dict:
+    """Return a copy of ``shard`` relabelled as another chapter."""
+
+    clone = copy.deepcopy(shard)
+    clone["generated"]["timestamp"] = "2025-10-01T00:00:00Z"
+    clone["generated"]["confidence"] = "low"
+    for entry in clone["verses"]:
+        entry["reference"] = f"Mark {chapter}:{entry['verse']}"
+        entry["chapter"] = chapter
+        entry["index"] += index_offset
+    for clause in clone["clauses"]:
+        clause["clause_id"] = clause["clause_id"].replace("mark-01-", f"mark-{chapter:02d}-")
+        for boundary in (clause["start"], clause["end"]):
+            boundary["reference"] = boundary["reference"].replace("Mark 1:", f"Mark {chapter}:")
+            boundary["verse_index"] += index_offset
+        clause["references"] = [clause["start"]["reference"]]
+        clause["category_tags"] = ["main", "speech"]
+    return clone
+
+
+def test_published_clause_file_matches_shards():
+    assert merge.is_up_to_date(SHARD_DIR, CLAUSE_PATH)
+    assert merge.merge_directory(SHARD_DIR) == clause_data.load_json(CLAUSE_PATH)
+
+
+def test_merge_interleaves_shards_in_clause_order():
+    chapter_one = clause_data.load_json(SHARD_DIR / "mark-01.clauses.json")
+    chapter_two = _shifted_chapter(chapter_one, 2, 45)
+
+    merged = merge.merge_shards([chapter_two, chapter_one], digest="abc")
+
+    keys = [clause_data.clause_sort_key(clause) for clause in merged["clauses"]]
+    assert keys == sorted(keys)
+    assert len(merged["clauses"]) == 90
+    assert [entry["index"] for entry in merged["verses"]] == list(range(90))
+    assert merged["categories"] == sorted(set(chapter_one["categories"]) | {"speech"})
+    assert merged["generated"]["timestamp"] == "2025-10-01T00:00:00Z"
+    assert merged["generated"]["confidence"] == "low"
+    assert merged["generated"]["shard_digest"] == "abc"
+    assert clause_data.validate_clause_payload(merged) == []
+
+
+def test_merge_rejects_duplicate_ids_and_mixed_books():
+    shard = clause_data.load_json(SHARD_DIR / "mark-01.clauses.json")
+
+    with pytest.raises(merge.ShardError, match="more than one shard"):
+        merge.merge_shards([shard, shard])
+
+    other = copy.deepcopy(shard)
+    other["book_id"] = "matthew"
+    with pytest.raises(merge.ShardError, match="mix books"):
+        merge.merge_shards([shard, other])
+
+
+def test_merge_rejects_unsorted_shards():
+    shard = clause_data.load_json(SHARD_DIR / "mark-01.clauses.json")
+    clauses = copy.deepcopy(shard)
+    clauses["clauses"][1], clauses["clauses"][2] = clauses["clauses"][2], clauses["clauses"][1]
+    with pytest.raises(merge.ShardError, match="mark-01-02-a: shard is not in"):
+        merge.merge_shards([clauses])
+
+    registry = copy.deepcopy(shard)
+    registry["verses"].reverse()
+    with pytest.raises(merge.ShardError, match="verse index order"):
+        merge.merge_shards([registry])
+
+
+def test_split_round_trips_book_file():
+    payload = clause_data.load_json(CLAUSE_PATH)
+    two_chapters = merge.merge_shards(
+        [payload, _shifted_chapter(payload, 2, 45)], digest=payload["generated"]["shard_digest"]
+    )
+
+    shards = merge.split_book_payload(two_chapters)
+
+    assert list(shards) == [1, 2]
+    assert all("shard_digest" not in shard["generated"] for shard in shards.values())
+    assert all("content_digest" not in shard["generated"] for shard in shards.values())
+    assert [clause["clause_id"] for clause in shards[2]["clauses"]][0] == "mark-02-01-a"
+    assert merge.merge_shards(list(shards.values()), digest="x")["clauses"] == two_chapters["clauses"]
+
+
+def test_main_split_removes_stale_shards(tmp_path: Path):
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+    stale = shard_dir / "mark-16.clauses.json"
+    stale.write_text("{}", encoding="utf-8")
+    notes = shard_dir / "README.md"
+    notes.write_text("notes", encoding="utf-8")
+    output = tmp_path / "mark.clauses.json"
+    output.write_text(CLAUSE_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+
+    assert merge.main([str(shard_dir), str(output), "--split"]) == 0
+
+    assert not stale.exists()
+    assert notes.exists()
+    assert [path.name for path in merge.shard_paths(shard_dir)] == ["mark-01.clauses.json"]
+
+
+def test_main_skips_unchanged_shards(tmp_path: Path, capsys):
+    shard_dir = tmp_path / "shards"
+    output = tmp_path / "mark.clauses.json"
+    output.write_text(CLAUSE_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+    assert merge.main([str(shard_dir), str(output), "--split"]) == 0
+
+    assert merge.main([str(shard_dir), str(output), "--force"]) == 0
+    assert merge.main([str(shard_dir), str(output)]) == 0
+    assert "up to date" in capsys.readouterr().err
+
+    shard_path = shard_dir / "mark-01.clauses.json"
+    shard = json.loads(shard_path.read_text(encoding="utf-8"))
+    shard["clauses"][0]["category_tags"] = ["main", "speech"]
+    shard_path.write_text(json.dumps(shard, ensure_ascii=False), encoding="utf-8")
+
+    assert merge.main([str(shard_dir), str(output), "--check"]) == 1
+    assert merge.main([str(shard_dir), str(output)]) == 0
+    merged = json.loads(output.read_text(encoding="utf-8"))
+    assert merged["clauses"][0]["category_tags"] == ["main", "speech"]
+    assert merged["generated"]["shard_digest"] == merge.shard_digest(merge.shard_paths(shard_dir))
+
+
+def test_edited_or_truncated_output_is_not_up_to_date(tmp_path: Path):
+    shard_dir = tmp_path / "shards"
+    output = tmp_path / "mark.clauses.json"
+    output.write_text(CLAUSE_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+    assert merge.main([str(shard_dir), str(output), "--split"]) == 0
+    assert merge.is_up_to_date(shard_dir, output)
+
+    published = output.read_text(encoding="utf-8")
+    edited = json.loads(published)
+    edited["clauses"][0]["category_tags"] = ["main", "speech"]
+    output.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+    assert not merge.is_up_to_date(shard_dir, output)
+
+    output.write_text(published[: len(published) // 2], encoding="utf-8")
+    assert not merge.is_up_to_date(shard_dir, output)
+    assert merge.main([str(shard_dir), str(output)]) == 0
+    assert json.loads(output.read_text(encoding="utf-8")) == json.loads(published)
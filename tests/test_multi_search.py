@@ -0,0 +1,70 @@
+"""Tests for the Aho–Corasick term automaton."""
+
+from __future__ import annotations
+
+import sys
+import unicodedata
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.greek_text import fold_with_offsets
+from scripts.multi_search import TermAutomaton, TermMatch, load_terms
+
+VERSE = "Ἀρχὴ τοῦ εὐαγγελίου Ἰησοῦ ⸀χριστοῦ."
+
+
+def test_reports_overlapping_matches_with_offsets():
+    automaton = TermAutomaton(["he", "she", "his", "hers", "he"])
+
+    assert len(automaton) == 4
+    assert automaton.find_all("ushers") == [
+        TermMatch("she", 1, 4),
+        TermMatch("he", 2, 4),
+        TermMatch("hers", 2, 6),
+    ]
+    assert automaton.find_all("xyz") == []
+
+
+def test_matches_agree_with_naive_search():
+    terms = ["τοῦ", "οῦ", "εὐαγγελίου", "γγ", "Ἰησοῦ χ"]
+    automaton = TermAutomaton(terms)
+
+    expected = sorted(
+        (start, start + len(term), term)
+        for term in terms
+        for start in range(len(VERSE))
+        if VERSE.startswith(term, start)
+    )
+    assert sorted((m.start, m.end, m.term) for m in automaton.find_all(VERSE)) == expected
+
+
+def test_folded_matches_map_back_to_original_offsets():
+    automaton = TermAutomaton(["ιησου", "ΧΡΙΣΤ", "Χριστοῦ", "χριστος"], fold=True)
+
+    matches = automaton.find_all(VERSE)
+    assert [(match.term, VERSE[match.start : match.end]) for match in matches] == [
+        ("ιησου", "Ἰησοῦ"),
+        ("ΧΡΙΣΤ", "χριστ"),
+        ("Χριστοῦ", "χριστοῦ"),
+    ]
+
+    decomposed = unicodedata.normalize("NFD", VERSE)
+    match = automaton.find_all(decomposed)[0]
+    assert decomposed[match.start : match.end] == unicodedata.normalize("NFD", "Ἰησοῦ")
+
+
+def test_fold_with_offsets_tracks_every_folded_character():
+    folded, origins = fold_with_offsets("Ἀλλʼ ᾯ")
+
+    assert folded == "αλλ ω"
+    assert origins == [0, 1, 2, 4, 5]
+
+
+def test_load_terms_skips_comments_and_blank_lines(tmp_path):
+    path = tmp_path / "terms.txt"
+    path.write_text("# forms of λέγω\nλέγει\n\n  εἶπεν  \n", encoding="utf-8")
+
+    assert load_terms(path) == ["λέγει", "εἶπεν"]
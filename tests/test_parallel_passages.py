@@ -0,0 +1,125 @@
+"""Tests for the MinHash/LSH parallel passage finder."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import parallel_passages as parallels
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+LEFT = {
+    "book_id": "mark",
+    "verses": [
+        {"reference": "Mark 4:9", "text": "καὶ ἔλεγεν· Ὃς ἔχει ὦτα ἀκούειν ἀκουέτω."},
+        {"reference": "Mark 4:10", "text": "Καὶ ὅτε ἐγένετο κατὰ μόνας, ἠρώτων αὐτὸν"},
+        {"reference": "Mark 4:11", "text": ""},
+    ],
+}
+RIGHT = {
+    "book_id": "matthew",
+    "verses": [
+        {"reference": "Matthew 13:8", "text": "ἄλλα δὲ ἔπεσεν ἐπὶ τὴν γῆν τὴν καλὴν"},
+        {"reference": "Matthew 13:9", "text": "ὁ ἔχων ὦτα ἀκουέτω."},
+        {"reference": "Matthew 13:10", "text": "Καὶ ὅτε ἐγένετο κατὰ μόνας ἠρώτων αὐτόν"},
+    ],
+}
+
+
+def _jaccard(first: str, second: str, size: int) -> float:
+    def shingles(text: str) -> set[str]:
+        normalized = parallels.normalize_text(text)
+        return {normalized[i : i + size] for i in range(max(len(normalized) - size + 1, 1))}
+
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b)
+
+
+def test_minhash_batches_match_a_single_pass():
+    shingle_ids: dict[str, int] = {}
+    sets = parallels.shingle_verses(LEFT["verses"] + RIGHT["verses"], 5, shingle_ids)
+    a, b = parallels.hash_parameters(16)
+
+    whole = parallels.minhash_signatures(sets, a, b)
+    batched = parallels.minhash_signatures(sets, a, b, batch=7)
+
+    assert np.array_equal(whole, batched)
+    # The empty verse keeps the sentinel row.
+    assert (whole[2] == parallels.MERSENNE_PRIME).all()
+
+
+def test_find_parallels_scores_candidates_exactly():
+    report = parallels.find_parallels(LEFT, RIGHT, threshold=0.2)
+
+    pairs = [(row["left"], row["right"]) for row in report["parallels"]]
+    assert pairs[0] == ("Mark 4:10", "Matthew 13:10")
+    for row in report["parallels"]:
+        expected = _jaccard(
+            LEFT["verses"][row["left_index"]]["text"],
+            RIGHT["verses"][row["right_index"]]["text"],
+            5,
+        )
+        assert row["similarity"] == round(expected, 4)
+        assert row["similarity"] >= 0.2
+    similarities = [row["similarity"] for row in report["parallels"]]
+    assert similarities == sorted(similarities, reverse=True)
+    assert report["method"]["permutations"] == 128
+    assert all("Mark 4:11" != row["left"] for row in report["parallels"])
+
+
+def test_candidate_pairs_within_one_book_are_ordered_once():
+    signatures = np.array([[1, 2], [1, 2], [3, 4], [1, 2]], dtype=np.int64)
+
+    pairs = parallels.candidate_pairs(signatures, signatures, bands=1, rows=2, same_book=True)
+
+    assert pairs.tolist() == [[0, 1], [0, 3], [1, 3]]
+
+
+def test_lsh_recovers_every_high_similarity_pair_in_mark():
+    payload = json.loads((DATA_DIR / "mark.json").read_text(encoding="utf-8"))
+    verses = payload["verses"][:200]
+    subset = {**payload, "verses": verses}
+
+    report = parallels.find_parallels(subset, subset, threshold=0.7)
+
+    found = {(row["left_index"], row["right_index"]) for row in report["parallels"]}
+    for i in range(len(verses)):
+        for j in range(i + 1, len(verses)):
+            if _jaccard(verses[i]["text"], verses[j]["text"], 5) >= 0.8:
+                assert (i, j) in found
+
+
+def test_main_writes_json_and_tsv(tmp_path, capsys):
+    left_path = tmp_path / "left.json"
+    right_path = tmp_path / "right.json"
+    left_path.write_text(json.dumps(LEFT, ensure_ascii=False), encoding="utf-8")
+    right_path.write_text(json.dumps(RIGHT, ensure_ascii=False), encoding="utf-8")
+    output = tmp_path / "out" / "parallels.json"
+    tsv = tmp_path / "out" / "parallels.tsv"
+
+    exit_code = parallels.main(
+        [str(left_path), str(right_path), "--threshold", "0.2", "--output", str(output), "--tsv", str(tsv)]
+    )
+
+    assert exit_code == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    lines = tsv.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "rank\tleft\tright\tsimilarity\testimate"
+    assert lines[1].startswith("1\tMark 4:10\tMatthew 13:10\t")
+    assert len(lines) == report["parallel_count"] + 1
+    assert "parallels" in capsys.readouterr().err
+
+
+def test_parse_args_rejects_empty_bands():
+    with pytest.raises(SystemExit):
+        parallels.parse_args(["a.json", "b.json", "--bands", "0"])
@@ -0,0 +1,93 @@
+"""Tests for payload content hashes and build deltas."""
+
+from __future__ import annotations
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import payload_delta
+
+
+def _payload() -> dict:
+    return {
+        "book_id": "mark",
+        "header": "ΚΑΤΑ ΜΑΡΚΟΝ",
+        "verses": [
+            {"reference": "Mark 1:1", "text": "Ἀρχὴ τοῦ εὐαγγελίου"},
+            {"reference": "Mark 1:2", "text": "Καθὼς γέγραπται"},
+            {"reference": "Mark 2:1", "text": "Καὶ εἰσελθὼν πάλιν"},
+            {"reference": "Mark 2:2", "text": "καὶ συνήχθησαν πολλοὶ"},
+        ],
+    }
+
+
+def test_hashes_follow_content_only():
+    payload = payload_delta.add_content_hashes(_payload())
+
+    assert list(payload["chapter_hashes"]) == ["1", "2"]
+    assert all(len(verse["hash"]) == payload_delta.HASH_LENGTH for verse in payload["verses"])
+    assert payload_delta.content_hash(_payload()) == payload["content_hash"]
+    # Re-hashing an already hashed payload is stable.
+    assert payload_delta.add_content_hashes(copy.deepcopy(payload)) == payload
+
+    edited = _payload()
+    edited["verses"][3]["text"] += "."
+    edited = payload_delta.add_content_hashes(edited)
+    assert edited["chapter_hashes"]["1"] == payload["chapter_hashes"]["1"]
+    assert edited["chapter_hashes"]["2"] != payload["chapter_hashes"]["2"]
+    assert edited["content_hash"] != payload["content_hash"]
+
+
+def test_chapters_tolerate_unparseable_references():
+    payload = _payload()
+    payload["verses"].append({"reference": "Enoch 3:1", "text": "ἐν ἀρχῇ"})
+
+    hashed = payload_delta.add_content_hashes(payload)
+
+    assert list(hashed["chapter_hashes"]) == ["1", "2", "3"]
+
+
+def test_delta_only_carries_changed_verses():
+    old = _payload()
+    new = _payload()
+    new["verses"][1]["text"] = "Καθὼς γέγραπται ἐν τῷ Ἠσαΐᾳ"
+    del new["verses"][2]
+    new["verses"].append({"reference": "Mark 2:3", "text": "καὶ ἔρχονται"})
+    new["header"] = "ΚΑΤΑ ΜΑΡΚΟΝ."
+    payload_delta.add_content_hashes(new)
+
+    delta = payload_delta.build_delta(old, new)
+
+    assert delta["from"] == payload_delta.content_hash(old)
+    assert delta["to"] == new["content_hash"]
+    inserted = [
+        verse["reference"]
+        for operation in delta["operations"]
+        if operation[0] == "insert"
+        for verse in operation[1]
+    ]
+    assert inserted == ["Mark 1:2", "Mark 2:3"]
+    assert delta["header"] == "ΚΑΤΑ ΜΑΡΚΟΝ."
+    assert payload_delta.apply_delta(old, delta) == new
+
+
+def test_apply_delta_rejects_wrong_base():
+    old = _payload()
+    new = payload_delta.add_content_hashes(_payload())
+    new["verses"][0]["text"] = "Ἀρχή"
+    payload_delta.add_content_hashes(new)
+    delta = payload_delta.build_delta(old, new)
+
+    with pytest.raises(ValueError, match="does not apply"):
+        payload_delta.apply_delta(new, delta)
+
+    delta["operations"][0] = ["copy", 0, 4]
+    with pytest.raises(ValueError, match="does not match its target"):
+        payload_delta.apply_delta(old, delta)
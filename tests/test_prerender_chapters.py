@@ -0,0 +1,138 @@
+"""Tests for static chapter prerendering."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import prerender_chapters as prerender
+
+DATA_DIR = PROJECT_ROOT / "viewer" / "data"
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    target = tmp_path / "data"
+    target.mkdir()
+    for name in ("manifest.json", "mark.json", "mark.clauses.json", "matthew.json"):
+        shutil.copy(DATA_DIR / name, target / name)
+    return target
+
+
+def test_clause_ranges_follow_viewer_lookup_for_multi_verse_clauses():
+    payload = {
+        "verses": [
+            {"reference": "Mark 1:1", "character_count": 10},
+            {"reference": "Mark 1:2", "character_count": 8},
+            {"reference": "Mark 1:3", "character_count": 6},
+        ],
+        "clauses": [
+            {
+                "clause_id": "c1",
+                "references": ["Mark 1:1", "Mark 1:2", "Mark 1:3"],
+                "start": {"offset": 4},
+                "end": {"offset": 5},
+                "function": " Opening ",
+                "category_tags": ["narrative", " "],
+            }
+        ],
+    }
+
+    lookup = prerender.clause_ranges(payload)
+
+    assert [(r["start"], r["end"]) for r in lookup["Mark 1:1"]] == [(4, 10)]
+    assert [(r["start"], r["end"]) for r in lookup["Mark 1:2"]] == [(0, 8)]
+    assert [(r["start"], r["end"]) for r in lookup["Mark 1:3"]] == [(0, 5)]
+    assert lookup["Mark 1:1"][0]["description"] == "Opening"
+    assert lookup["Mark 1:1"][0]["tags"] == ["narrative"]
+
+
+def test_render_chapter_matches_viewer_markup_and_escapes_text():
+    verses = [
+        {"reference": "Mark 1:1", "text": "a <b> & c"},
+        {"reference": "Mark 1:2", "text": "plain"},
+    ]
+    lookup = {
+        "Mark 1:1": [
+            {"clause_id": "c1", "start": 2, "end": 5, "tags": ["speech", "x"], "description": ""},
+        ]
+    }
+
+    html = prerender.render_chapter(verses, lookup)
+
+    assert html.splitlines() == [
+        '<article class="verse" data-reference="Mark 1:1" data-has-clauses="true">'
+        '<span class="verse-ref">Mark 1:1</span><span class="verse-text">a '
+        '<span class="clause-highlight" data-clause-id="c1" role="button" tabindex="0" '
+        'aria-pressed="false" aria-label="Clause c1" data-clause-tags="speech,x">&lt;b&gt;</span>'
+        " &amp; c</span></article>",
+        '<article class="verse" data-reference="Mark 1:2">'
+        '<span class="verse-ref">Mark 1:2</span><span class="verse-text">plain</span></article>',
+    ]
+
+
+def test_prerender_writes_fragments_and_skips_unchanged_chapters(data_dir: Path):
+    manifest_path = data_dir / "manifest.json"
+    output_dir = data_dir / "prerendered"
+    clauses = json.loads((data_dir / "mark.clauses.json").read_text(encoding="utf-8"))["clauses"]
+
+    first = prerender.prerender(manifest_path, output_dir, jobs=2)
+
+    index = json.loads((output_dir / "mark" / "index.json").read_text(encoding="utf-8"))
+    chapter_one = (output_dir / "mark" / index["chapters"]["1"]["path"]).read_text(encoding="utf-8")
+    assert first["mark"]["rendered"] == len(index["chapters"])
+    assert first["mark"]["skipped"] == 0
+    assert f'data-clause-id="{clauses[0]["clause_id"]}"' in chapter_one
+    assert chapter_one.count("<article ") == index["chapters"]["1"]["verse_count"]
+
+    second = prerender.prerender(manifest_path, output_dir, jobs=1)
+    assert second["mark"] == {"rendered": 0, "skipped": len(index["chapters"])}
+
+    mark = json.loads((data_dir / "mark.json").read_text(encoding="utf-8"))
+    last_chapter = mark["verses"][-1]["reference"].rpartition(" ")[2].partition(":")[0]
+    mark["verses"][-1]["text"] += " ·"
+    (data_dir / "mark.json").write_text(json.dumps(mark, ensure_ascii=False), encoding="utf-8")
+
+    third = prerender.prerender(manifest_path, output_dir, jobs=1)
+    assert third["mark"]["rendered"] == 1
+    updated = (output_dir / "mark" / f"{last_chapter}.html").read_text(encoding="utf-8")
+    assert " ·</span></article>" in updated
+
+
+@pytest.mark.parametrize("force", [False, True])
+def test_prerender_removes_fragments_of_dropped_chapters(data_dir: Path, force: bool):
+    manifest_path = data_dir / "manifest.json"
+    output_dir = data_dir / "prerendered"
+    prerender.prerender(manifest_path, output_dir, jobs=1)
+    mark = json.loads((data_dir / "mark.json").read_text(encoding="utf-8"))
+    assert (output_dir / "mark" / "16.html").exists()
+
+    mark["verses"] = [verse for verse in mark["verses"] if not verse["reference"].startswith("Mark 16:")]
+    (data_dir / "mark.json").write_text(json.dumps(mark, ensure_ascii=False), encoding="utf-8")
+    summary = prerender.prerender(manifest_path, output_dir, force=force, jobs=1)
+
+    index = json.loads((output_dir / "mark" / "index.json").read_text(encoding="utf-8"))
+    assert "16" not in index["chapters"]
+    assert not (output_dir / "mark" / "16.html").exists()
+    assert summary["mark"]["rendered"] == (len(index["chapters"]) if force else 0)
+
+
+def test_main_records_prerendered_index_in_manifest(data_dir: Path):
+    manifest_path = data_dir / "manifest.json"
+
+    assert prerender.main(["--manifest", str(manifest_path), "--jobs", "1"]) == 0
+
+    entries = {
+        entry["book_id"]: entry
+        for entry in json.loads(manifest_path.read_text(encoding="utf-8"))["books"]
+    }
+    assert entries["mark"]["prerendered_path"] == "prerendered/mark/index.json"
+    assert entries["matthew"]["prerendered_url"] == "data/prerendered/matthew/index.json"
@@ -0,0 +1,137 @@
+"""Tests for re-aligning clause offsets after verse text corrections."""
+
+from __future__ import annotations
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import clause_data
+from scripts import realign_clauses as realign
+
+CLAUSE_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.clauses.json"
+MARK_PATH = PROJECT_ROOT / "viewer" / "data" / "mark.json"
+
+
+def _clause(clause_id: str, reference: str, start: int, end: int) -> dict:
+    return {
+        "clause_id": clause_id,
+        "start": {"reference": reference, "verse_index": 0, "offset": start},
+        "end": {"reference": reference, "verse_index": 0, "offset": end},
+        "references": [reference],
+        "category_tags": ["main"],
+        "source": {"method": "manual", "validation": {"alignment": "pass"}},
+    }
+
+
+def _payload(text: str, clauses: list[dict]) -> dict:
+    return {
+        "verses": [clause_data.verse_registry_entry("Mark 1:1", 0, text)],
+        "clauses": clauses,
+    }
+
+
+def test_offset_map_shifts_equal_regions_and_flags_interior_edits():
+    offset_map = realign.OffsetMap("αβγ δεζ. ηθ", "αβγ  ΔΕζ· ηθ")
+
+    assert offset_map.map(0) == (0, True)
+    assert offset_map.map(4) == (5, True)
+    assert offset_map.map(5) == (4, False)
+    assert offset_map.map(8) == (9, True)
+    assert offset_map.map(11) == (12, True)
+
+
+def test_insertion_at_boundary_joins_following_clause():
+    old = "ἀρχὴ. καὶ ἦλθεν"
+    new = "ἀρχὴ. ⸀καὶ ἦλθεν"
+    payload = _payload(old, [_clause("a", "Mark 1:1", 0, 5), _clause("b", "Mark 1:1", 6, len(old))])
+
+    report = realign.realign_payload(
+        payload, [{"reference": "Mark 1:1", "text": old}], [{"reference": "Mark 1:1", "text": new}]
+    )
+
+    first, second = payload["clauses"]
+    assert first["end"]["offset"] == 5
+    assert (second["start"]["offset"], second["end"]["offset"]) == (6, len(new))
+    assert new[second["start"]["offset"] : second["end"]["offset"]] == "⸀καὶ ἦλθεν"
+    assert report.changed_verses == ["Mark 1:1"]
+    assert report.moved_clauses == ["b"]
+    assert report.flagged_clauses == []
+    assert payload["verses"][0]["character_count"] == len(new)
+
+
+def test_boundary_inside_replaced_text_is_flagged():
+    old = "ἐν τῷ Ἠσαΐᾳ τῷ προφήτῃ"
+    new = "ἐν τοῖς προφήταις"
+    payload = _payload(old, [_clause("a", "Mark 1:1", 0, 11), _clause("b", "Mark 1:1", 11, len(old))])
+
+    report = realign.realign_payload(
+        payload, [{"reference": "Mark 1:1", "text": old}], [{"reference": "Mark 1:1", "text": new}]
+    )
+
+    assert set(report.flagged_clauses) == {"a", "b"}
+    for clause in payload["clauses"]:
+        assert clause["source"]["validation"]["alignment"] == "pending"
+    assert all(0 <= clause["end"]["offset"] <= len(new) for clause in payload["clauses"])
+
+
+def test_realign_only_touches_changed_verses():
+    payload = clause_data.load_json(CLAUSE_PATH)
+    original = copy.deepcopy(payload)
+    old_verses = clause_data.load_json(MARK_PATH)["verses"]
+    new_verses = copy.deepcopy(old_verses)
+    new_verses[1]["text"] = "  " + new_verses[1]["text"].replace(" ", "  ", 1)
+
+    report = realign.realign_payload(payload, old_verses, new_verses)
+
+    assert report.changed_verses == ["Mark 1:2"]
+    assert report.flagged_clauses == []
+    changed = {
+        clause["clause_id"]
+        for clause in original["clauses"]
+        if clause["start"]["reference"] == "Mark 1:2"
+    }
+    assert set(report.moved_clauses) == changed
+    for before, after in zip(original["clauses"], payload["clauses"]):
+        if before["clause_id"] not in changed:
+            assert before == after
+            continue
+        old_text = old_verses[1]["text"][before["start"]["offset"] : before["end"]["offset"]]
+        new_text = new_verses[1]["text"][after["start"]["offset"] : after["end"]["offset"]]
+        assert old_text.split() == new_text.split()
+    assert clause_data.validate_clause_payload(payload, new_verses) == []
+
+
+def test_realign_rejects_mismatched_old_payload():
+    payload = clause_data.load_json(CLAUSE_PATH)
+    old_verses = copy.deepcopy(clause_data.load_json(MARK_PATH)["verses"])
+    old_verses[0]["text"] += "!"
+
+    with pytest.raises(ValueError, match="is this the payload"):
+        realign.realign_payload(payload, old_verses, old_verses)
+
+
+def test_main_updates_files_and_writes_report(tmp_path: Path):
+    old_path = tmp_path / "old.json"
+    new_path = tmp_path / "new.json"
+    clause_path = tmp_path / "mark-01.clauses.json"
+    report_path = tmp_path / "report.json"
+    old_path.write_text(json.dumps({"verses": [{"reference": "Mark 1:1", "text": "ab cd"}]}))
+    new_path.write_text(json.dumps({"verses": [{"reference": "Mark 1:1", "text": "ab  cd"}]}))
+    clause_path.write_text(json.dumps(_payload("ab cd", [_clause("a", "Mark 1:1", 3, 5)])))
+
+    assert realign.main([str(old_path), str(new_path), str(clause_path), "--dry-run"]) == 0
+    assert json.loads(clause_path.read_text(encoding="utf-8"))["clauses"][0]["start"]["offset"] == 3
+
+    arguments = [str(old_path), str(new_path), str(clause_path), "--report", str(report_path)]
+    assert realign.main(arguments) == 0
+    updated = json.loads(clause_path.read_text(encoding="utf-8"))
+    assert (updated["clauses"][0]["start"]["offset"], updated["clauses"][0]["end"]["offset"]) == (4, 6)
+    assert json.loads(report_path.read_text(encoding="utf-8"))[str(clause_path)]["moved_clauses"] == ["a"]
@@ -0,0 +1,81 @@
+"""Tests for the shared SBLGNT plain-text reader."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import sblgnt_text
+
+CONTENT = "ΚΑΤΑ ΜΑΡΚΟΝ\r\nMark 1:1 Ἀρχὴ τοῦ\r\n  εὐαγγελίου\r\n\r\nMark 1:2\tΚαθὼς  γέγραπται\r\n"
+
+
+@pytest.mark.parametrize("threshold", [0, 1 << 20])
+def test_iter_lines_matches_splitlines(tmp_path: Path, monkeypatch, threshold: int):
+    path = tmp_path / "Mark.txt"
+    path.write_bytes(CONTENT.encode("utf-8"))
+    monkeypatch.setattr(sblgnt_text, "MMAP_THRESHOLD", threshold)
+
+    assert list(sblgnt_text.iter_lines(path)) == path.read_text(encoding="utf-8").splitlines()
+
+
+def test_iter_lines_empty_file(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Empty.txt"
+    path.write_bytes(b"")
+    monkeypatch.setattr(sblgnt_text, "MMAP_THRESHOLD", 0)
+
+    assert list(sblgnt_text.iter_lines(path)) == []
+
+
+def test_iter_plain_text_strict_joins_continuations_once():
+    lines = ["Mark 1:1 Ἀρχὴ"] + [f"  λέξις{index}" for index in range(500)] + ["Mark 1:2 Καθὼς"]
+
+    verses = list(sblgnt_text.iter_plain_text(lines))
+
+    assert [reference for reference, _ in verses] == ["Mark 1:1", "Mark 1:2"]
+    assert verses[0][1] == " ".join(["Ἀρχὴ"] + [f"λέξις{index}" for index in range(500)])
+
+
+def test_iter_plain_text_strict_skips_pattern_for_indented_greek(monkeypatch):
+    matched: list[str] = []
+    pattern = sblgnt_text.VERSE_PATTERN
+
+    class CountingPattern:
+        def match(self, line):
+            matched.append(line)
+            return pattern.match(line)
+
+    monkeypatch.setattr(sblgnt_text, "VERSE_PATTERN", CountingPattern())
+    lines = ["Mark 1:1 Ἀρχὴ", "  τοῦ εὐαγγελίου", "Mark 1:2 Καθὼς"]
+
+    verses = list(sblgnt_text.iter_plain_text(lines))
+
+    assert verses == [("Mark 1:1", "Ἀρχὴ τοῦ εὐαγγελίου"), ("Mark 1:2", "Καθὼς")]
+    assert matched == ["Mark 1:1 Ἀρχὴ", "Mark 1:2 Καθὼς"]
+
+
+def test_iter_plain_text_strict_treats_unmatched_lines_as_continuations():
+    verses = list(sblgnt_text.iter_plain_text(["Mark 1:1\tΚαθὼς  γέγραπται", "Oops", "ἐν τῇ ἐρήμῳ"]))
+
+    assert verses == [("Mark 1:1", "Καθὼς  γέγραπται Oops ἐν τῇ ἐρήμῳ")]
+
+
+def test_iter_plain_text_strict_rejects_leading_continuation():
+    with pytest.raises(ValueError, match="Unexpected line before any verse content: stray"):
+        list(sblgnt_text.iter_plain_text(["stray  "]))
+
+
+def test_iter_plain_text_lenient_reports_skipped_lines():
+    skipped: list[str] = []
+    lines = ["Mark 1:1\tΚαθὼς  γέγραπται", "  καὶ", "Oops  ", "Mark 1:2 φωνὴ"]
+
+    verses = list(sblgnt_text.iter_plain_text(lines, strict=False, on_skip=skipped.append))
+
+    assert verses == [("Mark 1:1", "Καθὼς γέγραπται καὶ"), ("Mark 1:2", "φωνὴ")]
+    assert skipped == ["Oops"]
@@ -0,0 +1,65 @@
+"""Tests for the streaming SBLGNT XML reader."""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import sblgnt_xml
+
+XML_CONTENT = """<book id="Mark">
+  <title>ΚΑΤΑ ΜΑΡΚΟΝ</title>
+  <p>
+    <verse-number id="Mark 1:1">1:1</verse-number>
+    <w>Ἀρχὴ</w><suffix> </suffix>
+    <w>τοῦ</w><suffix> </suffix>
+    <prefix>⸀</prefix><w>χριστοῦ</w><suffix>. </suffix>
+    <verse-number id="Mark 1:2">1:2</verse-number>
+    <w>Καθὼς</w><suffix> </suffix>
+    <w>γέγραπται</w><suffix>· </suffix>
+  </p>
+  <p>
+    <w>Ἰδοὺ</w><suffix> </suffix>
+    <w>ἀποστέλλω</w>
+    <verse-number id="Mark 1:3">1:3</verse-number>
+    <w>φωνὴ</w>
+  </p>
+</book>
+"""
+
+
+def _records() -> list[sblgnt_xml.XmlVerse]:
+    return list(sblgnt_xml.iter_xml_records(io.BytesIO(XML_CONTENT.encode("utf-8"))))
+
+
+def test_iter_xml_records_yields_title_then_verses():
+    records = _records()
+
+    assert records[0].reference == sblgnt_xml.TITLE_REFERENCE
+    assert records[0].text == "ΚΑΤΑ ΜΑΡΚΟΝ"
+    assert [record.reference for record in records[1:]] == ["Mark 1:1", "Mark 1:2", "Mark 1:3"]
+    assert records[1].text == "Ἀρχὴ τοῦ ⸀χριστοῦ."
+    assert records[3].paragraph_index == 1
+
+
+def test_iter_xml_records_word_offsets_match_text():
+    for record in _records()[1:]:
+        words = [record.text[start:end] for start, end in record.words]
+        assert all(word and not word.isspace() for word in words)
+
+    first = _records()[1]
+    assert [first.text[start:end] for start, end in first.words] == ["Ἀρχὴ", "τοῦ", "χριστοῦ"]
+
+
+def test_iter_xml_records_reports_mid_verse_paragraph_breaks():
+    second = _records()[2]
+
+    assert second.paragraph_index == 0
+    assert second.text == "Καθὼς γέγραπται· Ἰδοὺ ἀποστέλλω"
+    assert second.paragraph_breaks == [second.text.index("Ἰδοὺ")]
+    assert _records()[1].paragraph_breaks == []
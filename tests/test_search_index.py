@@ -0,0 +1,73 @@
+"""Tests for the sharded viewer search index."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import search_index
+
+VERSES = [
+    {"reference": "Mark 1:1", "text": "Ἀρχὴ τοῦ εὐαγγελίου Ἰησοῦ ⸀χριστοῦ."},
+    {"reference": "Mark 1:2", "text": "⸀Καθὼς γέγραπται ἐν ⸂τῷ Ἠσαΐᾳ τῷ προφήτῃ⸃·"},
+    {"reference": "Mark 1:3", "text": "φωνὴ βοῶντος ἐν τῇ ἐρήμῳ·"},
+]
+
+
+def test_postings_round_trip_with_multibyte_deltas():
+    indices = [0, 1, 5, 200, 20_000, 20_001]
+
+    encoded = search_index.encode_postings(indices)
+
+    assert search_index.decode_postings(encoded) == indices
+
+
+def test_encode_postings_rejects_unsorted():
+    with pytest.raises(ValueError, match="ascending"):
+        search_index.encode_postings([3, 1])
+
+
+def test_build_search_index_shards_sorted_terms():
+    index, shards = search_index.build_search_index(VERSES, book_id="mark")
+
+    assert index["verse_count"] == 3
+    assert index["prefix_length"] == 1
+    assert index["shards"]["ε"]["path"] == "03b5.json"
+
+    epsilon = shards["03b5.json"]
+    assert epsilon["terms"] == sorted(epsilon["terms"])
+    position = epsilon["terms"].index("εν")
+    assert search_index.decode_postings(epsilon["postings"][position]) == [1, 2]
+
+    tau = shards[search_index.shard_filename("τ")]
+    position = tau["terms"].index("τω")
+    # Repeated terms within one verse are only posted once.
+    assert search_index.decode_postings(tau["postings"][position]) == [1]
+    assert sum(entry["terms"] for entry in index["shards"].values()) == index["term_count"]
+
+
+def test_build_search_index_rejects_bad_prefix_length():
+    with pytest.raises(ValueError, match="prefix_length"):
+        search_index.build_search_index(VERSES, book_id="mark", prefix_length=0)
+
+
+def test_write_search_index_replaces_stale_shards(tmp_path: Path):
+    directory = tmp_path / "search" / "mark"
+    directory.mkdir(parents=True)
+    (directory / "ffff.json").write_text("{}", encoding="utf-8")
+
+    index_path = search_index.write_search_index(directory, VERSES, book_id="mark", prefix_length=2)
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert not (directory / "ffff.json").exists()
+    assert index["shards"]["εν"]["path"] == "03b5-03bd.json"
+    shard = json.loads((directory / "03b5-03bd.json").read_text(encoding="utf-8"))
+    assert shard["prefix"] == "εν"
+    assert shard["terms"] == ["εν"]
@@ -0,0 +1,175 @@
+"""Tests for the local caching viewer server."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import serve_viewer as serve
+
+PAYLOAD = ('{"book_id": "mark", "verses": ["Ἀρχὴ τοῦ εὐαγγελίου"]}\n' * 20).encode("utf-8")
+
+
+@pytest.fixture
+def viewer_dir(tmp_path: Path) -> Path:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "mark.json").write_bytes(PAYLOAD)
+    (tmp_path / "index.html").write_text("<!doctype html><title>viewer</title>\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def server(viewer_dir: Path):
+    httpd = serve.create_server(viewer_dir, port=0, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(server, path: str, headers: dict[str, str] | None = None, method: str = "GET"):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+    finally:
+        connection.close()
+
+
+def test_accepts_gzip_honours_quality_values():
+    assert serve.accepts_gzip("gzip, deflate, br")
+    assert serve.accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not serve.accepts_gzip("gzip;q=0, *")
+    assert not serve.accepts_gzip("identity")
+    assert not serve.accepts_gzip(None)
+
+
+def test_parse_range_variants():
+    assert serve.parse_range("bytes=0-9", 100) == (0, 9)
+    assert serve.parse_range("bytes=90-", 100) == (90, 99)
+    assert serve.parse_range("bytes=-10", 100) == (90, 99)
+    assert serve.parse_range("bytes=95-500", 100) == (95, 99)
+    assert serve.parse_range("bytes=0-1,5-6", 100) is None
+    assert serve.parse_range("items=0-1", 100) is None
+    assert serve.parse_range("bytes=9-2", 100) is None
+
+    with pytest.raises(ValueError):
+        serve.parse_range("bytes=100-", 100)
+    with pytest.raises(ValueError):
+        serve.parse_range("bytes=-0", 100)
+
+
+def test_full_response_carries_strong_etag(server):
+    response, body = _request(server, "/data/mark.json")
+
+    assert response.status == 200
+    assert body == PAYLOAD
+    assert response.getheader("ETag").startswith('"')
+    assert response.getheader("Accept-Ranges") == "bytes"
+    assert response.getheader("Cache-Control") == "no-cache"
+    assert response.getheader("Content-Type") == "application/json"
+
+
+def test_if_none_match_returns_not_modified(server):
+    first, _ = _request(server, "/data/mark.json")
+    etag = first.getheader("ETag")
+
+    response, body = _request(server, "/data/mark.json", {"If-None-Match": f'W/{etag}, "other"'})
+
+    assert response.status == 304
+    assert body == b""
+    assert response.getheader("ETag") == etag
+
+
+def test_etag_changes_when_content_changes(server, viewer_dir: Path):
+    first, _ = _request(server, "/data/mark.json")
+    target = viewer_dir / "data" / "mark.json"
+    target.write_bytes(PAYLOAD + b"\n")
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    response, _ = _request(server, "/data/mark.json", {"If-None-Match": first.getheader("ETag")})
+
+    assert response.status == 200
+    assert response.getheader("ETag") != first.getheader("ETag")
+
+
+def test_gzip_sidecar_negotiation(server, viewer_dir: Path):
+    written = serve.precompress(viewer_dir)
+    assert viewer_dir / "data" / "mark.json.gz" in written
+    assert serve.precompress(viewer_dir) == []
+
+    compressed, body = _request(server, "/data/mark.json", {"Accept-Encoding": "gzip"})
+    plain, plain_body = _request(server, "/data/mark.json")
+
+    assert compressed.getheader("Content-Encoding") == "gzip"
+    assert compressed.getheader("Content-Type") == "application/json"
+    assert compressed.getheader("Vary") == "Accept-Encoding"
+    assert gzip.decompress(body) == PAYLOAD
+    assert plain.getheader("Content-Encoding") is None
+    assert plain.getheader("Vary") == "Accept-Encoding"
+    assert plain_body == PAYLOAD
+    assert compressed.getheader("ETag") != plain.getheader("ETag")
+
+
+def test_range_requests(server):
+    full, _ = _request(server, "/data/mark.json")
+    etag = full.getheader("ETag")
+
+    partial, body = _request(server, "/data/mark.json", {"Range": "bytes=0-9"})
+    assert partial.status == 206
+    assert body == PAYLOAD[:10]
+    assert partial.getheader("Content-Range") == f"bytes 0-9/{len(PAYLOAD)}"
+
+    suffix, body = _request(server, "/data/mark.json", {"Range": "bytes=-5"})
+    assert suffix.status == 206
+    assert body == PAYLOAD[-5:]
+
+    stale, body = _request(
+        server, "/data/mark.json", {"Range": "bytes=0-9", "If-Range": '"stale"'}
+    )
+    assert stale.status == 200
+    assert body == PAYLOAD
+
+    fresh, body = _request(server, "/data/mark.json", {"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status == 206
+
+    unsatisfiable, _ = _request(server, "/data/mark.json", {"Range": f"bytes={len(PAYLOAD)}-"})
+    assert unsatisfiable.status == 416
+    assert unsatisfiable.getheader("Content-Range") == f"bytes */{len(PAYLOAD)}"
+
+
+def test_head_and_index_and_missing(server):
+    head, body = _request(server, "/data/mark.json", method="HEAD")
+    assert head.status == 200
+    assert body == b""
+    assert head.getheader("Content-Length") == str(len(PAYLOAD))
+
+    index, body = _request(server, "/")
+    assert index.status == 200
+    assert b"viewer" in body
+
+    redirect, _ = _request(server, "/data")
+    assert redirect.status == 301
+
+    missing, _ = _request(server, "/data/absent.json")
+    assert missing.status == 404
+
+
+def test_main_rejects_missing_directory(tmp_path: Path):
+    with pytest.raises(SystemExit, match="does not exist"):
+        serve.main(["--directory", str(tmp_path / "absent")])
@@ -0,0 +1,105 @@
+"""Tests for packed verse ids."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import verse_ref
+
+
+@pytest.mark.parametrize(
+    "reference, book",
+    [
+        ("Mark 1:2", None),
+        ("Mark.1.2", None),
+        ("  mark 1:2 ", None),
+        ("MARK.1.2", None),
+        ("1:2", "Mark"),
+        ("Mark 1:2", "Matt"),
+    ],
+)
+def test_parse_reference_accepts_text_and_xml_spellings(reference, book):
+    verse_id = verse_ref.parse_reference(reference, book)
+
+    assert verse_id == verse_ref.pack(2, 1, 2)
+    assert verse_ref.unpack(verse_id) == ("Mark", 1, 2)
+    assert verse_ref.format_reference(verse_id) == "Mark 1:2"
+
+
+@pytest.mark.parametrize(
+    "reference, expected",
+    [
+        ("Matthew 1:1", "Matt 1:1"),
+        ("Matt 1:1", "Matt 1:1"),
+        ("Mt 1:1", "Matt 1:1"),
+        ("1 Corinthians 1:1", "1Cor 1:1"),
+        ("1Corinthians.1.1", "1Cor 1:1"),
+        ("2 Thessalonians 3:18", "2Thess 3:18"),
+        ("Philemon 1:25", "Phlm 1:25"),
+        ("3 John 1:15", "3John 1:15"),
+        ("Revelation 22:21", "Rev 22:21"),
+        ("revelation 22:21", "Rev 22:21"),
+    ],
+)
+def test_parse_reference_accepts_full_names_and_aliases(reference, expected):
+    assert verse_ref.format_reference(verse_ref.parse_reference(reference)) == expected
+
+
+def test_every_full_name_maps_to_its_code():
+    for code, name in zip(verse_ref.BOOKS, verse_ref.BOOK_NAMES):
+        assert verse_ref.book_number(name) == verse_ref.book_number(code)
+
+
+def test_numbered_books_and_canonical_order():
+    ids = [verse_ref.parse_reference(reference) for reference in ("1 Cor 12:3", "1Cor 2:1", "Mark 16:8")]
+
+    assert verse_ref.format_reference(ids[0]) == "1Cor 12:3"
+    assert sorted(ids) == [ids[2], ids[1], ids[0]]
+    assert verse_ref.parse_reference("Matt 28:20") < verse_ref.parse_reference("Mark 1:1")
+    assert verse_ref.book_of(ids[0]) == "1Cor"
+    assert (verse_ref.chapter_of(ids[0]), verse_ref.verse_of(ids[0])) == (12, 3)
+
+
+def test_chapter_bounds_cover_exactly_one_chapter():
+    first, last = verse_ref.chapter_bounds(verse_ref.parse_reference("Mark 2:5"))
+
+    assert first <= verse_ref.parse_reference("Mark 2:1") <= last
+    assert first <= verse_ref.parse_reference("Mark 2:28") <= last
+    assert not first <= verse_ref.parse_reference("Mark 3:1") <= last
+    assert not first <= verse_ref.parse_reference("Mark 1:45") <= last
+
+
+@pytest.mark.parametrize(
+    "reference, book, message",
+    [
+        ("Mark", None, "Malformed reference"),
+        ("Mark 1", None, "Malformed reference"),
+        ("1:1", None, "does not name a book"),
+        ("Enoch 1:1", None, "Unknown book"),
+        ("Mark 1:300", None, "out of range"),
+    ],
+)
+def test_parse_reference_rejects_bad_references(reference, book, message):
+    with pytest.raises(ValueError, match=message):
+        verse_ref.parse_reference(reference, book)
+
+
+def test_try_parse_reference_returns_none_for_bad_references():
+    assert verse_ref.try_parse_reference("Mark 1:1") == verse_ref.parse_reference("Mark 1:1")
+    assert verse_ref.try_parse_reference("1:1", "Mark") == verse_ref.parse_reference("Mark 1:1")
+    for reference in ("TITLE", "Enoch 1:1", "Mark 1", "Mark 1:300"):
+        assert verse_ref.try_parse_reference(reference) is None
+
+
+def test_reference_array_is_compact():
+    ids = verse_ref.reference_array(["Mark 1:1", "Mark 1:2", "Enoch 1:1"])
+
+    assert ids.typecode == "I"
+    assert list(ids) == [verse_ref.parse_reference("Mark 1:1"), verse_ref.parse_reference("Mark 1:2"), 0]
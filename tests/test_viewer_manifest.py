@@ -0,0 +1,55 @@
+"""Tests for the shared viewer manifest helpers."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.viewer_manifest import BookFiles, manifest_books, manifest_locations
+
+
+def test_manifest_books_resolves_payload_and_clause_files(tmp_path: Path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ("mark.json", "mark.clauses.json", "matthew.json", "luke.json", "luke.overlay.json"):
+        (data / name).write_text("{}", encoding="utf-8")
+    manifest = data / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "books": [
+                    {"book_id": "mark", "data_path": "mark.json"},
+                    {"book_id": "matthew", "data_path": "matthew.json"},
+                    {"book_id": "luke", "data_path": "luke.json", "clause_data_path": "luke.overlay.json"},
+                    {"book_id": "john"},
+                    "not-a-book",
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    assert manifest_books(manifest) == [
+        BookFiles("mark", data / "mark.json", data / "mark.clauses.json"),
+        BookFiles("matthew", data / "matthew.json", None),
+        BookFiles("luke", data / "luke.json", data / "luke.overlay.json"),
+    ]
+
+
+def test_manifest_locations_relative_to_manifest_directory(tmp_path: Path):
+    manifest = tmp_path / "data" / "manifest.json"
+
+    assert manifest_locations(manifest, tmp_path / "data" / "prerendered" / "mark" / "index.json") == (
+        "prerendered/mark/index.json",
+        "data/prerendered/mark/index.json",
+    )
+    # Files outside the manifest directory fall back to their name.
+    assert manifest_locations(manifest, tmp_path / "elsewhere" / "bundle.bin") == (
+        "bundle.bin",
+        "data/bundle.bin",
+    )